@@ -0,0 +1,42 @@
+# Compara descifrar_cesar (25 pasadas de cadenas) con descifrar_cesar_rapido
+# sobre textos de 1 KB, 1 MB y 100 MB.
+# Uso: python benchmark_cesar.py [--completo]
+# Sin --completo la versión original solo se mide hasta 1 MB y para 100 MB
+# se extrapola linealmente (tardaría varios minutos).
+
+import contextlib
+import io
+import sys
+import time
+
+from ex1 import descifrar_cesar, descifrar_cesar_rapido, texto_cifrado
+
+TAMANOS = [("1 KB", 1_000), ("1 MB", 1_000_000), ("100 MB", 100_000_000)]
+LIMITE_ORIGINAL = 1_000_000
+
+def generar_texto(tamano):
+    repeticiones = tamano // len(texto_cifrado) + 1
+    return (texto_cifrado * repeticiones)[:tamano]
+
+def medir(funcion, texto):
+    inicio = time.perf_counter()
+    # La versión original imprime los 25 descifrados: los descartamos
+    with contextlib.redirect_stdout(io.StringIO()):
+        funcion(texto)
+    return time.perf_counter() - inicio
+
+if __name__ == "__main__":
+    completo = "--completo" in sys.argv
+    segundos_por_byte = None
+    print(f"{'tamaño':>8} {'original (s)':>14} {'rápido (s)':>12} {'aceleración':>12}")
+    for nombre, tamano in TAMANOS:
+        texto = generar_texto(tamano)
+        rapido = medir(descifrar_cesar_rapido, texto)
+        if completo or tamano <= LIMITE_ORIGINAL:
+            original = medir(descifrar_cesar, texto)
+            segundos_por_byte = original / tamano
+            etiqueta = f"{original:14.3f}"
+        else:
+            original = segundos_por_byte * tamano
+            etiqueta = f"~{original:13.1f}"
+        print(f"{nombre:>8} {etiqueta} {rapido:12.4f} {original / rapido:11.0f}x")
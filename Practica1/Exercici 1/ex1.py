@@ -1,3 +1,23 @@
+import os
+import sys
+
+# Las frecuencias del inglés salen del modelo de lengua de la carpeta ModelLlengua
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ModelLlengua'))
+
+from language_model import load_model
+
+ALFABETO = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ALFABETO_BYTES = ALFABETO.encode("ascii")
+
+# Frecuencia típica del inglés (en porcentaje), del modelo de lengua compartido
+FRECUENCIAS_INGLES = load_model("eng").letter_frequencies()
+
+# Tablas de traducción precalculadas: _TABLAS_CESAR[d] deshace un desplazamiento d
+_TABLAS_CESAR = [
+    bytes.maketrans(ALFABETO_BYTES, bytes(ALFABETO_BYTES[(i - d) % 26] for i in range(26)))
+    for d in range(26)
+]
+
 def analizar_frecuencia(texto):
     frecuencia = {}
     for char in texto:
@@ -23,9 +43,51 @@ def descifrar_cesar(texto):
                 descifrado += char
         print(f"Desplazamiento {desplazamiento}: {descifrado}")
 
+def puntuar_desplazamientos(conteo, frecuencias=FRECUENCIAS_INGLES):
+    """
+    Puntúa los 26 desplazamientos posibles a partir del histograma de letras
+    del texto cifrado (chi-cuadrado contra las frecuencias del idioma).
+    No hace falta descifrar nada: desplazar el texto equivale a rotar el histograma.
+    Devuelve una lista de (chi2, desplazamiento) ordenada de mejor a peor.
+    """
+    total = sum(conteo)
+    esperado = [max(frecuencias.get(letra, 0.0), 0.01) * total / 100 for letra in ALFABETO]
+    ranking = []
+    for desplazamiento in range(26):
+        chi2 = 0.0
+        for i in range(26):
+            observado = conteo[(i + desplazamiento) % 26]
+            chi2 += (observado - esperado[i]) ** 2 / esperado[i]
+        ranking.append((chi2, desplazamiento))
+    ranking.sort()
+    return ranking
+
+def descifrar_cesar_rapido(texto, frecuencias=FRECUENCIAS_INGLES):
+    """
+    Rompe un cifrado César en tiempo lineal.
+    El texto se pasa a bytes una sola vez, se cuentan las letras con bytes.count,
+    se puntúan los 26 desplazamientos sobre el histograma y solo se descifra
+    el mejor con una tabla de bytes.translate.
+    Devuelve (desplazamiento, texto descifrado, ranking).
+    """
+    datos = texto.upper().encode("utf-8")
+    conteo = [datos.count(letra) for letra in ALFABETO_BYTES]
+    ranking = puntuar_desplazamientos(conteo, frecuencias)
+    desplazamiento = ranking[0][1]
+    descifrado = datos.translate(_TABLAS_CESAR[desplazamiento]).decode("utf-8")
+    return desplazamiento, descifrado, ranking
+
+def candidatos_cesar(texto):
+    """Genera los 26 descifrados posibles, cada uno con una sola pasada de translate."""
+    datos = texto.upper().encode("utf-8")
+    for desplazamiento in range(26):
+        yield desplazamiento, datos.translate(_TABLAS_CESAR[desplazamiento]).decode("utf-8")
+
 
 texto_cifrado = "T SLGP DPPY ESTYRD JZF APZAWP HZFWO YZE MPWTPGP, LEELNV DSTADZY QTCP ZQQ ESP DSZFWOPC ZQ ZCTZY, T HLENSPO N-MPLXD RWTEEPCTY ESP OLCV YPLC ESP ELYYSLFDPC RLEP. LWW ESZDP XZXPYED HTWWMP WZDE TY ETXP, WTVP EPLCD TY CLTY. ETXP EZ OTP."
 
-print("Análisis de frecuencia del texto cifrado:")
-print(analizar_frecuencia(texto_cifrado))
-descifrar_cesar(texto_cifrado)
\ No newline at end of file
+if __name__ == "__main__":
+    print("Análisis de frecuencia del texto cifrado:")
+    print(analizar_frecuencia(texto_cifrado))
+    desplazamiento, descifrado, _ = descifrar_cesar_rapido(texto_cifrado)
+    print(f"Desplazamiento {desplazamiento}: {descifrado}")
\ No newline at end of file
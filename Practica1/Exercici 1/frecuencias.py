@@ -0,0 +1,163 @@
+# Análisis de frecuencia por bloques para ficheros que no caben en memoria.
+# Lee la fuente en bloques de tamaño fijo, cuenta cada bloque con np.bincount
+# y suma los histogramas parciales. Soporta n-gramas (bigramas, trigramas...)
+# con memoria acotada (un histograma denso de 26^n posiciones más un bloque)
+# y un modo paralelo que reparte un fichero mapeado en memoria entre procesos.
+#
+# Uso: python frecuencias.py fichero [n] [--paralelo]
+
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Las letras se codifican con encode del modelo de lengua (carpeta ModelLlengua)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ModelLlengua'))
+
+from language_model import encode
+
+ALFABETO = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+TAM_BLOQUE = 1 << 22  # 4 MB
+MAX_N = 5  # 26^5 contadores de 8 bytes ≈ 95 MB
+
+def _comprobar_n(n):
+    if not 1 <= n <= MAX_N:
+        raise ValueError(f"n ha de estar entre 1 y {MAX_N}")
+
+def _bloques(fuente, tam_bloque):
+    """Devuelve los bloques de bytes de una ruta, un fichero, un bytes o un iterable."""
+    if isinstance(fuente, (str, os.PathLike)):
+        with open(fuente, "rb") as f:
+            yield from iter(lambda: f.read(tam_bloque), b"")
+    elif isinstance(fuente, (bytes, bytearray, memoryview)):
+        datos = memoryview(fuente)
+        for inicio in range(0, len(datos), tam_bloque):
+            yield datos[inicio:inicio + tam_bloque]
+    elif hasattr(fuente, "read"):
+        for bloque in iter(lambda: fuente.read(tam_bloque), b""):
+            if not bloque:
+                break
+            yield bloque.encode("utf-8") if isinstance(bloque, str) else bloque
+    else:
+        for bloque in fuente:
+            yield bloque.encode("utf-8") if isinstance(bloque, str) else bloque
+
+def _contar_ngramas(letras, n, histograma):
+    """Suma al histograma los n-gramas de un array de índices de letras."""
+    total = len(letras) - n + 1
+    if total <= 0:
+        return
+    codigos = np.zeros(total, dtype=np.int64)
+    for k in range(n):
+        codigos *= 26
+        codigos += letras[k:k + total]
+    histograma += np.bincount(codigos, minlength=26 ** n)
+
+def _contar_bloques(bloques, n):
+    """
+    Cuenta los n-gramas de una secuencia de bloques arrastrando las últimas
+    n-1 letras de cada bloque para no perder los n-gramas que cruzan la frontera.
+    Devuelve (histograma, primeras n-1 letras, últimas n-1 letras, total de letras).
+    """
+    histograma = np.zeros(26 ** n, dtype=np.int64)
+    arrastre = np.empty(0, dtype=np.uint8)
+    cabeza = np.empty(0, dtype=np.uint8)
+    total = 0
+    for bloque in bloques:
+        letras = encode(bloque)
+        if len(cabeza) < n - 1:
+            cabeza = np.concatenate((cabeza, letras[:n - 1 - len(cabeza)]))
+        total += len(letras)
+        if n > 1:
+            letras = np.concatenate((arrastre, letras))
+            arrastre = letras[len(letras) - (n - 1):] if len(letras) >= n - 1 else letras
+        _contar_ngramas(letras, n, histograma)
+    return histograma, cabeza, arrastre, total
+
+def histograma_por_bloques(fuente, n=1, tam_bloque=TAM_BLOQUE):
+    """
+    Histograma de n-gramas de letras (sin distinguir mayúsculas) de una fuente:
+    ruta de fichero, fichero abierto, bytes o iterable de bloques (str o bytes).
+    El resultado es un array de 26^n contadores; el n-grama "ABC" está en la
+    posición 0*26^2 + 1*26 + 2.
+    """
+    _comprobar_n(n)
+    histograma, _, _, _ = _contar_bloques(_bloques(fuente, tam_bloque), n)
+    return histograma
+
+def _contar_rango(ruta, inicio, fin, n, tam_bloque):
+    """Trabajo de un proceso: cuenta el rango [inicio, fin) del fichero mapeado."""
+    with open(ruta, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        vista = memoryview(mapa)
+        try:
+            bloques = (vista[i:min(i + tam_bloque, fin)] for i in range(inicio, fin, tam_bloque))
+            return _contar_bloques(bloques, n)
+        finally:
+            vista.release()
+
+def histograma_paralelo(ruta, n=1, procesos=None, tam_bloque=TAM_BLOQUE):
+    """
+    Igual que histograma_por_bloques pero repartiendo el fichero mapeado en
+    memoria entre varios procesos. Los n-gramas que cruzan la frontera entre
+    dos trozos se cuentan al unir los resultados, con las letras de los extremos.
+    """
+    _comprobar_n(n)
+    tamano = os.path.getsize(ruta)
+    procesos = procesos or os.cpu_count() or 1
+    histograma = np.zeros(26 ** n, dtype=np.int64)
+    if tamano == 0:
+        return histograma
+
+    trozo = -(-tamano // procesos)
+    rangos = [(i, min(i + trozo, tamano)) for i in range(0, tamano, trozo)]
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = [ejecutor.submit(_contar_rango, ruta, i, f, n, tam_bloque) for i, f in rangos]
+        parciales = [futuro.result() for futuro in futuros]
+
+    cola = np.empty(0, dtype=np.uint8)
+    for parcial, cabeza, final, total in parciales:
+        histograma += parcial
+        if n == 1:
+            continue
+        # n-gramas que empiezan en la cola del trozo anterior y acaban en este
+        union = np.concatenate((cola, cabeza))
+        for i in range(min(len(cola), len(union) - n + 1)):
+            codigo = 0
+            for letra in union[i:i + n]:
+                codigo = codigo * 26 + int(letra)
+            histograma[codigo] += 1
+        cola = final if total >= n - 1 else union[len(union) - (n - 1):]
+    return histograma
+
+def histograma_a_diccionario(histograma, n=1):
+    """Convierte un histograma en un diccionario {n-grama: apariciones} sin ceros."""
+    resultado = {}
+    for codigo in np.flatnonzero(histograma):
+        letras = []
+        resto = int(codigo)
+        for _ in range(n):
+            resto, letra = divmod(resto, 26)
+            letras.append(ALFABETO[letra])
+        resultado[''.join(reversed(letras))] = int(histograma[codigo])
+    return resultado
+
+def analizar_frecuencia_fichero(ruta, n=1, paralelo=False):
+    """Equivalente a analizar_frecuencia para ficheros grandes y n-gramas."""
+    if paralelo:
+        histograma = histograma_paralelo(ruta, n)
+    else:
+        histograma = histograma_por_bloques(ruta, n)
+    return histograma_a_diccionario(histograma, n)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python frecuencias.py fichero [n] [--paralelo]")
+        sys.exit(1)
+    argumentos = [a for a in sys.argv[1:] if a != "--paralelo"]
+    n = int(argumentos[1]) if len(argumentos) > 1 else 1
+    frecuencias = analizar_frecuencia_fichero(argumentos[0], n, "--paralelo" in sys.argv)
+    for ngrama, apariciones in sorted(frecuencias.items(), key=lambda x: -x[1])[:30]:
+        print(f"{ngrama}: {apariciones}")
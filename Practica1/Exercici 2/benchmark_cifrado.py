@@ -0,0 +1,29 @@
+# Compara cifrar_cesar y cifrar_homofonos (carácter a carácter) con la API
+# de cifrado masivo (tablas precompiladas) sobre textos de 1 MB y 20 MB.
+# Uso: python benchmark_cifrado.py
+
+import time
+
+from ex2a import CifradorHomofonos, cifrar_cesar, cifrar_cesar_rapido, cifrar_homofonos, textoA
+
+TAMANOS = [1_000_000, 20_000_000]
+LIMITE_ORIGINAL = 1_000_000
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+if __name__ == "__main__":
+    print(f"{'tamaño':>10} {'césar orig':>11} {'césar tabla':>12} {'homóf. orig':>12} {'homóf. tabla':>13}  (MB/s)")
+    for tamano in TAMANOS:
+        texto = (textoA * (tamano // len(textoA) + 1))[:tamano]
+        mb = tamano / 1e6
+        if tamano <= LIMITE_ORIGINAL:
+            cesar_orig = f"{mb / medir(cifrar_cesar, texto, 5):11.1f}"
+            homo_orig = f"{mb / medir(cifrar_homofonos, texto):12.1f}"
+        else:
+            cesar_orig, homo_orig = f"{'-':>11}", f"{'-':>12}"
+        cesar = mb / medir(cifrar_cesar_rapido, texto, 5)
+        homo = mb / medir(CifradorHomofonos(semilla=0).cifrar, texto)
+        print(f"{tamano:>10} {cesar_orig} {cesar:12.1f} {homo_orig} {homo:13.1f}")
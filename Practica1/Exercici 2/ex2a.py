@@ -1,4 +1,8 @@
 import random
+from functools import lru_cache
+
+import numpy as np
+
 def cifrar_cesar(texto, desplazamiento):
     resultado = ""
 
@@ -12,36 +16,38 @@ def cifrar_cesar(texto, desplazamiento):
 
     return resultado
 
+MAPA_HOMOFONOS = {
+    "E": ["3", "F", "J", "9", "Ω", "Σ"],
+    "A": ["1", "L", "D", "8", "β"],
+    "O": ["7", "Q", "ψ", "4"],
+    "S": ["2", "M", "χ", "5"],
+    "R": ["Z", "δ", "6"],
+    "N": ["G", "ξ", "0"],
+    "I": ["V", "μ", "ϕ"],
+    "D": ["T", "κ", "2"],
+    "L": ["U", "θ", "λ"],
+    "T": ["C", "α", "3"],
+    "U": ["H", "η", "ν"],
+    "C": ["Y", "φ"],
+    "M": ["X", "ρ"],
+    "P": ["K", "π"],
+    "B": ["W"],
+    "G": ["N"],
+    "V": ["ϖ"],
+    "Y": ["Δ"],
+    "Q": ["Ψ"],
+    "H": ["ζ"],
+    "F": ["σ"],
+    "Z": ["ω"],
+    "J": ["χ"],
+    "Ñ": ["γ"],
+    "X": ["τ"],
+    "K": ["ε"],
+    "W": ["υ"]
+}
+
 def cifrar_homofonos(texto):
-    mapa_cifrado = {
-        "E": ["3", "F", "J", "9", "Ω", "Σ"],
-        "A": ["1", "L", "D", "8", "β"],
-        "O": ["7", "Q", "ψ", "4"],
-        "S": ["2", "M", "χ", "5"],
-        "R": ["Z", "δ", "6"],
-        "N": ["G", "ξ", "0"],
-        "I": ["V", "μ", "ϕ"],
-        "D": ["T", "κ", "2"],
-        "L": ["U", "θ", "λ"],
-        "T": ["C", "α", "3"],
-        "U": ["H", "η", "ν"],
-        "C": ["Y", "φ"],
-        "M": ["X", "ρ"],
-        "P": ["K", "π"],
-        "B": ["W"],
-        "G": ["N"],
-        "V": ["ϖ"],
-        "Y": ["Δ"],
-        "Q": ["Ψ"],
-        "H": ["ζ"],
-        "F": ["σ"],
-        "Z": ["ω"],
-        "J": ["χ"],
-        "Ñ": ["γ"],
-        "X": ["τ"],
-        "K": ["ε"],
-        "W": ["υ"]
-    }
+    mapa_cifrado = MAPA_HOMOFONOS
     resultado = ""
     for char in texto.upper():
         if char in mapa_cifrado:
@@ -50,6 +56,80 @@ def cifrar_homofonos(texto):
             resultado += char
     return resultado
     
+# ========== API DE CIFRADO MASIVO ==========
+# Los cifrados se compilan una sola vez en tablas de traducción y se aplican
+# a bloques grandes de texto en lugar de carácter a carácter.
+
+TAM_BLOQUE = 1 << 20  # caracteres (o bytes) por bloque
+
+@lru_cache(maxsize=None)
+def tabla_cesar(desplazamiento):
+    """Tabla de bytes.translate para un desplazamiento (A-Z y a-z, el resto no cambia)."""
+    mayusculas = bytes(range(ord('A'), ord('Z') + 1))
+    minusculas = mayusculas.lower()
+    desplazadas = mayusculas[desplazamiento % 26:] + mayusculas[:desplazamiento % 26]
+    return bytes.maketrans(mayusculas + minusculas, desplazadas + desplazadas.lower())
+
+def cifrar_cesar_rapido(texto, desplazamiento):
+    """
+    Igual que cifrar_cesar con una sola pasada de translate. Solo desplaza las
+    letras A-Z/a-z; las letras acentuadas se dejan igual en lugar de convertirlas
+    en caracteres arbitrarios. Acepta str o bytes (UTF-8).
+    """
+    if isinstance(texto, str):
+        return texto.encode("utf-8").translate(tabla_cesar(desplazamiento)).decode("utf-8")
+    return bytes(texto).translate(tabla_cesar(desplazamiento))
+
+def cifrar_cesar_fichero(origen, destino, desplazamiento, tam_bloque=TAM_BLOQUE):
+    """Cifra un fichero en bloques de bytes; los caracteres UTF-8 multibyte no se tocan."""
+    tabla = tabla_cesar(desplazamiento)
+    with open(origen, "rb") as entrada, open(destino, "wb") as salida:
+        for bloque in iter(lambda: entrada.read(tam_bloque), b""):
+            salida.write(bloque.translate(tabla))
+
+class CifradorHomofonos:
+    """
+    Cifrado homófono precompilado. Para cada letra se guarda un array con los
+    puntos de código de sus símbolos; al cifrar se eligen todos los símbolos de
+    un bloque de golpe con un generador de NumPy. Con la misma semilla el
+    resultado es siempre el mismo, aunque se cifre en bloques de otro tamaño.
+    """
+
+    def __init__(self, mapa=MAPA_HOMOFONOS, semilla=None):
+        # Letra (punto de código < 256, incluye Ñ) -> fila de la tabla de símbolos
+        self.fila = np.full(256, -1, dtype=np.intp)
+        ancho = max(len(simbolos) for simbolos in mapa.values())
+        self.simbolos = np.zeros((len(mapa), ancho), dtype=np.uint32)
+        self.opciones = np.zeros(len(mapa), dtype=np.intp)
+        for i, (letra, simbolos) in enumerate(mapa.items()):
+            self.fila[ord(letra)] = i
+            self.simbolos[i, :len(simbolos)] = [ord(c) for c in simbolos]
+            self.opciones[i] = len(simbolos)
+        self.rng = np.random.default_rng(semilla)
+
+    def cifrar(self, texto):
+        """Cifra un bloque de texto (se pasa a mayúsculas como cifrar_homofonos)."""
+        puntos = np.frombuffer(texto.upper().encode("utf-32-le"), dtype=np.uint32).copy()
+        filas = np.full(len(puntos), -1, dtype=np.intp)
+        latinos = puntos < 256
+        filas[latinos] = self.fila[puntos[latinos]]
+        cifrables = np.flatnonzero(filas >= 0)
+        filas = filas[cifrables]
+        elegidos = (self.rng.random(len(cifrables)) * self.opciones[filas]).astype(np.intp)
+        puntos[cifrables] = self.simbolos[filas, elegidos]
+        return puntos.tobytes().decode("utf-32-le")
+
+    def cifrar_flujo(self, bloques):
+        """Cifra un iterable de bloques de texto y genera los bloques cifrados."""
+        for bloque in bloques:
+            yield self.cifrar(bloque)
+
+    def cifrar_fichero(self, origen, destino, tam_bloque=TAM_BLOQUE):
+        with open(origen, encoding="utf-8") as entrada, open(destino, "w", encoding="utf-8") as salida:
+            for bloque in iter(lambda: entrada.read(tam_bloque), ""):
+                salida.write(self.cifrar(bloque))
+
+
 textoB = """Es verdad; pues reprimamos
 esta fiera condicion,
 esta furia, esta ambicion,
@@ -126,7 +206,8 @@ vuestra grandeza."""
 
 
 
-print(cifrar_cesar(textoB, 5))
-print(cifrar_homofonos(textoB))
+if __name__ == "__main__":
+    print(cifrar_cesar(textoB, 5))
+    print(cifrar_homofonos(textoB))
 
 
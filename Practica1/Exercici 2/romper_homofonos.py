@@ -0,0 +1,187 @@
+# Rompe el cifrado homófono de cifrar_homofonos buscando la asignación
+# símbolo -> letra que maximiza la puntuación de cuadrigramas del idioma.
+# La búsqueda es un recocido simulado: en cada paso se cambia la letra de un
+# solo símbolo y solo se vuelven a puntuar los cuadrigramas que lo contienen.
+# Los reinicios aleatorios se reparten entre procesos.
+#
+# Uso: python romper_homofonos.py   (benchmark con textoA y textoB)
+
+import os
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Tabla de cuadrigramas del modelo de lengua (carpeta ModelLlengua)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ModelLlengua'))
+
+from language_model import load_model
+
+ALFABETO = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# Con 0.2 la mayoría de reinicios acababa en texto degenerado; con 2.0 la
+# mitad de los reinicios de 30000 pasos sale bien en textoA y textoB (ver el
+# benchmark), y 8 reinicios dejan la probabilidad de fallar todos en 1/256
+PESO_FRECUENCIAS = 2.0
+
+def es_simbolo(char):
+    """Los símbolos del cifrado son letras (latinas o griegas) y dígitos; el resto se conserva."""
+    return char.isalnum()
+
+def _simbolos(cifrado):
+    """Devuelve (lista de símbolos distintos, array con el índice de símbolo de cada posición)."""
+    simbolos = sorted({c for c in cifrado if es_simbolo(c)})
+    indice = {c: i for i, c in enumerate(simbolos)}
+    secuencia = np.array([indice[c] for c in cifrado if es_simbolo(c)], dtype=np.intp)
+    return simbolos, secuencia
+
+def _codigos(plano, ventanas):
+    """Código de los cuadrigramas que empiezan en las posiciones de ventanas."""
+    return ((plano[ventanas] * 26 + plano[ventanas + 1]) * 26 + plano[ventanas + 2]) * 26 + plano[ventanas + 3]
+
+def _asignacion_inicial(secuencia, n_simbolos, probabilidades, rng):
+    """
+    Asignación voraz por frecuencias: los símbolos más frecuentes toman la letra
+    a la que aún le faltan más apariciones esperadas. Se desordenan los empates
+    para que cada reinicio empiece en un punto distinto.
+    """
+    conteo = np.bincount(secuencia, minlength=n_simbolos)
+    pendiente = probabilidades * len(secuencia)
+    asignacion = np.zeros(n_simbolos, dtype=np.intp)
+    orden = np.lexsort((rng.random(n_simbolos), -conteo))
+    for simbolo in orden:
+        letra = int(np.argmax(pendiente + rng.random(26) * 0.5))
+        asignacion[simbolo] = letra
+        pendiente[letra] -= conteo[simbolo]
+    return asignacion
+
+def resolver_homofonos(cifrado, idioma="spa", iteraciones=30000, temperatura=10.0, semilla=None,
+                       peso_frecuencias=PESO_FRECUENCIAS):
+    """
+    Busca la asignación símbolo -> letra con recocido simulado.
+    Cada paso cambia la letra de un símbolo y calcula la diferencia de
+    puntuación solo sobre los cuadrigramas que tocan sus apariciones.
+    La puntuación resta peso_frecuencias * chi-cuadrado de las letras: sin ese
+    término la búsqueda tiende a soluciones degeneradas (todo E, S y D) que
+    repiten los cuadrigramas más comunes. El término solo depende de dos
+    letras por paso, así que también se actualiza en O(1).
+    Devuelve un diccionario con la clave {símbolo: letra}, el texto descifrado
+    (conservando lo que no son símbolos) y la puntuación.
+    """
+    modelo = load_model(idioma)
+    tabla = np.array(modelo.tables[4], dtype=np.float64)
+    rng = np.random.default_rng(semilla)
+    simbolos, secuencia = _simbolos(cifrado)
+    n = len(secuencia)
+    if n < 4:
+        raise ValueError("el texto cifrado es demasiado corto")
+
+    # Para cada símbolo: sus posiciones y los cuadrigramas que las contienen
+    posiciones = [np.flatnonzero(secuencia == s) for s in range(len(simbolos))]
+    ventanas = [np.unique(np.clip(p[:, None] - np.arange(4), 0, n - 4)) for p in posiciones]
+
+    conteo = np.bincount(secuencia, minlength=len(simbolos))
+    esperado = modelo.letter_probabilities() * n
+    asignacion = _asignacion_inicial(secuencia, len(simbolos), modelo.letter_probabilities(), rng)
+    plano = asignacion[secuencia]
+    letras_plano = np.bincount(plano, minlength=26).astype(np.float64)
+
+    def penalizacion(letra, cantidad):
+        return peso_frecuencias * (cantidad - esperado[letra]) ** 2 / esperado[letra]
+
+    todas = np.arange(n - 3)
+    puntuacion = tabla[_codigos(plano, todas)].sum() - sum(penalizacion(l, letras_plano[l]) for l in range(26))
+    mejor_asignacion, mejor_puntuacion = asignacion.copy(), puntuacion
+
+    # Números aleatorios generados de una vez en lugar de uno por paso
+    elegidos = rng.integers(len(simbolos), size=iteraciones)
+    letras = rng.integers(26, size=iteraciones)
+    umbrales = np.log(rng.random(iteraciones))
+    for paso in range(iteraciones):
+        simbolo, letra = elegidos[paso], letras[paso]
+        anterior = asignacion[simbolo]
+        if letra == anterior:
+            continue
+        afectadas = ventanas[simbolo]
+        antes = tabla[_codigos(plano, afectadas)].sum()
+        plano[posiciones[simbolo]] = letra
+        delta = tabla[_codigos(plano, afectadas)].sum() - antes
+        veces = conteo[simbolo]
+        delta += (penalizacion(anterior, letras_plano[anterior]) + penalizacion(letra, letras_plano[letra])
+                  - penalizacion(anterior, letras_plano[anterior] - veces)
+                  - penalizacion(letra, letras_plano[letra] + veces))
+        t = temperatura * (1 - paso / iteraciones) + 1e-3
+        if delta >= 0 or umbrales[paso] < delta / t:
+            asignacion[simbolo] = letra
+            letras_plano[anterior] -= veces
+            letras_plano[letra] += veces
+            puntuacion += delta
+            if puntuacion > mejor_puntuacion:
+                mejor_asignacion, mejor_puntuacion = asignacion.copy(), puntuacion
+        else:
+            plano[posiciones[simbolo]] = anterior
+
+    clave = {s: ALFABETO[l] for s, l in zip(simbolos, mejor_asignacion)}
+    return {
+        "clave": clave,
+        "texto": descifrar_homofonos(cifrado, clave),
+        "puntuacion": float(mejor_puntuacion),
+    }
+
+def descifrar_homofonos(cifrado, clave):
+    """Sustituye cada símbolo por su letra y deja igual el resto de caracteres."""
+    return ''.join(clave.get(c, c) for c in cifrado)
+
+def resolver_homofonos_reinicios(cifrado, idioma="spa", reinicios=None, procesos=None, iteraciones=30000,
+                                 semilla=0):
+    """Lanza varios reinicios aleatorios en procesos distintos y devuelve todos los resultados."""
+    procesos = procesos or os.cpu_count() or 1
+    reinicios = reinicios or procesos
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = [ejecutor.submit(resolver_homofonos, cifrado, idioma, iteraciones, semilla=semilla + i)
+                   for i in range(reinicios)]
+        return [futuro.result() for futuro in futuros]
+
+def resolver_homofonos_paralelo(cifrado, idioma="spa", reinicios=None, procesos=None, iteraciones=30000,
+                                semilla=0):
+    """
+    Se queda con el reinicio de mejor puntuación. Alrededor de la mitad de los
+    reinicios acaba en un óptimo degenerado, así que conviene lanzar al menos 8.
+    """
+    resultados = resolver_homofonos_reinicios(cifrado, idioma, reinicios, procesos, iteraciones, semilla)
+    return max(resultados, key=lambda r: r["puntuacion"])
+
+def precision(original, descifrado):
+    """Fracción de letras recuperadas correctamente (sin acentos, Ñ cuenta como N)."""
+    normalizado = unicodedata.normalize('NFKD', original.upper()).encode('ascii', 'ignore').decode()
+    esperado = [c for c in normalizado if c in ALFABETO]
+    obtenido = [c for c in descifrado if c in ALFABETO]
+    if len(esperado) != len(obtenido) or not esperado:
+        return 0.0
+    return sum(a == b for a, b in zip(esperado, obtenido)) / len(esperado)
+
+
+if __name__ == "__main__":
+    import random
+
+    from ex2a import cifrar_homofonos, textoA, textoB
+
+    # cifrar_homofonos elige los homófonos con random.choice: la semilla solo
+    # fija el cifrado, para que el benchmark mida siempre el mismo texto
+    random.seed(1)
+    REINICIOS = 8
+    UMBRAL = 0.5  # Un reinicio sale bien si acierta al menos la mitad de las letras
+    for nombre, texto in [("textoA", textoA), ("textoB", textoB)]:
+        cifrado = cifrar_homofonos(texto)
+        inicio = time.perf_counter()
+        resultados = resolver_homofonos_reinicios(cifrado, reinicios=REINICIOS)
+        segundos = time.perf_counter() - inicio
+        aciertos = [precision(texto, r["texto"]) for r in resultados]
+        buenos = sum(a >= UMBRAL for a in aciertos)
+        mejor = max(resultados, key=lambda r: r["puntuacion"])
+        print(f"{nombre}: {segundos:.2f} s, {precision(texto, mejor['texto']):.1%} de letras correctas")
+        print(f"  reinicios buenos: {buenos}/{REINICIOS} ({buenos / REINICIOS:.0%});"
+              f" por reinicio: {' '.join(f'{a:.0%}' for a in aciertos)}")
+        print(mejor["texto"][:200])
+        print()
@@ -0,0 +1,155 @@
+# Servei per trencar molts textos xifrats amb Vigenère en paral·lel.
+# Llegeix els missatges d'un directori (un fitxer per missatge), d'un fitxer
+# JSONL ({"id": ..., "ciphertext": ...}) o de l'entrada estàndard en JSONL,
+# els reparteix en un ProcessPoolExecutor i escriu els resultats en JSONL
+# en ordre de finalització. Les mètriques de rendiment surten per stderr.
+#
+# Ús: python batch_vigenere.py [directori|fitxer.jsonl|-] [--workers N] [--top N]
+#                              [--max-key-len N] [--timeout S] [--max-in-flight N]
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from ex3 import find_vigenere_keys
+
+
+class ItemTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise ItemTimeout()
+
+
+def crack_item(item_id, ciphertext, max_key_len=10, top_n=5, timeout=None):
+    """
+    Feina d'un procés: trenca un missatge i retorna un diccionari amb el
+    resultat. El temps límit s'aplica dins del procés amb SIGALRM (si el
+    sistema el té), de manera que un missatge lent no bloqueja el treballador.
+    """
+    start = time.perf_counter()
+    use_alarm = timeout and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+    try:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        keys, plaintext = find_vigenere_keys(ciphertext, max_key_len, top_n, with_scores=True)
+        # Es desarma dins del try: si l'alarma salta just abans, també és un timeout
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        status = "ok"
+    except ItemTimeout:
+        keys, plaintext, status = [], "", "timeout"
+    finally:
+        if use_alarm:
+            try:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+            except ItemTimeout:
+                keys, plaintext, status = [], "", "timeout"
+    return {
+        "id": item_id,
+        "status": status,
+        "keys": [{"key": key, "score": score} for key, score in keys],
+        "plaintext": plaintext,
+        "chars": len(ciphertext),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def read_items(source):
+    """Genera parelles (id, text xifrat) d'un directori, un fitxer JSONL o stdin ('-')."""
+    if source != "-" and os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    yield name, f.read()
+        return
+
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                yield number, record
+            else:
+                yield record.get("id", number), record["ciphertext"]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def crack_batch(items, workers=None, max_in_flight=None, timeout=None, max_key_len=10, top_n=5,
+                stats=None):
+    """
+    Reparteix els missatges entre processos i genera els resultats a mesura
+    que acaben. Com a molt hi ha max_in_flight missatges enviats i pendents,
+    així que l'entrada es pot llegir en streaming sense omplir la memòria.
+    Si es passa un diccionari a stats s'hi deixen les mètriques de la tanda.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 4 * workers
+    stats = {} if stats is None else stats
+    stats.update(items=0, ok=0, timeout=0, error=0, chars=0)
+    start = time.perf_counter()
+    items = iter(items)
+    pending = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit_next():
+            for item_id, ciphertext in items:
+                future = executor.submit(crack_item, item_id, ciphertext, max_key_len, top_n, timeout)
+                pending[future] = item_id
+                return True
+            return False
+
+        while len(pending) < max_in_flight and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item_id = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as error:
+                    result = {"id": item_id, "status": "error", "error": repr(error)}
+                stats["items"] += 1
+                stats[result["status"]] += 1
+                stats["chars"] += result.get("chars", 0)
+                yield result
+                submit_next()
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = elapsed
+    stats["items_per_second"] = stats["items"] / elapsed if elapsed else 0.0
+    stats["chars_per_second"] = stats["chars"] / elapsed if elapsed else 0.0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trenca molts textos xifrats amb Vigenère en paral·lel.")
+    parser.add_argument("source", nargs="?", default="-", help="directori, fitxer JSONL o '-' per stdin")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--max-key-len", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=None, help="segons màxims per missatge")
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    args = parser.parse_args()
+
+    stats = {}
+    results = crack_batch(read_items(args.source), args.workers, args.max_in_flight, args.timeout,
+                          args.max_key_len, args.top, stats)
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+    print(f"{stats['items']} missatges ({stats['ok']} ok, {stats['timeout']} timeout, "
+          f"{stats['error']} error) en {stats['seconds']:.2f} s: "
+          f"{stats['items_per_second']:.1f} missatges/s, {stats['chars_per_second']:.0f} caràcters/s",
+          file=sys.stderr)
@@ -0,0 +1,71 @@
+# Mesura els nuclis de vigenere.py contra les versions originals amb cadenes.
+# Uso: python benchmark_vigenere.py
+# Els textos de prova es generen xifrant amb la clau PATITO paraules
+# barrejades del text desxifrat de l'exercici.
+
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+from math import gcd
+
+import numpy as np
+
+from ex3 import find_vigenere_keys, texto_cifrado
+from vigenere import VigenereStream, decode, encode, ic_profile, kasiski_guess, kasiski_votes
+
+SIZES = [100_000, 1_000_000, 10_000_000]
+ORIGINAL_LIMIT = 1_000_000
+
+def build_ciphertext(size, key="PATITO", seed=0):
+    _, plain = find_vigenere_keys(texto_cifrado, max_key_len=10, top_n=1)
+    words = plain.split()
+    rng = random.Random(seed)
+    text = ''.join(rng.choice(words) for _ in range(size // 4 + 1))
+    codes = encode(text)[:size]
+    shifts = encode(key)
+    return (codes + np.resize(shifts, len(codes))) % 26
+
+def original_kasiski(ct):
+    spacings = []
+    for seq_len in range(3, 6):
+        seq_locs = defaultdict(list)
+        for i in range(len(ct) - seq_len + 1):
+            seq_locs[ct[i:i+seq_len]].append(i)
+        for locs in seq_locs.values():
+            for i in range(len(locs) - 1):
+                spacings.append(locs[i+1] - locs[i])
+    g = 0
+    for s in spacings:
+        g = gcd(g, s)
+    return g
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+if __name__ == "__main__":
+    print(f"{'mida':>10} {'kasiski orig (s)':>17} {'MB':>7} {'kasiski nou (s)':>16} {'MB':>7} {'IC 2..100 (s)':>14}")
+    for size in SIZES:
+        codes = build_ciphertext(size)
+        if size <= ORIGINAL_LIMIT:
+            _, t_orig, m_orig = measure(original_kasiski, decode(codes))
+            orig = f"{t_orig:17.2f} {m_orig:7.0f}"
+        else:
+            orig = f"{'-':>17} {'-':>7}"
+        votes, t_new, m_new = measure(kasiski_votes, codes, 30)
+        _, t_ic, _ = measure(ic_profile, codes, 100)
+        print(f"{size:>10} {orig} {t_new:16.2f} {m_new:7.0f} {t_ic:14.2f}   (Kasiski: {kasiski_guess(votes)})")
+
+    # Desxifratge amb format per blocs (VigenereStream) sobre 100 MB de text
+    chunk = (texto_cifrado * (4_000_000 // len(texto_cifrado) + 1)).encode()[:4_000_000]
+    stream = VigenereStream("PATITO")
+    start = time.perf_counter()
+    for _ in range(25):
+        stream.process(chunk)
+    print(f"VigenereStream: {25 * len(chunk) / (time.perf_counter() - start) / 1e6:.0f} MB/s")
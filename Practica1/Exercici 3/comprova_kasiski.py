@@ -0,0 +1,46 @@
+# Comprovació de spacing_histogram contra un recompte de Kasiski en Python pur
+# (un diccionari amb l'última aparició de cada seqüència). Es fa a les mides
+# on canvien els tipus enters de NumPy (255/256/257 i 65535..65537 lletres),
+# amb un alfabet de 3 lletres perquè hi hagi moltes repeticions i amb text de
+# 26 lletres. Si algun histograma no coincideix, acaba amb codi 1.
+#
+# Ús: python comprova_kasiski.py
+
+import sys
+
+import numpy as np
+
+from vigenere import spacing_histogram
+
+MIDES = [255, 256, 257, 65535, 65536, 65537]
+MIN_LEN, MAX_LEN = 3, 5
+
+def espaiats_python(codes, min_len=MIN_LEN, max_len=MAX_LEN):
+    # Cada aparició d'una seqüència de min_len lletres es compara amb l'anterior
+    # i pesa tantes unitats com longituds (min_len..max_len) comparteixen
+    codes = codes.tolist()
+    hist = [0] * max(len(codes), 1)
+    darrera = {}
+    for i in range(len(codes) - min_len + 1):
+        sequencia = tuple(codes[i:i + min_len])
+        j = darrera.get(sequencia)
+        if j is not None:
+            hist[i - j] += sum(1 for longitud in range(min_len, max_len + 1)
+                               if i + longitud <= len(codes) and codes[j:j + longitud] == codes[i:i + longitud])
+        darrera[sequencia] = i
+    return hist
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    errors = 0
+    for lletres in (3, 26):
+        for mida in MIDES:
+            codes = rng.integers(0, lletres, mida).astype(np.uint8)
+            try:
+                correcte = spacing_histogram(codes, MIN_LEN, MAX_LEN).tolist() == espaiats_python(codes)
+            except (OverflowError, IndexError) as error:
+                correcte = False
+                print(f"  {type(error).__name__}: {error}")
+            errors += not correcte
+            print(f"{lletres:2d} lletres, {mida:6d} posicions: {'ok' if correcte else 'DIFERENT'}")
+    sys.exit(1 if errors else 0)
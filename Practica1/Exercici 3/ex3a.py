@@ -1,64 +1,40 @@
 # Programa que estima la longitud de la clau d'un text xifrat amb Vigenère
 
 import re
-from collections import Counter, defaultdict
-from math import gcd
 
-def estimate_key_length(ciphertext, max_key_len=30):
+from model_llengua import load_model
+from vigenere import encode, ic_profile, kasiski_guess, kasiski_votes
+
+def estimate_key_length(ciphertext, max_key_len=30, return_profile=False, language="cat"):
+    """
+    Estima la longitud de la clau combinant Kasiski i l'índex de coincidència.
+    Amb return_profile=True retorna (longitud, perfil) on perfil[k] és l'IC
+    mitjà de les columnes per a la longitud k.
+    """
     def sanitize(text):
         return re.sub('[^A-Za-z]', '', text).upper()
 
-    def index_of_coincidence(text):
-        N = len(text)
-        if N <= 1:
-            return 0.0
-        freqs = Counter(text)
-        return sum(v*(v-1) for v in freqs.values()) / (N*(N-1))
-
-    def repeated_sequences_spacings(ct, seq_len=3):
-        seq_locs = defaultdict(list)
-        for i in range(len(ct) - seq_len + 1):
-            seq = ct[i:i+seq_len]
-            seq_locs[seq].append(i)
-        spacings = []
-        for locs in seq_locs.values():
-            if len(locs) > 1:
-                for i in range(len(locs)-1):
-                    spacings.append(locs[i+1] - locs[i])
-        return spacings
-
-    def gcd_list(nums):
-        nums = [n for n in nums if n>0]
-        if not nums:
-            return None
-        g = nums[0]
-        for n in nums[1:]:
-            g = gcd(g, n)
-        return g
-
-    def avg_ic_for_keylen(ct, keylen):
-        cols = [''.join(ct[i::keylen]) for i in range(keylen)]
-        ics = [index_of_coincidence(col) for col in cols if len(col) > 1]
-        return sum(ics)/len(ics) if ics else 0.0
-
     ct = sanitize(ciphertext)
     if len(ct) < 20:
-        return None
+        return (None, None) if return_profile else None
+
+    codes = encode(ct)
 
-    # 1) Kasiski
-    spacings = []
-    for L in range(3,6):
-        spacings += repeated_sequences_spacings(ct, seq_len=L)
-    gcd_guess = gcd_list(spacings)
+    # 1) Kasiski: cada espaciado vota por sus divisores (sin mcd global)
+    kasiski_k = kasiski_guess(kasiski_votes(codes, max_key_len))
 
-    # 2) Índice de coincidencia
-    ic_scores = [(k, avg_ic_for_keylen(ct, k)) for k in range(2, max_key_len+1)]
-    ic_sorted = sorted(ic_scores, key=lambda x: abs(x[1]-0.074))  # Catalán ≈ 0.074
+    # 2) Índice de coincidencia: todas las longitudes a partir de una sola codificación
+    profile = ic_profile(codes, max_key_len)
+    ic_scores = [(k, profile[k]) for k in range(2, max_key_len+1)]
+    expected_ic = load_model(language).expected_ic()  # Catalán ≈ 0.073
+    ic_sorted = sorted(ic_scores, key=lambda x: abs(x[1]-expected_ic))
 
     # Elegimos la mejor candidata descartando longitud 1
     best_k = ic_sorted[0][0]
-    if gcd_guess and gcd_guess != 1:
-        return gcd_guess if ic_sorted[0][0] != gcd_guess else ic_sorted[0][0]
+    if kasiski_k and kasiski_k != 1:
+        best_k = kasiski_k
+    if return_profile:
+        return best_k, {k: float(ic) for k, ic in ic_scores}
     return best_k
 
 
@@ -88,4 +64,5 @@ jn vwi rtsvwusgtt tt zdnzqmis dx tt qaan ifp fux ml jp xbnkog ee lhqjmxvm bdmxa
 dbdbrxr xt msmt xv uzdcl lx zp mtbxwma fqwo fux tt zdnzqmis dx tt qaan q tdaivik sa
 mxbhrt elbtrxsmqv hgawqvwdntt wsa xbnkoigx lx qtstz"""
 
-print("La longitud estimada és de:", estimate_key_length(texto_cifrado))
\ No newline at end of file
+if __name__ == "__main__":
+    print("La longitud estimada és de:", estimate_key_length(texto_cifrado))
\ No newline at end of file
@@ -1,48 +1,19 @@
 import re 
-from collections import Counter
+
 from ex3a import estimate_key_length
+from model_llengua import load_model
+from vigenere import encode, frequency_vector, recover_key
 
-# Frecuencia típica del catalán (aproximada, en porcentaje)
-CATALAN_FREQ = {
-    'A': 12.53, 'B': 1.41, 'C': 4.16, 'D': 4.86, 'E': 12.36, 'F': 0.68,
-    'G': 1.74, 'H': 0.70, 'I': 6.88, 'J': 0.44, 'L': 4.97, 'M': 3.15,
-    'N': 7.01, 'O': 8.54, 'P': 2.91, 'Q': 1.02, 'R': 6.56, 'S': 8.05,
-    'T': 4.57, 'U': 4.46, 'V': 1.00, 'X': 1.22, 'Y': 0.14, 'Z': 0.52
-}
+# Frecuencia típica del catalán (en porcentaje), del modelo de lengua compartido
+CATALAN_FREQ = load_model("cat").letter_frequencies()
 
 def sanitize(text):
     return re.sub('[^A-Za-z]', '', text).upper()
 
-def shift_letter(letter, shift):
-    return chr((ord(letter) - ord('A') - shift) % 26 + ord('A'))
-
-def chi_squared_statistic(text):
-    N = len(text)
-    if N == 0:
-        return float('inf')
-    observed_counts = Counter(text)
-    chi2 = 0.0
-    for letter in CATALAN_FREQ:
-        observed = observed_counts.get(letter, 0)
-        expected = CATALAN_FREQ[letter] * N / 100
-        chi2 += ((observed - expected) ** 2) / expected if expected != 0 else 0
-    return chi2
-
 def find_key(ciphertext, key_length):
+    # Chi-cuadrado de los 26 desplazamientos de cada columna a partir de su histograma
     ct = sanitize(ciphertext)
-    key = ""
-    for i in range(key_length):
-        subalphabet = ct[i::key_length]
-        min_chi2 = float('inf')
-        best_shift = 0
-        for shift in range(26):
-            decrypted = ''.join(shift_letter(c, shift) for c in subalphabet)
-            chi2 = chi_squared_statistic(decrypted)
-            if chi2 < min_chi2:
-                min_chi2 = chi2
-                best_shift = shift
-        key += chr(ord('A') + best_shift)
-    return key
+    return recover_key(encode(ct), key_length, frequency_vector(CATALAN_FREQ), method="chi2")
 
 texto_cifrado = """tl fmmcse dilwhkb mg qgiibhocaeqlw iafjx qdnxonh rof i xlpmxv ws zalqlyx o izhjp dx
 stgxsdq xg jn fmmcse imk oiavik sas qqyfptzml rt snjlhxtnkbc eoeqtzuaummwra vwf sa
@@ -70,5 +41,6 @@ jn vwi rtsvwusgtt tt zdnzqmis dx tt qaan ifp fux ml jp xbnkog ee lhqjmxvm bdmxa
 dbdbrxr xt msmt xv uzdcl lx zp mtbxwma fqwo fux tt zdnzqmis dx tt qaan q tdaivik sa
 mxbhrt elbtrxsmqv hgawqvwdntt wsa xbnkoigx lx qtstz"""
 
-key_length = estimate_key_length(texto_cifrado)
-print("La clave estimada es:", find_key(texto_cifrado, key_length))
\ No newline at end of file
+if __name__ == "__main__":
+    key_length = estimate_key_length(texto_cifrado)
+    print("La clave estimada es:", find_key(texto_cifrado, key_length))
\ No newline at end of file
@@ -0,0 +1,13 @@
+# Accés al model de llengua de la Pràctica 1 (carpeta ModelLlengua) per als
+# programes de Vigenère d'aquest exercici: en lloc de repetir la ruta a cada
+# fitxer, ex3, ex3a i ex3b fan "from model_llengua import load_model", i
+# vigenere.py n'agafa la taula de lletres i encode.
+
+import os
+import sys
+
+_RUTA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ModelLlengua')
+if _RUTA not in sys.path:
+    sys.path.append(_RUTA)
+
+from language_model import LETTER_INDEX, encode, load_model
@@ -0,0 +1,247 @@
+# Nuclis vectoritzats compartits pels programes de Vigenère (ex3, ex3a, ex3b).
+# El text xifrat es codifica una sola vegada com a array uint8 (A=0 ... Z=25)
+# i tots els càlculs es fan sobre aquest array amb NumPy.
+
+import mmap
+import os
+
+import numpy as np
+
+# encode (text -> array 0..25, equival a sanitize()) i la taula de lletres
+# són els del model de llengua, perquè tots els programes codifiquin igual
+from model_llengua import LETTER_INDEX, encode
+
+# Per a bytes.translate: índex de la lletra amb el bit 0x20 si és minúscula
+_CASED_LETTER_INDEX = LETTER_INDEX.copy()
+_CASED_LETTER_INDEX[ord('a'):ord('z') + 1] |= 0x20
+_CASED_LETTER_TABLE = _CASED_LETTER_INDEX.tobytes()
+
+def decode(codes):
+    """Operació inversa d'encode: array 0..25 -> cadena en majúscules."""
+    return (np.asarray(codes, dtype=np.uint8) + ord('A')).tobytes().decode('ascii')
+
+def column_histograms(codes, keylen):
+    """
+    Histograma de les 26 lletres de cada columna i::keylen, amb un sol bincount 2-D.
+    Retorna un array (keylen, 26).
+    """
+    codes = np.asarray(codes, dtype=np.intp)
+    full = len(codes) - len(codes) % keylen
+    # Cada fila del reshape és un bloc de keylen lletres; la columna j suma 26*j
+    offsets = np.arange(0, 26 * keylen, 26, dtype=np.intp)
+    flat = (codes[:full].reshape(-1, keylen) + offsets).ravel()
+    hist = np.bincount(flat, minlength=26 * keylen)
+    tail = codes[full:] + offsets[:len(codes) - full]
+    np.add.at(hist, tail, 1)
+    return hist.reshape(keylen, 26)
+
+def ic_profile(codes, max_key_len=30):
+    """
+    Índex de coincidència mitjà de les columnes per a cada longitud de clau.
+    profile[k] és la mitjana de l'IC de les k columnes (profile[0] no s'usa).
+    Només es consideren columnes amb més d'una lletra, com avg_ic_for_keylen.
+    """
+    codes = np.asarray(codes, dtype=np.intp)
+    profile = np.zeros(max_key_len + 1)
+    for keylen in range(1, max_key_len + 1):
+        hist = column_histograms(codes, keylen)
+        sizes = hist.sum(axis=1)
+        valid = sizes > 1
+        if not valid.any():
+            continue
+        coincidences = (hist[valid] * (hist[valid] - 1)).sum(axis=1)
+        profile[keylen] = (coincidences / (sizes[valid] * (sizes[valid] - 1))).mean()
+    return profile
+
+def spacing_histogram(codes, min_len=3, max_len=5, chunk=1 << 20):
+    """
+    Kasiski: histograma de les distàncies entre aparicions consecutives de
+    cada seqüència repetida, amb un sol índex per a totes les longituds.
+    Cada posició rep el codi polinòmic dels seus min_len caràcters (un hash
+    exacte en base 26); ordenar aquests codis agrupa les repeticions. Cada
+    parella es pondera amb el nombre de longituds entre min_len i max_len que
+    comparteix, com si s'haguessin buscat les seqüències de cada longitud.
+    hist[s] és el pes total dels espaiats iguals a s.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    n = len(codes) - min_len + 1
+    # Cada parella suma com a molt max_len - min_len + 1: n'hi ha prou amb int32
+    counter = np.int32 if (max_len - min_len + 1) * len(codes) < 2**31 else np.int64
+    hist = np.zeros(max(len(codes), 1), dtype=counter)
+    if n <= 1:
+        return hist
+
+    grams = codes[:n].astype(np.min_scalar_type(26 ** min_len - 1))
+    for k in range(1, min_len):
+        grams *= 26
+        grams += codes[k:k + n]
+    # Ordenació estable: dins de cada grup les posicions queden creixents.
+    # Les posicions es queden en intp: amb un tipus més estret, second + extra
+    # desbordaria (o NumPy 2 fallaria) just al límit de uint8/uint16
+    order = np.argsort(grams, kind='stable')
+    sorted_grams = grams[order]
+    del grams
+
+    for start in range(0, n - 1, chunk):
+        stop = min(start + chunk, n - 1)
+        same = sorted_grams[start + 1:stop + 1] == sorted_grams[start:stop]
+        first = order[start:stop][same]
+        second = order[start + 1:stop + 1][same]
+        weights = np.ones(len(first), dtype=counter)
+        match = np.ones(len(first), dtype=bool)
+        for extra in range(min_len, max_len):
+            inside = second + extra < len(codes)
+            last = len(codes) - 1
+            match &= inside & (codes[np.minimum(first + extra, last)] == codes[np.minimum(second + extra, last)])
+            weights += match
+        np.add.at(hist, second - first, weights)
+    return hist
+
+def kasiski_votes(codes, max_key_len=30, min_len=3, max_len=5):
+    """
+    Vots de Kasiski per a cada longitud de clau (votes[0] i votes[1] no s'usen).
+    En lloc del mcd global, que un sol espaiat sorollós fa caure a 1, cada
+    espaiat vota per tots els seus divisors. El vot de d es multiplica per d
+    perquè un espaiat aleatori és múltiple de d amb probabilitat 1/d: un vot
+    normalitzat proper a 1 és soroll.
+    """
+    hist = spacing_histogram(codes, min_len, max_len)
+    total = hist.sum()
+    votes = np.zeros(max_key_len + 1)
+    if total == 0:
+        return votes
+    for d in range(2, max_key_len + 1):
+        votes[d] = hist[d::d].sum() * d / total
+    return votes
+
+def kasiski_guess(votes, tolerance=0.9, min_vote=1.5):
+    """
+    Longitud de clau segons els vots de Kasiski, o None si cap longitud
+    destaca del soroll (vot normalitzat inferior a min_vote).
+    Els múltiples de la longitud real obtenen vots semblants, així que es
+    tria la longitud més petita amb un vot d'almenys tolerance * màxim.
+    """
+    best = votes.max()
+    if best < min_vote:
+        return None
+    return int(np.flatnonzero(votes >= tolerance * best)[0])
+
+def frequency_vector(freqs):
+    """Diccionari {lletra: freqüència} -> array de 26 posicions (0 per a les absents)."""
+    return np.array([freqs.get(chr(ord('A') + i), 0.0) for i in range(26)], dtype=float)
+
+def circulant(vector):
+    """
+    Matriu C[c, s] = vector[(c - s) % 26].
+    Multiplicar un histograma de text xifrat per C avalua els 26 desplaçaments:
+    la lletra xifrada c desxifrada amb el desplaçament s és (c - s) % 26.
+    """
+    index = (np.arange(26)[:, None] - np.arange(26)[None, :]) % 26
+    return np.asarray(vector, dtype=float)[index]
+
+def shift_scores(hist, freqs, method="dot"):
+    """
+    Puntuació dels 26 desplaçaments de cada columna a partir dels histogrames
+    (columnes, 26), sense construir cap text desxifrat.
+      - "dot": producte escalar entre les freqüències relatives desxifrades i el
+        perfil de l'idioma (més alt és millor, com best_key_for_length).
+      - "chi2": chi-quadrat respecte a les freqüències esperades, en percentatge,
+        només sobre les lletres del perfil (més baix és millor, com find_key).
+    Retorna una matriu (columnes, 26).
+    """
+    hist = np.asarray(hist, dtype=float)
+    freqs = np.asarray(freqs, dtype=float)
+    sizes = hist.sum(axis=1, keepdims=True)
+    if method == "dot":
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.nan_to_num((hist @ circulant(freqs)) / sizes)
+    if method == "chi2":
+        # Σ (o - E)²/E = Σ o²/E - 2 Σ o + Σ E, amb E = f·N/100 per a cada lletra del perfil
+        present = freqs > 0
+        inverse = np.where(present, 100.0 / np.where(present, freqs, 1.0), 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            chi2 = ((hist ** 2) @ circulant(inverse)) / sizes
+        chi2 -= 2 * (hist @ circulant(present))
+        chi2 += sizes * freqs.sum() / 100
+        chi2[sizes[:, 0] == 0] = np.inf
+        return chi2
+    raise ValueError(f"mètode desconegut: {method}")
+
+def recover_key(codes, keylen, freqs, method="dot"):
+    """
+    Clau més probable per a una longitud donada: un histograma per columna,
+    una matriu de puntuacions 26×26 i el millor desplaçament de cada columna.
+    """
+    scores = shift_scores(column_histograms(codes, keylen), freqs, method)
+    shifts = scores.argmax(axis=1) if method == "dot" else scores.argmin(axis=1)
+    return decode(shifts)
+
+class VigenereStream:
+    """
+    Xifra o desxifra Vigenère per blocs de bytes conservant majúscules,
+    minúscules, espais i puntuació (com vigenere_decrypt_with_format).
+    La posició dins de la clau es guarda entre blocs, de manera que un
+    document es pot processar a trossos amb memòria constant. Els bytes que
+    no són A-Z/a-z (inclosos els caràcters UTF-8 multibyte) no es toquen.
+    """
+
+    def __init__(self, key, decrypt=True):
+        shifts = encode(key)
+        if len(shifts) == 0:
+            raise ValueError("la clau ha de tenir almenys una lletra")
+        # Desplaçaments sempre positius (0..25) per treballar en uint8
+        self.shifts = ((26 - shifts) % 26 if decrypt else shifts).astype(np.uint8)
+        self.position = 0
+
+    def process(self, chunk):
+        """Processa un bloc (bytes, bytearray o memoryview) i retorna els bytes resultants."""
+        data = np.frombuffer(chunk, dtype=np.uint8)
+        # Una sola traducció dona l'índex de la lletra i el bit de minúscula (0x20)
+        coded = np.frombuffer(bytes(chunk).translate(_CASED_LETTER_TABLE), dtype=np.uint8)
+        letters = coded != 255
+        values = coded[letters]
+        if len(values) == 0:
+            return bytes(chunk)
+        lower = values & 0x20
+        values &= 0x1f
+        # Clau repetida a partir de la posició on va acabar el bloc anterior
+        key = np.roll(self.shifts, -self.position)
+        values += np.tile(key, len(values) // len(key) + 1)[:len(values)]
+        # Mòdul 26 en uint8: si v < 26, v - 26 dona la volta i el mínim és v
+        np.minimum(values, values - np.uint8(26), out=values)
+        values += lower
+        values += ord('A')
+        out = data.copy()
+        out[letters] = values
+        self.position = (self.position + len(values)) % len(key)
+        return out.tobytes()
+
+    def process_text(self, text):
+        return self.process(text.encode('utf-8')).decode('utf-8')
+
+def vigenere_stream(chunks, key, decrypt=True):
+    """Genera els blocs xifrats/desxifrats d'un iterable de blocs (str o bytes)."""
+    stream = VigenereStream(key, decrypt)
+    for chunk in chunks:
+        yield stream.process_text(chunk) if isinstance(chunk, str) else stream.process(chunk)
+
+def vigenere_file(source, destination, key, decrypt=True, chunk_size=1 << 22):
+    """
+    Xifra o desxifra un fitxer sencer mapant-lo en memòria i escrivint-lo per
+    blocs: la memòria usada no depèn de la mida del fitxer.
+    """
+    stream = VigenereStream(key, decrypt)
+    with open(source, 'rb') as f, open(destination, 'wb') as out:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), chunk_size):
+                out.write(stream.process(mapped[start:start + chunk_size]))
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 5 or sys.argv[1] not in ("xifra", "desxifra"):
+        print("Ús: python vigenere.py xifra|desxifra CLAU origen destí")
+        sys.exit(1)
+    vigenere_file(sys.argv[3], sys.argv[4], sys.argv[2], decrypt=sys.argv[1] == "desxifra")
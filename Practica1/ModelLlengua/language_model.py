@@ -0,0 +1,148 @@
+# Model de llengua compartit pels programes de la Pràctica 1.
+# Cada idioma té taules de log-probabilitats (log10) d'unigrames, bigrames i
+# quadrigrames entrenades a partir d'un corpus (corpus/<idioma>.txt) i desades
+# en format .npy (models/<idioma>_<n>.npy). La taula de quadrigrames té 26^4
+# floats i es carrega amb mmap, de manera que obrir un model no llegeix res
+# fins que no es fa servir.
+#
+# Corpus: eng.txt són les "Queries" del llibre III d'Opticks d'Isaac Newton
+# (1730, domini públic, transcripció de Project Gutenberg); cat.txt i spa.txt
+# són prosa escrita per a aquest repositori i cedida al domini públic. Cap
+# d'ells no pot contenir els textos dels exercicis ni les seves solucions:
+# els trencadors quedarien puntuats contra la seva pròpia resposta.
+#
+# Ús: python language_model.py [idioma ...]   (torna a entrenar els models)
+
+import os
+import sys
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BASE_DIR, "corpus")
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+LANGUAGES = ("cat", "spa", "eng")
+ORDERS = (1, 2, 4)
+
+# Taula byte -> índex de lletra (0..25); 255 per a tot el que no sigui A-Z/a-z.
+# És l'única còpia: vigenere.py i frecuencias.py la importen d'aquí amb encode
+LETTER_INDEX = np.full(256, 255, dtype=np.uint8)
+for _i in range(26):
+    LETTER_INDEX[ord('A') + _i] = _i
+    LETTER_INDEX[ord('a') + _i] = _i
+
+
+def encode(text):
+    """Text (str o bytes) -> array uint8 amb valors 0..25, sense res que no sigui A-Z."""
+    data = text.encode('utf-8') if isinstance(text, str) else text
+    indices = LETTER_INDEX[np.frombuffer(data, dtype=np.uint8)]
+    return indices[indices != 255]
+
+
+def strip_accents(text):
+    """Treu accents i diacrítics (à -> a, ç -> c, ñ -> n) perquè comptin com a lletres."""
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+
+
+def ngram_codes(codes, n):
+    """Codi en base 26 de cada n-grama consecutiu de l'array de lletres."""
+    codes = np.asarray(codes)
+    total = len(codes) - n + 1
+    if total <= 0:
+        return np.empty(0, dtype=np.intp)
+    result = np.zeros(total, dtype=np.intp)
+    for k in range(n):
+        result *= 26
+        result += codes[k:k + total]
+    return result
+
+
+class LanguageModel:
+    """
+    Taules de log10-probabilitats d'un idioma.
+    tables[n] és un array de 26^n posicions; el n-grama "ABC" és a 0*26² + 1*26 + 2.
+    """
+
+    def __init__(self, name, tables):
+        self.name = name
+        self.tables = tables
+
+    @classmethod
+    def train(cls, name, text):
+        """
+        Entrena el model amb un text. Els n-grames que no apareixen reben
+        log10(0.01 / total), el mateix mínim per a tots.
+        """
+        codes = encode(strip_accents(text).upper())
+        tables = {}
+        for n in ORDERS:
+            counts = np.bincount(ngram_codes(codes, n), minlength=26 ** n).astype(np.float64)
+            total = max(counts.sum(), 1.0)
+            if n == 1:
+                # Unigrames amb suavitzat de Laplace: les freqüències han de sumar 1
+                tables[n] = np.log10((counts + 1) / (total + 26)).astype(np.float32)
+            else:
+                floor = np.log10(0.01 / total)
+                with np.errstate(divide='ignore'):
+                    tables[n] = np.where(counts > 0, np.log10(counts / total), floor).astype(np.float32)
+        return cls(name, tables)
+
+    def save(self, directory=MODELS_DIR):
+        os.makedirs(directory, exist_ok=True)
+        for n, table in self.tables.items():
+            np.save(os.path.join(directory, f"{self.name}_{n}.npy"), table)
+
+    @classmethod
+    def load(cls, name, directory=MODELS_DIR):
+        tables = {n: np.load(os.path.join(directory, f"{name}_{n}.npy"), mmap_mode='r') for n in ORDERS}
+        return cls(name, tables)
+
+    # ---------- Estadístiques derivades ----------
+
+    def letter_probabilities(self):
+        """Probabilitat de cada lletra A..Z (array de 26 que suma 1)."""
+        return np.power(10.0, np.asarray(self.tables[1], dtype=np.float64))
+
+    def letter_frequencies(self):
+        """Freqüències en percentatge com a diccionari {lletra: %}, com CATALAN_FREQ."""
+        return {chr(ord('A') + i): float(p * 100) for i, p in enumerate(self.letter_probabilities())}
+
+    def expected_ic(self):
+        """Índex de coincidència esperat per a un text de l'idioma (Σ p²)."""
+        return float((self.letter_probabilities() ** 2).sum())
+
+    # ---------- Puntuació ----------
+
+    def score_codes(self, codes, n=4):
+        """Log10-versemblança d'un array de lletres: una consulta vectoritzada i una suma."""
+        table = self.tables[n]
+        return float(np.asarray(table[ngram_codes(codes, n)], dtype=np.float64).sum())
+
+    def score(self, text, n=4):
+        """Log10-versemblança d'un text (només en compten les lletres A-Z)."""
+        return self.score_codes(encode(text), n)
+
+    def score_per_letter(self, text, n=4):
+        """Puntuació normalitzada per nombre de n-grames, comparable entre longituds."""
+        codes = encode(text)
+        return self.score_codes(codes, n) / max(len(codes) - n + 1, 1)
+
+
+@lru_cache(maxsize=None)
+def load_model(name):
+    """Model d'un idioma ('cat', 'spa', 'eng'), carregat una sola vegada per procés."""
+    return LanguageModel.load(name)
+
+
+def train_from_corpus(name):
+    with open(os.path.join(CORPUS_DIR, f"{name}.txt"), encoding="utf-8") as f:
+        return LanguageModel.train(name, f.read())
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or LANGUAGES:
+        model = train_from_corpus(name)
+        model.save()
+        print(f"{name}: IC esperat {model.expected_ic():.4f}")
@@ -0,0 +1,179 @@
+# MCD per lots (Bernstein) sobre molts mòduls RSA per trobar primers compartits.
+# En lloc de fer els k² mcd de totes les parelles:
+#   1) arbre de productes: cada nivell multiplica els nombres del nivell
+#      anterior de dos en dos fins a arribar al producte P de tots els mòduls;
+#   2) arbre de residus: es baixa des de P calculant R mod fill² a cada node;
+#   3) per a cada mòdul n amb residu R, mcd(R / n, n) > 1 si i només si n
+#      comparteix algun primer amb un altre mòdul.
+# Els nivells es poden desar a disc (directori de punts de control): així
+# només hi ha un nivell a memòria i un càlcul interromput es reprèn des de
+# l'últim nivell desat. Cada nivell es pot repartir entre processos.
+#
+# Ús: python batch_gcd.py [--processos N] [--checkpoint DIR] fitxer [...]
+#     (fitxers PEM de claus o de text amb un mòdul per línia, decimal o 0x...)
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+
+MIN_NODES_PROCESSOS = 64  # Nodes mínims d'un nivell perquè valgui la pena repartir-lo
+
+def _productes(nivell):
+    # Productes de parelles consecutives; un element sobrer passa tal qual
+    return [nivell[i] * nivell[i + 1] if i + 1 < len(nivell) else nivell[i] for i in range(0, len(nivell), 2)]
+
+def _residus(pares, fills):
+    # Residu de cada pare mòdul el quadrat dels seus dos fills
+    return [pares[i // 2] % (fill * fill) for i, fill in enumerate(fills)]
+
+def _trossos(llista, n, parell=True):
+    # Divideix la llista en n trossos contigus (de mida parella si cal)
+    mida = max(-(-len(llista) // n), 1)
+    if parell:
+        mida += mida % 2
+    return [llista[i:i + mida] for i in range(0, len(llista), mida)]
+
+class _Nivells:
+    # Magatzem dels nivells de l'arbre de productes: en memòria o a disc
+    def __init__(self, directori, empremta):
+        self.directori = directori
+        self.memoria = []
+        if directori:
+            os.makedirs(directori, exist_ok=True)
+            meta = os.path.join(directori, "empremta")
+            anterior = None
+            if os.path.exists(meta):
+                with open(meta) as f:
+                    anterior = f.read()
+            if anterior != empremta:
+                # Dades noves: els punts de control antics no serveixen
+                for nom in os.listdir(directori):
+                    if nom.startswith("producte_"):
+                        os.remove(os.path.join(directori, nom))
+                with open(meta, "w") as f:
+                    f.write(empremta)
+
+    def _ruta(self, i):
+        return os.path.join(self.directori, f"producte_{i}.pkl")
+
+    def existeix(self, i):
+        return self.directori and os.path.exists(self._ruta(i))
+
+    def desa(self, i, nivell):
+        if not self.directori:
+            self.memoria.append(nivell)
+            return
+        temporal = self._ruta(i) + ".tmp"
+        with open(temporal, "wb") as f:
+            pickle.dump(nivell, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, self._ruta(i))  # El nivell només existeix si s'ha escrit sencer
+
+    def carrega(self, i):
+        if not self.directori:
+            return self.memoria[i]
+        with open(self._ruta(i), "rb") as f:
+            return pickle.load(f)
+
+def mcd_per_lots(moduls, processos=1, directori=None):
+    # Retorna una llista amb mcd(n_i, producte de la resta) per a cada mòdul
+    # (1 si no comparteix cap primer). Amb directori, els nivells es desen i
+    # es reprenen; amb processos > 1 es reparteixen entre processos.
+    moduls = list(moduls)
+    if len(moduls) < 2:
+        return [1] * len(moduls)
+    empremta = hashlib.sha256(repr(moduls).encode()).hexdigest()
+    nivells = _Nivells(directori, empremta)
+    executor = ProcessPoolExecutor(max_workers=processos) if processos > 1 else None
+    try:
+        # 1) Arbre de productes, de les fulles a l'arrel
+        nivell, i = moduls, 0
+        while True:
+            if not nivells.existeix(i):
+                nivells.desa(i, nivell)
+            if len(nivell) == 1:
+                break
+            if nivells.existeix(i + 1):
+                nivell = nivells.carrega(i + 1)  # Represa: aquest nivell ja es va calcular
+            elif executor and len(nivell) >= MIN_NODES_PROCESSOS:
+                nivell = [p for tros in executor.map(_productes, _trossos(nivell, processos)) for p in tros]
+            else:
+                nivell = _productes(nivell)
+            i += 1
+
+        # 2) Arbre de residus, de l'arrel a les fulles
+        residus = nivell
+        for j in range(i - 1, -1, -1):
+            fills = nivells.carrega(j)
+            if executor and len(fills) >= MIN_NODES_PROCESSOS:
+                trossos = _trossos(fills, processos)
+                pares, inici = [], 0
+                for tros in trossos:
+                    pares.append(residus[inici // 2:(inici + len(tros) + 1) // 2])
+                    inici += len(tros)
+                residus = [r for tros in executor.map(_residus, pares, trossos) for r in tros]
+            else:
+                residus = _residus(residus, fills)
+    finally:
+        if executor:
+            executor.shutdown()
+
+    # 3) mcd(R / n, n) per a cada mòdul
+    return [gcd(r // n, n) for r, n in zip(residus, moduls)]
+
+def moduls_vulnerables(moduls, processos=1, directori=None):
+    # Llista de (índex, n, p, q) dels mòduls que comparteixen algun primer.
+    # Si el mcd és el mòdul sencer (comparteix els dos primers, o és repetit),
+    # es busca el factor amb mcd per parelles entre els mòduls afectats; un
+    # mòdul repetit sense cap factor propi dona p = n i q = 1.
+    moduls = list(moduls)
+    mcds = mcd_per_lots(moduls, processos, directori)
+    afectats = [i for i, g in enumerate(mcds) if g > 1]
+    resultat = []
+    for i in afectats:
+        n, g = moduls[i], mcds[i]
+        if g == n:
+            for j in afectats:
+                g_parella = gcd(n, moduls[j])
+                if j != i and 1 < g_parella < n:
+                    g = g_parella
+                    break
+        resultat.append((i, n, g, n // g))
+    return resultat
+
+def llegeix_moduls(ruta):
+    # Mòduls d'un fitxer PEM/DER (una clau) o de text (un mòdul per línia)
+    with open(ruta, "rb") as f:
+        dades = f.read()
+    if b"-----BEGIN" in dades or dades[:1] == b"\x30":
+        try:
+            from .claus import carrega_clau
+        except ImportError:  # Executat des de la carpeta, fora del paquet criptografia
+            sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Exercici3'))
+            from claus import carrega_clau
+        return [carrega_clau(dades).n]
+    return [int(linia, 0) for linia in dades.decode().split() if linia]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Busca primers compartits entre mòduls RSA (MCD per lots).")
+    parser.add_argument("fitxers", nargs="+")
+    parser.add_argument("--processos", type=int, default=1)
+    parser.add_argument("--checkpoint", default=None, help="directori on desar els nivells de l'arbre")
+    args = parser.parse_args()
+
+    moduls, origen = [], []
+    for ruta in args.fitxers:
+        for n in llegeix_moduls(ruta):
+            moduls.append(n)
+            origen.append(ruta)
+    vulnerables = moduls_vulnerables(moduls, args.processos, args.checkpoint)
+    for i, n, p, q in vulnerables:
+        if q == 1:
+            print(f"{origen[i]} (mòdul {i}): el mateix mòdul apareix en una altra clau")
+        else:
+            print(f"{origen[i]} (mòdul {i}): comparteix el factor {p}")
+    print(f"{len(vulnerables)} de {len(moduls)} mòduls comparteixen algun primer")
@@ -0,0 +1,48 @@
+# Compara el MCD per lots (arbres de productes i residus) amb el mcd de totes
+# les parelles de mòduls fet amb maxim_comu_divisor, per a k mòduls de 512
+# bits amb uns quants primers compartits. El mètode per parelles es mesura
+# sobre una mostra i s'extrapola als k(k-1)/2 mcd.
+# Ús: python benchmark_batch_gcd.py
+
+import os
+import random
+import sys
+import time
+
+from batch_gcd import moduls_vulnerables
+from ex1a import maxim_comu_divisor
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Exercici2'))
+
+from primers import primer_aleatori
+
+K = [100, 1000, 4000]
+COMPARTITS = 5
+BITS_PRIMER = 256
+
+def moduls_de_prova(k, primers):
+    moduls = [primers[2 * i] * primers[2 * i + 1] for i in range(k)]
+    # Uns quants mòduls reutilitzen un primer d'un altre
+    for i in range(COMPARTITS):
+        moduls[k - 1 - i] = primers[2 * i] * primers[2 * k + i]
+    return moduls
+
+if __name__ == "__main__":
+    random.seed(0)
+    primers = [primer_aleatori(BITS_PRIMER) for _ in range(2 * max(K) + COMPARTITS)]
+    processos = os.cpu_count() or 1
+    print(f"{'k':>6} {'parelles (est.)':>16} {'per lots':>10} {f'lots x{processos}':>10}  (s)   vulnerables")
+    for k in K:
+        moduls = moduls_de_prova(k, primers)
+        mostra = [(random.choice(moduls), random.choice(moduls)) for _ in range(2000)]
+        inici = time.perf_counter()
+        for a, b in mostra:
+            maxim_comu_divisor(a, b)
+        parelles = (time.perf_counter() - inici) / len(mostra) * k * (k - 1) / 2
+        inici = time.perf_counter()
+        vulnerables = moduls_vulnerables(moduls)
+        lots = time.perf_counter() - inici
+        inici = time.perf_counter()
+        assert moduls_vulnerables(moduls, processos) == vulnerables
+        lots_paral = time.perf_counter() - inici
+        print(f"{k:>6} {parelles:16.2f} {lots:10.2f} {lots_paral:10.2f}        {len(vulnerables)}")
@@ -0,0 +1,64 @@
+# Compara l'Euclides estès recursiu original amb la versió iterativa, Lehmer i
+# pow(a, -1, n) de Python, per a operands de 64 a 8192 bits. També compara
+# invertir N valors un per un amb invers_modular_lot (truc de Montgomery).
+# Ús: python benchmark_euclides.py
+
+import math
+import random
+import time
+
+from ex1b import (euclides_extes, euclides_extes_lehmer, euclides_extes_recursiu, invers_modular,
+                  invers_modular_lot)
+
+BITS = [64, 256, 1024, 2048, 4096, 8192]
+REPETICIONS = 50
+N_LOT = 2000
+# Primers de Mersenne 2^p - 1: mòduls on tots els valors no nuls són invertibles
+PRIMERS_LOT = [61, 521, 1279, 2203]
+
+def mesura(funcio, parelles):
+    inici = time.perf_counter()
+    for a, b in parelles:
+        funcio(a, b)
+    return (time.perf_counter() - inici) / len(parelles) * 1e6
+
+def mesura_recursiu(parelles):
+    try:
+        return f"{mesura(euclides_extes_recursiu, parelles):10.1f}"
+    except RecursionError:
+        return f"{'recursió':>10}"
+
+if __name__ == "__main__":
+    random.seed(0)
+    print("Euclides estès (µs per crida)")
+    print(f"{'bits':>6} {'recursiu':>10} {'iteratiu':>10} {'Lehmer':>10} {'pow':>10}")
+    for bits in BITS:
+        parelles = [(random.getrandbits(bits) | 1, random.getrandbits(bits) | 1) for _ in range(REPETICIONS)]
+        for a, b in parelles:
+            d, x, y = euclides_extes_lehmer(a, b)
+            assert euclides_extes(a, b)[0] == d and a * x + b * y == d
+        recursiu = mesura_recursiu(parelles)
+        iteratiu = mesura(euclides_extes, parelles)
+        lehmer = mesura(euclides_extes_lehmer, parelles)
+        # pow només calcula l'invers: el mesurem amb valors coprimers
+        n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        inversos = [(a, n) for a, _ in parelles if math.gcd(a, n) == 1]
+        python = mesura(lambda a, n: pow(a, -1, n), inversos)
+        print(f"{bits:>6} {recursiu} {iteratiu:10.1f} {lehmer:10.1f} {python:10.1f}")
+
+    print(f"\nInvertir {N_LOT} valors mòdul 2^p - 1 (ms)")
+    print(f"{'bits':>6} {'un per un':>10} {'lot':>10} {'pow':>10}")
+    for bits in PRIMERS_LOT:
+        n = (1 << bits) - 1
+        valors = [random.randrange(1, n) for _ in range(N_LOT)]
+        inici = time.perf_counter()
+        individuals = [invers_modular(v, n) for v in valors]
+        un_per_un = time.perf_counter() - inici
+        inici = time.perf_counter()
+        lot = invers_modular_lot(valors, n)
+        temps_lot = time.perf_counter() - inici
+        inici = time.perf_counter()
+        python = [pow(v, -1, n) for v in valors]
+        temps_pow = time.perf_counter() - inici
+        assert individuals == lot == python
+        print(f"{bits:>6} {un_per_un * 1e3:10.1f} {temps_lot * 1e3:10.1f} {temps_pow * 1e3:10.1f}")
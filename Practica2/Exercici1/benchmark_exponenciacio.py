@@ -0,0 +1,84 @@
+# Compara les exponenciacions modulars: exponenciacio_binaria, ShorAlgorithm.mod_pow
+# original, finestra lliscant, Montgomery, base fixa i pow() de Python.
+#   1) Exponents aleatoris de la mida del mòdul (64 a 4096 bits).
+#   2) Moltes exponenciacions amb la mateixa base (com a^x a Shor o g^x a Diffie-Hellman).
+# Ús: python benchmark_exponenciacio.py
+
+import random
+import time
+
+from ex1c import BaseFixa, exponenciacio_binaria, exponenciacio_finestra, exponenciacio_montgomery
+
+BITS = [64, 256, 1024, 2048, 4096]
+REPETICIONS = {64: 2000, 256: 500, 1024: 40, 2048: 10, 4096: 3}
+
+def mod_pow_shor(base, exp, mod):
+    # Còpia de l'antic ShorAlgorithm.mod_pow (quadrat i multiplicació de dreta a esquerra)
+    result = 1
+    base = base % mod
+    while exp > 0:
+        if exp % 2 == 1:
+            result = (result * base) % mod
+        exp = exp >> 1
+        base = (base * base) % mod
+    return result
+
+def mesura(funcio, casos):
+    inici = time.perf_counter()
+    for m, e, n in casos:
+        funcio(m, e, n)
+    return (time.perf_counter() - inici) / len(casos) * 1e6
+
+if __name__ == "__main__":
+    random.seed(0)
+    noms = ["binària", "Shor", "finestra", "Montgomery", "pow"]
+    funcions = [exponenciacio_binaria, mod_pow_shor, exponenciacio_finestra, exponenciacio_montgomery, pow]
+    print("Exponent aleatori de la mida del mòdul (µs per crida)")
+    print(f"{'bits':>6} " + " ".join(f"{nom:>11}" for nom in noms))
+    for bits in BITS:
+        n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        casos = [(random.randrange(n), random.getrandbits(bits), n) for _ in range(REPETICIONS[bits])]
+        for m, e, n in casos[:3]:
+            assert all(f(m, e, n) == pow(m, e, n) for f in funcions)
+        print(f"{bits:>6} " + " ".join(f"{mesura(f, casos):11.1f}" for f in funcions))
+
+    print("\nMateixa base, 2000 exponents aleatoris (ms en total, incloent-hi la taula)")
+    print(f"{'bits':>6} {'binària':>11} {'finestra':>11} {'base fixa':>11} {'pow':>11}")
+    for bits in [64, 256, 1024, 2048]:
+        n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        g = random.randrange(2, n)
+        exponents = [random.getrandbits(bits) for _ in range(2000)]
+        temps = []
+        for funcio in (lambda e: exponenciacio_binaria(g, e, n), lambda e: exponenciacio_finestra(g, e, n)):
+            inici = time.perf_counter()
+            for e in exponents:
+                funcio(e)
+            temps.append(time.perf_counter() - inici)
+        inici = time.perf_counter()
+        taula = BaseFixa(g, n)
+        resultats = [taula.pow(e) for e in exponents]
+        temps.append(time.perf_counter() - inici)
+        inici = time.perf_counter()
+        esperats = [pow(g, e, n) for e in exponents]
+        temps.append(time.perf_counter() - inici)
+        assert resultats == esperats
+        print(f"{bits:>6} " + " ".join(f"{t * 1e3:11.1f}" for t in temps))
+
+    # Cas de Shor: a^x per a tots els x del registre
+    n, a = 1_000_003 * 1009, 7
+    exponents = range(1 << 16)
+    print(f"\nShor: {a}^x mod {n} per a x < 2^16 (ms)")
+    inici = time.perf_counter()
+    for x in exponents:
+        mod_pow_shor(a, x, n)
+    antic = time.perf_counter() - inici
+    inici = time.perf_counter()
+    taula = BaseFixa(a, n)
+    for x in exponents:
+        taula.pow(x)
+    nou = time.perf_counter() - inici
+    inici = time.perf_counter()
+    for x in exponents:
+        pow(a, x, n)
+    python = time.perf_counter() - inici
+    print(f"mod_pow antic {antic * 1e3:.1f}   base fixa {nou * 1e3:.1f}   pow {python * 1e3:.1f}")
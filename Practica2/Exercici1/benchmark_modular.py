@@ -0,0 +1,61 @@
+# Micro-benchmarks de ModContext:
+#   1) mul, sqr i pow amb les estratègies nativa (%), Barrett i Montgomery,
+#      per a mòduls de 64 a 4096 bits;
+#   2) versions vectoritzades (n < 2^31) contra un bucle de Python.
+# Ús: python benchmark_modular.py
+
+import random
+import time
+
+import numpy as np
+
+from modular import ESTRATEGIES, ModContext
+
+BITS = [64, 256, 1024, 2048, 4096]
+OPERACIONS = 20000
+POTENCIES = {64: 2000, 256: 500, 1024: 40, 2048: 10, 4096: 3}
+ELEMENTS = 200_000
+
+def mesura(funcio, arguments):
+    inici = time.perf_counter()
+    for args in arguments:
+        funcio(*args)
+    return (time.perf_counter() - inici) / len(arguments) * 1e6
+
+if __name__ == "__main__":
+    random.seed(0)
+    print("Escalar (µs per operació)")
+    print(f"{'bits':>6} {'operació':>9} " + " ".join(f"{e:>11}" for e in ESTRATEGIES))
+    for bits in BITS:
+        n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        contextos = [ModContext(n, e) for e in ESTRATEGIES]
+        parelles = [(random.randrange(n), random.randrange(n)) for _ in range(OPERACIONS)]
+        quadrats = [(a,) for a, _ in parelles]
+        potencies = [(random.randrange(n), random.getrandbits(bits)) for _ in range(POTENCIES[bits])]
+        for nom, arguments in (("mul", parelles), ("sqr", quadrats), ("pow", potencies)):
+            temps = [mesura(getattr(c, nom), arguments) for c in contextos]
+            print(f"{bits:>6} {nom:>9} " + " ".join(f"{t:11.2f}" for t in temps))
+
+    print(f"\nVectoritzat, n = 2^31 - 1, {ELEMENTS} elements (ms)")
+    print(f"{'operació':>9} {'bucle':>10} {'NumPy':>10}")
+    context = ModContext((1 << 31) - 1)
+    n = context.n
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, n, ELEMENTS)
+    b = rng.integers(0, n, ELEMENTS)
+    e = rng.integers(0, 1 << 31, ELEMENTS)
+    a_llista, b_llista, e_llista = a.tolist(), b.tolist(), e.tolist()
+    casos = [
+        ("mul", lambda: [x * y % n for x, y in zip(a_llista, b_llista)], lambda: context.mul_vec(a, b)),
+        ("pow", lambda: [pow(x, y, n) for x, y in zip(a_llista, e_llista)], lambda: context.pow_vec(a, e)),
+        ("inverse", lambda: [pow(x, -1, n) if x else 0 for x in a_llista], lambda: context.inverse_vec(a)),
+    ]
+    for nom, bucle, vectorial in casos:
+        inici = time.perf_counter()
+        esperat = bucle()
+        temps_bucle = time.perf_counter() - inici
+        inici = time.perf_counter()
+        obtingut = vectorial()
+        temps_vectorial = time.perf_counter() - inici
+        assert obtingut.tolist() == esperat
+        print(f"{nom:>9} {temps_bucle * 1e3:10.1f} {temps_vectorial * 1e3:10.1f}")
@@ -3,8 +3,9 @@ def maxim_comu_divisor(a, b):
         a, b = b, a % b
     return a
 
-a = int(input("Introdueix un numero: "))
-b = int(input("Introdueix un altre numero: "))
+if __name__ == "__main__":
+    a = int(input("Introdueix un numero: "))
+    b = int(input("Introdueix un altre numero: "))
 
-mcd = maxim_comu_divisor(a,b)
-print(f"Mcd: {mcd}")
\ No newline at end of file
+    mcd = maxim_comu_divisor(a,b)
+    print(f"Mcd: {mcd}")
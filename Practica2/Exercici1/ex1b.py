@@ -1,19 +1,91 @@
-def euclides_extes(a, b):
+LLINDAR_LEHMER = 3072  # bits a partir dels quals Lehmer és més ràpid (benchmark_euclides.py)
+
+def euclides_extes_recursiu(a, b):
+    # Versió original: per a operands de 4096 bits o més supera el límit de recursió
     if b == 0:
         return a, 1, 0
     else:
-        d, x1, y1 = euclides_extes(b, a % b)
+        d, x1, y1 = euclides_extes_recursiu(b, a % b)
         x = y1
         y = x1 - (a // b) * y1
         return d, x, y
 
+def euclides_extes(a, b):
+    # Versió iterativa: mateixos resultats que la recursiva, sense límit de profunditat
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b != 0:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+def euclides_extes_lehmer(a, b):
+    # Algorisme de Lehmer: simula molts passos d'Euclides amb els 64 bits alts
+    # de a i b (enters petits) i només aplica la matriu acumulada als nombres
+    # grans de tant en tant. Retorna (d, x, y) amb a·x + b·y = d, però x i y
+    # poden ser diferents dels d'euclides_extes.
+    if a < b:
+        d, y, x = euclides_extes_lehmer(b, a)
+        return d, x, y
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b >> 64:
+        desplacament = a.bit_length() - 64
+        ah, bh = a >> desplacament, b >> desplacament
+        A, B, C, D = 1, 0, 0, 1
+        while bh + C != 0 and bh + D != 0:
+            q = (ah + A) // (bh + C)
+            if q != (ah + B) // (bh + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            ah, bh = bh, ah - q * bh
+        if B == 0:
+            # Els bits alts no han permès avançar: un pas normal d'Euclides
+            q, r = divmod(a, b)
+            a, b = b, r
+            x0, x1 = x1, x0 - q * x1
+            y0, y1 = y1, y0 - q * y1
+        else:
+            a, b = A * a + B * b, C * a + D * b
+            x0, x1 = A * x0 + B * x1, C * x0 + D * x1
+            y0, y1 = A * y0 + B * y1, C * y0 + D * y1
+    d, x, y = euclides_extes(a, b)
+    return d, x * x0 + y * x1, x * y0 + y * y1
+
 def invers_modular(d, n):
     d = d % n  # Ens assegurem que d està dins del mòdul
-    gcd, x, _ = euclides_extes(d, n)
+    if n.bit_length() >= LLINDAR_LEHMER:
+        gcd, x, _ = euclides_extes_lehmer(d, n)
+    else:
+        gcd, x, _ = euclides_extes(d, n)
     if gcd != 1:
         return None  # No hi ha invers si no són coprimers
     return x % n  # L'invers ha de ser dins de Z_n
 
+def invers_modular_lot(valors, n):
+    # Truc de Montgomery: inverteix molts valors mòdul n amb una sola inversió.
+    # prefix[i] és el producte dels i primers valors; s'inverteix el producte
+    # total i es recorre la llista cap enrere recuperant cada invers amb dues
+    # multiplicacions. Els valors sense invers (no coprimers amb n) donen None.
+    valors = [v % n for v in valors]
+    prefix = [1]
+    for v in valors:
+        prefix.append(prefix[-1] * v % n)
+    invers_total = invers_modular(prefix[-1], n)
+    if invers_total is None:
+        # Algun valor no és invertible: el separem i repetim amb la resta
+        invertibles = [i for i, v in enumerate(valors) if euclides_extes(n, v)[0] == 1]
+        resultat = [None] * len(valors)
+        for i, inv in zip(invertibles, invers_modular_lot([valors[i] for i in invertibles], n)):
+            resultat[i] = inv
+        return resultat
+    resultat = [0] * len(valors)
+    for i in range(len(valors) - 1, -1, -1):
+        resultat[i] = invers_total * prefix[i] % n
+        invers_total = invers_total * valors[i] % n
+    return resultat
+
 def son_coprimers_i_invers(d, n):
     invers = invers_modular(d, n)
     if invers is None:
@@ -1,3 +1,10 @@
+from functools import lru_cache
+
+try:
+    from .modular import context, escala_montgomery, finestra_fixa, finestra_lliscant, mida_finestra
+except ImportError:  # Executat des de la carpeta, fora del paquet criptografia
+    from modular import context, escala_montgomery, finestra_fixa, finestra_lliscant, mida_finestra
+
 def exponenciacio_binaria(m, e, n):
     resultat = 1
     m = m % n  # Ens assegurem que m < n per evitar nombres grans innecessaris
@@ -7,12 +14,133 @@ def exponenciacio_binaria(m, e, n):
             resultat = (resultat * m) % n
         m = (m * m) % n        # Quadrat del base
         e = e // 2             # Anem al següent bit (divisió per 2)
-    
+
     return resultat
 
+# ---------- Finestra lliscant ----------
+
+def exponenciacio_finestra(m, e, n, k=None):
+    if e == 0:
+        return 1 % n
+    k = k or mida_finestra(e.bit_length())
+    return finestra_lliscant(m % n, e, k, lambda a, b: a * b % n)
+
+# ---------- Montgomery ----------
+
+def montgomery(n):
+    # Constants de Montgomery del mòdul, compartides amb el seu ModContext
+    mont = context(n).montgomery
+    if mont is None:
+        raise ValueError("Montgomery necessita un mòdul senar")
+    return mont
+
+def exponenciacio_montgomery(m, e, n, k=None):
+    return montgomery(n).pow(m, e, k)
+
+# ---------- Calendari constant ----------
+# Per a exponents privats: el nombre i l'ordre dels productes depenen només
+# de la mida del mòdul (bits), no dels bits de l'exponent. L'1 es representa
+# com n + 1: CPython multiplica més de pressa per 1 que per un residu de la
+# mida de n, i sense això els dígits 0 de la finestra fixa es notarien.
+
+def _bits_constants(e, n, bits):
+    return max(bits or n.bit_length(), e.bit_length())
+
+def exponenciacio_escala(m, e, n, bits=None):
+    return escala_montgomery(m % n, e, _bits_constants(e, n, bits), lambda a, b: a * b % n, n + 1) % n
+
+def exponenciacio_finestra_fixa(m, e, n, bits=None, k=4):
+    return finestra_fixa(m % n, e, _bits_constants(e, n, bits), k, lambda a, b: a * b % n, n + 1) % n
+
+# ---------- Base fixa ----------
+
+class BaseFixa:
+    # Potències precalculades d'una base g: taula[i][j] = g^(j·2^(k·i)) mod n.
+    # Un exponent es parteix en dígits de k bits i g^e és el producte de
+    # taula[i][dígit i]: cap quadrat i com a molt bits/k multiplicacions.
+    # La taula creix a mesura que arriben exponents més grans.
+
+    def __init__(self, g, n, k=4):
+        self.g = g % n
+        self.n = n
+        self.k = k
+        self.taula = []
+        self._seguent = self.g  # g^(2^(k·len(taula)))
+
+    def _amplia(self, digits):
+        n = self.n
+        while len(self.taula) < digits:
+            fila = [1 % n, self._seguent]
+            for _ in range((1 << self.k) - 2):
+                fila.append(fila[-1] * self._seguent % n)
+            self.taula.append(fila)
+            self._seguent = fila[-1] * self._seguent % n
+
+    def pow(self, e):
+        if e < 0:
+            raise ValueError("l'exponent ha de ser no negatiu")
+        self._amplia(-(-e.bit_length() // self.k))
+        n, k, mascara = self.n, self.k, (1 << self.k) - 1
+        resultat = 1 % n
+        for fila in self.taula:
+            if not e:
+                break
+            digit = e & mascara
+            if digit:
+                resultat = resultat * fila[digit] % n
+            e >>= k
+        return resultat
+
+@lru_cache(maxsize=64)
+def base_fixa(g, n):
+    # Taula de la base g mòdul n, compartida per totes les crides amb la mateixa base
+    return BaseFixa(g, n)
+
+# ---------- Punt d'entrada comú ----------
+
+METODES = ("binari", "finestra", "montgomery", "barrett", "base_fixa", "pow", "escala", "finestra_fixa")
+CALENDARI_CONSTANT = ("escala", "finestra_fixa")
+
+def potencia_modular(m, e, n, metode="finestra"):
+    # m^e mod n amb el mètode triat:
+    #   binari     -> exponenciacio_binaria (quadrat i multiplicació bit a bit)
+    #   finestra   -> finestra lliscant de k bits
+    #   montgomery -> finestra lliscant amb productes de Montgomery (n senar)
+    #   barrett    -> finestra lliscant amb reducció de Barrett
+    #   base_fixa  -> taula de potències de m en memòria cau (moltes crides amb la mateixa base)
+    #   pow        -> pow() de Python
+    #   escala        -> escala de Montgomery, calendari constant (exponents privats)
+    #   finestra_fixa -> finestra fixa de 4 bits, calendari constant (exponents privats)
+    if n <= 0:
+        raise ValueError("el mòdul ha de ser positiu")
+    if e < 0:
+        raise ValueError("l'exponent ha de ser no negatiu")
+    if metode not in METODES:
+        raise ValueError(f"mètode desconegut: {metode}")
+    if n == 1:
+        return 0  # Com pow(m, e, 1); ModContext (barrett, montgomery) necessita n >= 2
+    if metode == "binari":
+        return exponenciacio_binaria(m, e, n) % n
+    if metode == "finestra":
+        return exponenciacio_finestra(m, e, n)
+    if metode == "montgomery":
+        if n % 2 == 0:
+            return exponenciacio_finestra(m, e, n)
+        return exponenciacio_montgomery(m, e, n)
+    if metode == "barrett":
+        return context(n).barrett.pow(m, e)
+    if metode == "base_fixa":
+        return base_fixa(m % n, n).pow(e)
+    if metode == "pow":
+        return pow(m, e, n)
+    if metode == "escala":
+        return exponenciacio_escala(m, e, n)
+    if metode == "finestra_fixa":
+        return exponenciacio_finestra_fixa(m, e, n)
+
 # m = int(input("Introdueix el valor de m: "))
 # e = int(input("Introdueix el valor de e: "))
 # n = int(input("Introdueix el valor de n: "))
 
 # res = exponenciacio_binaria(m, e, n)
-# print(f"{m}^{e} mod {n} = {res}")
\ No newline at end of file
+# print(f"{m}^{e} mod {n} = {res}")
@@ -0,0 +1,265 @@
+# Aritmètica modular compartida per tot el codi de teoria de nombres.
+# ModContext(n) calcula una sola vegada les constants de Montgomery i de
+# Barrett d'un mòdul i ofereix mul, sqr, pow i inverse amb l'estratègia
+# triada, a més de versions vectoritzades sobre arrays de NumPy per a
+# mòduls menors que 2^31 (els productes de dos residus caben en uint64).
+# NumPy només s'importa quan es fa servir una funció vectoritzada.
+
+from functools import lru_cache
+
+try:
+    from .ex1b import invers_modular
+except ImportError:  # Executat des de la carpeta, fora del paquet criptografia
+    from ex1b import invers_modular
+
+ESTRATEGIES = ("nativa", "barrett", "montgomery")
+LIMIT_VECTORIAL = 1 << 31
+
+# ---------- Finestra lliscant ----------
+
+def mida_finestra(bits):
+    # Mida de finestra que minimitza quadrats + multiplicacions per a un exponent de 'bits' bits
+    for k, limit in ((1, 24), (2, 80), (3, 240), (4, 672), (5, 1792)):
+        if bits <= limit:
+            return k
+    return 6
+
+def finestra_lliscant(base, e, k, mul):
+    # Recorre e d'esquerra a dreta agafant finestres de fins a k bits que
+    # acaben en 1: cada finestra costa una sola multiplicació per base^senar.
+    # mul(a, b) és el producte modular (normal, Barrett o Montgomery).
+    quadrat = mul(base, base)
+    senars = [base]  # senars[i] = base^(2i+1)
+    for _ in range((1 << (k - 1)) - 1):
+        senars.append(mul(senars[-1], quadrat))
+
+    resultat = None
+    i = e.bit_length() - 1
+    while i >= 0:
+        if not (e >> i) & 1:
+            resultat = mul(resultat, resultat)
+            i -= 1
+            continue
+        j = max(i - k + 1, 0)
+        while not (e >> j) & 1:
+            j += 1
+        valor = (e >> j) & ((1 << (i - j + 1)) - 1)
+        if resultat is None:
+            resultat = senars[valor >> 1]  # Primera finestra: no cal elevar res al quadrat
+        else:
+            for _ in range(i - j + 1):
+                resultat = mul(resultat, resultat)
+            resultat = mul(resultat, senars[valor >> 1])
+        i = j - 1
+    return resultat
+
+# ---------- Calendari constant ----------
+# Les dues funcions següents fan sempre la mateixa seqüència de productes
+# per a qualsevol exponent de com a molt 'bits' bits: el temps no depèn del
+# pes de Hamming ni de la posició dels uns. (Els enters de Python no són de
+# temps constant per si mateixos; això elimina la fuga de l'algorisme.)
+
+def escala_montgomery(base, e, bits, mul, u=1):
+    # Escala de Montgomery: manté r0 = base^k i r1 = base^(k+1) i per a cada
+    # bit fa exactament un producte i un quadrat. u és l'1 de l'aritmètica.
+    r = [u, base]
+    for i in range(bits - 1, -1, -1):
+        bit = (e >> i) & 1
+        r[1 - bit] = mul(r[0], r[1])
+        r[bit] = mul(r[bit], r[bit])
+    return r[0]
+
+def finestra_fixa(base, e, bits, k, mul, u=1):
+    # Finestra fixa de k bits: per a cada dígit, k quadrats i un producte per
+    # taula[dígit], també quan el dígit és 0 (taula[0] = 1).
+    taula = [u, base]
+    for _ in range((1 << k) - 2):
+        taula.append(mul(taula[-1], base))
+    mascara = (1 << k) - 1
+    resultat = u
+    for i in range(-(-bits // k) - 1, -1, -1):
+        for _ in range(k):
+            resultat = mul(resultat, resultat)
+        resultat = mul(resultat, taula[(e >> (i * k)) & mascara])
+    return resultat
+
+# ---------- Montgomery ----------
+
+class Montgomery:
+    # Aritmètica en forma de Montgomery: x es representa com x·R mod n amb
+    # R = 2^k > n, i la reducció de a·b només fa desplaçaments i màscares en
+    # lloc d'una divisió per n. Només serveix per a mòduls senars.
+
+    def __init__(self, n):
+        if n % 2 == 0:
+            raise ValueError("Montgomery necessita un mòdul senar")
+        self.n = n
+        self.k = n.bit_length()
+        self.mascara = (1 << self.k) - 1
+        self.n_prima = -invers_modular(n, 1 << self.k) & self.mascara  # -n^-1 mod R
+        self.u = (1 << self.k) % n  # L'1 en forma de Montgomery
+        self.r2 = (1 << (2 * self.k)) % n  # R² mod n, per entrar a la forma de Montgomery amb un producte
+
+    def a_montgomery(self, x):
+        return (x << self.k) % self.n
+
+    def de_montgomery(self, x):
+        return self.redueix(x)
+
+    def redueix(self, t):
+        # t·R^-1 mod n per a 0 <= t < n·R
+        m = ((t & self.mascara) * self.n_prima) & self.mascara
+        t = (t + m * self.n) >> self.k
+        return t - self.n if t >= self.n else t
+
+    def mul(self, a, b):
+        return self.redueix(a * b)
+
+    def pow(self, m, e, k=None):
+        if e == 0:
+            return 1 % self.n
+        k = k or mida_finestra(e.bit_length())
+        return self.de_montgomery(finestra_lliscant(self.a_montgomery(m % self.n), e, k, self.mul))
+
+# ---------- Barrett ----------
+
+class Barrett:
+    # Reducció de Barrett: amb mu = floor(4^k / n) calculat una vegada, el
+    # quocient de x / n s'aproxima amb dues multiplicacions i desplaçaments.
+    # Serveix per a qualsevol mòdul (també parell) i per a 0 <= x < n².
+
+    def __init__(self, n):
+        self.n = n
+        self.k = n.bit_length()
+        self.mu = (1 << (2 * self.k)) // n
+
+    def redueix(self, x):
+        q = ((x >> (self.k - 1)) * self.mu) >> (self.k + 1)
+        r = x - q * self.n
+        while r >= self.n:  # L'aproximació es queda curta com a molt en 2
+            r -= self.n
+        return r
+
+    def mul(self, a, b):
+        return self.redueix(a * b)
+
+    def pow(self, m, e, k=None):
+        if e == 0:
+            return 1 % self.n
+        k = k or mida_finestra(e.bit_length())
+        return finestra_lliscant(m % self.n, e, k, self.mul)
+
+# ---------- Context ----------
+
+class ModContext:
+    # Operacions mòdul n amb les constants precalculades. L'estratègia decideix
+    # com es redueixen els productes:
+    #   nativa     -> operador % i pow() de Python (el més ràpid en CPython)
+    #   barrett    -> reducció de Barrett
+    #   montgomery -> reducció de Montgomery (n senar; si és parell es fa servir Barrett)
+
+    def __init__(self, n, estrategia="nativa"):
+        if n < 2:
+            raise ValueError("el mòdul ha de ser almenys 2")
+        if estrategia not in ESTRATEGIES:
+            raise ValueError(f"estratègia desconeguda: {estrategia}")
+        self.n = n
+        self.estrategia = estrategia
+        self.barrett = Barrett(n)
+        self.montgomery = Montgomery(n) if n % 2 else None
+        if estrategia == "montgomery" and self.montgomery is None:
+            self.estrategia = "barrett"
+
+    def redueix(self, x):
+        # x mod n per a 0 <= x < n². En mode montgomery mul i sqr reben i
+        # retornen residus normals, i per això cada crida fa dues reduccions
+        # (la primera dona x·R^-1 i la segona, per R², torna a x): hi són només
+        # perquè les tres estratègies tinguin la mateixa interfície. Per a
+        # cadenes de productes cal pow, que entra a la forma de Montgomery una
+        # sola vegada i hi fa tota la finestra lliscant (Montgomery.pow).
+        if self.estrategia == "barrett":
+            return self.barrett.redueix(x)
+        if self.estrategia == "montgomery":
+            mont = self.montgomery
+            return mont.redueix(mont.redueix(x) * mont.r2)
+        return x % self.n
+
+    def mul(self, a, b):
+        return self.redueix((a % self.n) * (b % self.n))
+
+    def sqr(self, a):
+        a %= self.n
+        return self.redueix(a * a)
+
+    def pow(self, a, e):
+        if e < 0:
+            inv = self.inverse(a)
+            if inv is None:
+                raise ValueError(f"{a} no té invers mòdul {self.n}")
+            a, e = inv, -e
+        if self.estrategia == "barrett":
+            return self.barrett.pow(a, e)
+        if self.estrategia == "montgomery":
+            return self.montgomery.pow(a, e)
+        return pow(a, e, self.n)
+
+    def inverse(self, a):
+        # Invers de a mòdul n, o None si no són coprimers (com invers_modular)
+        return invers_modular(a, self.n)
+
+    # ---------- Versions vectoritzades (n < 2^31) ----------
+
+    def _vectors(self, *valors):
+        import numpy as np
+        if self.n >= LIMIT_VECTORIAL:
+            raise ValueError("les operacions vectoritzades necessiten n < 2^31")
+        return [(np.asarray(v, dtype=np.int64) % self.n).astype(np.uint64) for v in valors]
+
+    def mul_vec(self, a, b):
+        a, b = self._vectors(a, b)
+        return a * b % self.n
+
+    def sqr_vec(self, a):
+        a, = self._vectors(a)
+        return a * a % self.n
+
+    def pow_vec(self, a, e):
+        # a^e elementat; a i e poden ser arrays (de la mateixa mida) o escalars
+        import numpy as np
+        a, = self._vectors(a)
+        e = np.asarray(e, dtype=np.int64)
+        if (e < 0).any():
+            raise ValueError("l'exponent ha de ser no negatiu")
+        forma = np.broadcast_shapes(a.shape, e.shape)
+        base = np.broadcast_to(a, forma).copy()
+        e = np.broadcast_to(e, forma).astype(np.uint64)
+        resultat = np.full(forma, 1 % self.n, dtype=np.uint64)
+        n = np.uint64(self.n)
+        for bit in range(int(e.max(initial=0)).bit_length()):
+            usa = ((e >> np.uint64(bit)) & np.uint64(1)).astype(bool)
+            resultat[usa] = resultat[usa] * base[usa] % n
+            base = base * base % n
+        return resultat
+
+    def inverse_vec(self, a):
+        # Euclides estès sobre tot l'array alhora (com euclides_extes, amb
+        # màscares per als elements que ja han acabat); els valors sense
+        # invers queden a 0
+        import numpy as np
+        a, = self._vectors(a)
+        r0, r1 = a.astype(np.int64), np.full(a.shape, self.n, dtype=np.int64)
+        s0, s1 = np.ones(a.shape, dtype=np.int64), np.zeros(a.shape, dtype=np.int64)
+        while r1.any():
+            actius = r1 != 0
+            q = r0 // np.where(actius, r1, 1)
+            r0, r1 = np.where(actius, r1, r0), np.where(actius, r0 - q * r1, 0)
+            s0, s1 = np.where(actius, s1, s0), np.where(actius, s0 - q * s1, s1)
+        return np.where(r0 == 1, s0 % self.n, 0).astype(np.uint64)
+
+    def __repr__(self):
+        return f"ModContext({self.n.bit_length()} bits, {self.estrategia})"
+
+@lru_cache(maxsize=256)
+def context(n, estrategia="nativa"):
+    # Context compartit per mòdul: les constants es calculen una sola vegada per procés
+    return ModContext(n, estrategia)
@@ -0,0 +1,52 @@
+# Generació de primers i claus RSA.
+#   1) Cerca del primer següent a partir dels mateixos punts aleatoris amb
+#      seguent_primer (garbell incremental: els residus mod p es calculen una
+#      vegada i es reaprofiten) i amb una cerca ingènua que divideix cada
+#      candidat per tots els primers petits des de zero. Com que totes dues
+#      troben el mateix primer, la diferència només és el cost de la cerca.
+#   2) Claus per segon amb genera_clau i amb genera_claus en paral·lel.
+# Ús: python benchmark_primers.py
+
+import os
+import secrets
+import time
+
+from primers import PRIMERS_PETITS, es_primer, genera_clau, genera_claus, seguent_primer
+
+BITS = [512, 1024, 2048]
+PUNTS = {512: 40, 1024: 20, 2048: 6}
+CLAUS = {1024: 20, 2048: 6, 4096: 2}
+
+def seguent_primer_ingenu(candidat, e=65537):
+    candidat |= 1
+    while True:
+        if (candidat - 1) % e and all(candidat % p for p in PRIMERS_PETITS) and es_primer(candidat):
+            return candidat
+        candidat += 2
+
+def claus_per_segon(funcio, quantes):
+    inici = time.perf_counter()
+    funcio(quantes)
+    return quantes / (time.perf_counter() - inici)
+
+if __name__ == "__main__":
+    print("Cerca del primer següent (ms per primer, mateixos punts d'inici)")
+    print(f"{'bits':>6} {'ingènua':>10} {'garbell':>10}")
+    for bits in BITS:
+        inicis = [secrets.randbits(bits) | (3 << (bits - 2)) | 1 for _ in range(PUNTS[bits])]
+        temps = []
+        resultats = []
+        for funcio in (seguent_primer_ingenu, seguent_primer):
+            inici = time.perf_counter()
+            resultats.append([funcio(x) for x in inicis])
+            temps.append((time.perf_counter() - inici) / len(inicis) * 1e3)
+        assert resultats[0] == resultats[1]
+        print(f"{bits:>6} {temps[0]:10.1f} {temps[1]:10.1f}")
+
+    processos = os.cpu_count() or 1
+    print("\nClaus RSA per segon")
+    print(f"{'bits':>6} {'1 procés':>10} {f'{processos} processos':>13}")
+    for bits, quantes in CLAUS.items():
+        seqüencial = claus_per_segon(lambda k: [genera_clau(bits) for _ in range(k)], quantes)
+        paral = claus_per_segon(lambda k: genera_claus(k, bits, processos=processos), quantes)
+        print(f"{bits:>6} {seqüencial:10.3f} {paral:13.3f}")
@@ -0,0 +1,37 @@
+# Operacions per segon de ClauRSA a 1024, 2048 i 4096 bits: desxifrar amb
+# c^d mod n, amb el TXR de 2 primers i amb claus de 3 primers, i xifrar amb
+# e = 65537 (operació pública, com a referència).
+# Ús: python benchmark_rsa.py
+
+import random
+import time
+
+from primers import genera_clau
+
+BITS = [1024, 2048, 4096]
+SEGONS = 2.0
+
+def ops_per_segon(funcio, valors):
+    # Repeteix l'operació durant SEGONS segons i retorna operacions per segon
+    fetes, inici = 0, time.perf_counter()
+    while time.perf_counter() - inici < SEGONS:
+        funcio(valors[fetes % len(valors)])
+        fetes += 1
+    return fetes / (time.perf_counter() - inici)
+
+if __name__ == "__main__":
+    random.seed(0)
+    print(f"{'bits':>6} {'sense TXR':>10} {'TXR 2p':>10} {'TXR 3p':>10} {'acceleració':>12} {'xifrar':>10}  (ops/s)")
+    for bits in BITS:
+        clau = genera_clau(bits)
+        clau3 = genera_clau(bits, n_primers=3)
+        missatges = [random.randrange(clau.n) for _ in range(16)]
+        xifrats = [clau.xifra(m) for m in missatges]
+        xifrats3 = [clau3.xifra(m % clau3.n) for m in missatges]
+        assert [clau.desxifra(c) for c in xifrats] == [clau.desxifra_sense_crt(c) for c in xifrats] == missatges
+        assert [clau3.desxifra(c) for c in xifrats3] == [m % clau3.n for m in missatges]
+        sense_crt = ops_per_segon(clau.desxifra_sense_crt, xifrats)
+        crt = ops_per_segon(clau.desxifra, xifrats)
+        crt3 = ops_per_segon(clau3.desxifra, xifrats3)
+        publica = ops_per_segon(clau.xifra, missatges)
+        print(f"{bits:>6} {sense_crt:10.1f} {crt:10.1f} {crt3:10.1f} {crt / sense_crt:11.1f}x {publica:10.0f}")
@@ -0,0 +1,73 @@
+# Fuga de temps de l'exponent privat i cost d'evitar-la.
+# Per a cada mètode de potencia_modular es fan milers de desxifrats c^d mod n
+# amb tres classes d'exponent de la mateixa mida i pes de Hamming diferent
+# (pocs uns, la meitat, tots uns), intercalant les classes a l'atzar perquè
+# la deriva de la màquina les afecti igual. Per classe es mostren la mediana
+# i els percentils 10/90 del temps, i per mètode:
+#   fuga -> diferència relativa de medianes entre "tots uns" i "pocs uns"
+#   t    -> t de Welch entre aquestes dues classes (|t| > 4.5 indica fuga)
+#   cost -> mediana de la classe "meitat" respecte a pow()
+#
+# Ús: python benchmark_temps_constant.py [mostres] [bits]
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Exercici1'))
+
+from ex1c import potencia_modular
+from primers import genera_clau
+
+METODES = ["binari", "finestra", "pow", "escala", "finestra_fixa"]
+
+def exponents(bits):
+    # Exponents senars de 'bits' bits amb pes de Hamming baix, mitjà i màxim
+    def amb_pes(pes):
+        posicions = random.sample(range(1, bits - 1), pes - 2)
+        return sum(1 << i for i in posicions) | (1 << (bits - 1)) | 1
+    return {"pocs uns": amb_pes(8), "meitat": amb_pes(bits // 2), "tots uns": (1 << bits) - 1}
+
+def mesura(metode, classes, n, mostres):
+    temps = {nom: [] for nom in classes}
+    ordre = [nom for nom in classes for _ in range(mostres)]
+    random.shuffle(ordre)
+    for nom in ordre:
+        c = random.randrange(2, n)
+        d = classes[nom]
+        inici = time.perf_counter_ns()
+        potencia_modular(c, d, n, metode)
+        temps[nom].append(time.perf_counter_ns() - inici)
+    return temps
+
+def welch(a, b):
+    return (statistics.fmean(a) - statistics.fmean(b)) / (
+        statistics.variance(a) / len(a) + statistics.variance(b) / len(b)) ** 0.5
+
+def percentil(valors, p):
+    return sorted(valors)[min(int(p / 100 * len(valors)), len(valors) - 1)]
+
+if __name__ == "__main__":
+    mostres = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    bits = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    random.seed(0)
+    n = genera_clau(bits).n
+    classes = exponents(bits - 1)
+    for nom, d in classes.items():
+        for metode in METODES:
+            assert potencia_modular(3, d, n, metode) == pow(3, d, n)
+
+    print(f"n de {bits} bits, exponents de {bits - 1} bits, {mostres} mostres per classe (µs: mediana [p10, p90])")
+    print(f"{'mètode':>14} " + " ".join(f"{nom:>24}" for nom in classes) + f" {'fuga':>7} {'t':>8} {'cost':>6}")
+    referencia = None
+    for metode in ["pow"] + [m for m in METODES if m != "pow"]:
+        temps = mesura(metode, classes, n, mostres)
+        medianes = {nom: statistics.median(t) for nom, t in temps.items()}
+        referencia = referencia or medianes["meitat"]
+        columnes = " ".join(f"{medianes[nom] / 1000:8.1f} [{percentil(t, 10) / 1000:6.1f}, {percentil(t, 90) / 1000:6.1f}]"
+                            for nom, t in temps.items())
+        fuga = medianes["tots uns"] / medianes["pocs uns"] - 1
+        t = welch(temps["tots uns"], temps["pocs uns"])
+        print(f"{metode:>14} {columnes} {fuga:+6.0%} {t:8.1f} {medianes['meitat'] / referencia:5.1f}x")
@@ -0,0 +1,53 @@
+# Rendiment de xifra_flux / desxifra_flux amb una clau de 2048 bits, amb un
+# procés i amb tots els processadors, i memòria màxima (tracemalloc) en
+# xifrar entrades de mides diferents: ha de ser la mateixa per a totes.
+# Ús: python benchmark_xifratge.py
+
+import io
+import os
+import time
+import tracemalloc
+
+from primers import genera_clau
+from xifratge_fitxers import desxifra_flux, xifra_flux
+
+MIDA_XIFRAR = 1 << 20
+MIDA_DESXIFRAR = 1 << 17
+MIDES_MEMORIA = [1 << 18, 1 << 20, 1 << 22]
+
+class Descarta(io.RawIOBase):
+    # Destí que només compta bytes, per mesurar memòria sense guardar la sortida
+    def writable(self):
+        return True
+
+    def write(self, dades):
+        return len(dades)
+
+def mesura(funcio, dades, clau, processos):
+    sortida = io.BytesIO()
+    inici = time.perf_counter()
+    funcio(io.BytesIO(dades), sortida, clau, processos)
+    return time.perf_counter() - inici, sortida.getvalue()
+
+if __name__ == "__main__":
+    clau = genera_clau(2048)
+    processos = sorted({1, os.cpu_count() or 1})
+    print(f"Clau de {clau.bits} bits")
+    for p in processos:
+        dades = os.urandom(MIDA_XIFRAR)
+        segons, xifrat = mesura(xifra_flux, dades, clau, p)
+        print(f"{p:>2} processos: xifrar {MIDA_XIFRAR / segons / 1e6:.2f} MB/s", end="")
+        dades = os.urandom(MIDA_DESXIFRAR)
+        _, xifrat = mesura(xifra_flux, dades, clau, p)
+        segons, desxifrat = mesura(desxifra_flux, xifrat, clau, p)
+        assert desxifrat == dades
+        print(f", desxifrar {MIDA_DESXIFRAR / segons / 1e3:.1f} KB/s")
+
+    print("\nMemòria màxima en xifrar (un procés)")
+    for mida in MIDES_MEMORIA:
+        origen = io.BytesIO(os.urandom(mida))
+        tracemalloc.start()
+        xifra_flux(origen, Descarta(), clau, 1)
+        _, pic = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{mida >> 10:>6} KB -> pic {pic / 1024:.0f} KB")
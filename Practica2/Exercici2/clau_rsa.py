@@ -0,0 +1,133 @@
+import sys
+import os
+
+try:
+    from .ex1b import invers_modular
+    from .ex1c import potencia_modular
+    from .modular import context
+except ImportError:  # Executat des de la carpeta, fora del paquet criptografia
+    # Afegeix el path absolut de la carpeta 'Exercici1' al path de Python
+    ruta_base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ruta_exercici1 = os.path.join(ruta_base, 'Exercici1')
+    sys.path.append(ruta_exercici1)
+
+    from ex1b import invers_modular
+    from ex1c import potencia_modular
+    from modular import context
+
+
+class ClauRSA:
+    # Clau RSA sense interacció. La part privada es guarda com a PKCS#1:
+    # dP = d mod (p-1), dQ = d mod (q-1) i qInv = q^-1 mod p, de manera que
+    # desxifrar i signar fan dues exponenciacions amb mòduls i exponents de
+    # la meitat de bits (Teorema Xinès del Residu) en lloc d'una sobre n.
+    # Les claus multiprimer afegeixen un triplet (r, d_r, t) per cada primer
+    # extra, amb t = (p·q·...)^-1 mod r, com l'otherPrimeInfos de PKCS#1.
+
+    def __init__(self, n, e, d=None, p=None, q=None, dP=None, dQ=None, qInv=None, altres=(),
+                 metode="pow"):
+        self.n = n
+        self.e = e
+        self.d = d
+        self.p, self.q = p, q
+        self.dP, self.dQ, self.qInv = dP, dQ, qInv
+        self.altres = list(altres)
+        self.metode = metode  # Mètode de potencia_modular per defecte (cada operació privada el pot canviar)
+
+    @classmethod
+    def des_de_primers(cls, primers, e=65537, metode="pow"):
+        # Construeix la clau a partir de 2 o més primers diferents
+        if len(primers) < 2 or len(set(primers)) != len(primers):
+            raise ValueError("calen almenys dos primers diferents")
+        n, phi_n = 1, 1
+        for r in primers:
+            n *= r
+            phi_n *= r - 1
+        d = invers_modular(e, phi_n)
+        if d is None:
+            raise ValueError(f"{e} no és coprimer amb φ(n)")
+        p, q = primers[0], primers[1]
+        qInv = invers_modular(q, p)
+        altres = []
+        producte = p * q
+        for r in primers[2:]:
+            altres.append((r, d % (r - 1), invers_modular(producte % r, r)))
+            producte *= r
+        return cls(n, e, d, p, q, d % (p - 1), d % (q - 1), qInv, altres, metode)
+
+    def precalcula(self):
+        # Completa els paràmetres del TXR que faltin (claus amb només d, p i q)
+        # i prepara els ModContext (constants de Montgomery i Barrett) de n i de cada primer
+        if self.d is not None and self.p and self.q and self.qInv is None:
+            self.dP, self.dQ = self.d % (self.p - 1), self.d % (self.q - 1)
+            self.qInv = invers_modular(self.q, self.p)
+        moduls = [self.n]
+        if self.qInv is not None:
+            moduls += [self.p, self.q] + [r for r, _, _ in self.altres]
+        self.contextos = [context(m) for m in moduls]
+        return self
+
+    @property
+    def es_privada(self):
+        return self.d is not None or self.qInv is not None
+
+    @property
+    def bits(self):
+        return self.n.bit_length()
+
+    def publica(self):
+        return ClauRSA(self.n, self.e, metode=self.metode)
+
+    def _potencia(self, m, e, n, metode=None):
+        return potencia_modular(m, e, n, metode or self.metode)
+
+    def _comprova(self, valor):
+        if not 0 <= valor < self.n:
+            raise ValueError(f"el valor ha d'estar entre 0 i n - 1 ({self.bits} bits)")
+
+    # ---------- Operacions públiques ----------
+
+    def xifra(self, m):
+        self._comprova(m)
+        return self._potencia(m, self.e, self.n)
+
+    def verifica(self, signatura, m):
+        self._comprova(signatura)
+        return self._potencia(signatura, self.e, self.n) == m % self.n
+
+    # ---------- Operacions privades ----------
+    # metode permet triar l'exponenciació d'una crida concreta, per exemple
+    # "escala" o "finestra_fixa" perquè el temps no depengui dels bits de d.
+
+    def desxifra(self, c, metode=None):
+        self._comprova(c)
+        if self.qInv is None:
+            return self.desxifra_sense_crt(c, metode)
+        # m1 = c^dP mod p, m2 = c^dQ mod q i es recombinen amb qInv (Garner)
+        m1 = self._potencia(c % self.p, self.dP, self.p, metode)
+        m2 = self._potencia(c % self.q, self.dQ, self.q, metode)
+        h = (m1 - m2) * self.qInv % self.p
+        m = m2 + self.q * h
+        producte = self.p * self.q
+        for r, d_r, t in self.altres:
+            m_r = self._potencia(c % r, d_r, r, metode)
+            h = (m_r - m) * t % r
+            m += producte * h
+            producte *= r
+        return m
+
+    def desxifra_sense_crt(self, c, metode=None):
+        # Exponenciació directa c^d mod n, com a rsa_interactiu
+        if self.d is None:
+            raise ValueError("la clau no té part privada")
+        self._comprova(c)
+        return self._potencia(c, self.d, self.n, metode)
+
+    def signa(self, m, metode=None):
+        # Signatura de llibre de text: s = m^d mod n, calculada amb el TXR
+        return self.desxifra(m, metode)
+
+    def __repr__(self):
+        tipus = "privada" if self.es_privada else "pública"
+        primers = 2 + len(self.altres) if self.qInv is not None else 0
+        return f"ClauRSA({tipus}, {self.bits} bits, e={self.e}" + (f", {primers} primers)" if primers else ")")
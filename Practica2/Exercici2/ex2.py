@@ -7,7 +7,8 @@ ruta_exercici1 = os.path.join(ruta_base, 'Exercici1')
 sys.path.append(ruta_exercici1)
 
 from ex1b import euclides_extes, invers_modular
-from ex1c import exponenciacio_binaria
+from modular import context
+from clau_rsa import ClauRSA
 
 
 
@@ -17,6 +18,9 @@ def rsa_interactiu():
     # i) Demanem dos nombres primers
     p = int(input("Introdueix un nombre primer p: "))
     q = int(input("Introdueix un altre nombre primer q: "))
+    if p == q:
+        print("Error: p i q han de ser diferents. Torna-ho a provar.")
+        return
     print(f"1) Nombres primers: p = {p}, q = {q}")
 
     # ii) Calculem el mòdul n
@@ -46,12 +50,16 @@ def rsa_interactiu():
 
     # vii) Xifrar un missatge
     m = int(input(f"\nIntrodueix el missatge a xifrar (m < {n}): "))
-    c = exponenciacio_binaria(m, e, n)
+    c = context(n).pow(m, e)
     print(f"7) Missatge xifrat: c = m^e mod n = {m}^{e} mod {n} = {c}")
 
-    # viii) Desxifrar el missatge
-    m_desencriptat = exponenciacio_binaria(c, d, n)
-    print(f"8) Missatge desxifrat: m = c^d mod n = {c}^{d} mod {n} = {m_desencriptat}")
+    # viii) Desxifrar el missatge amb el Teorema Xinès del Residu: dues
+    # exponenciacions mòdul p i q (exponents dP i dQ) en lloc d'una mòdul n
+    clau = ClauRSA.des_de_primers([p, q], e)
+    print(f"8) Clau TXR: dP = d mod (p-1) = {clau.dP}, dQ = d mod (q-1) = {clau.dQ}, qInv = q^-1 mod p = {clau.qInv}")
+    # (amb l'escala de Montgomery: el temps no depèn dels bits de dP i dQ)
+    m_desencriptat = clau.desxifra(c % n, metode="escala")
+    print(f"   Missatge desxifrat: m = c^d mod n = {c}^{d} mod {n} = {m_desencriptat}")
 
     # Verificació
     if m_desencriptat == m:
@@ -60,4 +68,6 @@ def rsa_interactiu():
         print("\nError: el missatge desxifrat no coincideix amb l'original.")
 
 # Cridar la funció principal
-rsa_interactiu()
+if __name__ == "__main__":
+    rsa_interactiu()
+
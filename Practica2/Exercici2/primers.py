@@ -0,0 +1,234 @@
+import multiprocessing
+import os
+import secrets
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from math import gcd, isqrt
+
+try:
+    from .clau_rsa import ClauRSA
+except ImportError:  # Executat des de la carpeta, fora del paquet criptografia
+    from clau_rsa import ClauRSA
+
+LIMIT_GARBELL = 1 << 16
+FINESTRA = 4096  # Candidats senars que es garbellen de cop
+
+def garbell(limit):
+    # Garbell d'Eratòstenes: tots els primers menors que limit
+    es_primer = bytearray([1]) * limit
+    es_primer[0:2] = b"\x00\x00"
+    for p in range(2, isqrt(limit - 1) + 1):
+        if es_primer[p]:
+            es_primer[p * p::p] = bytes(len(range(p * p, limit, p)))
+    return [p for p in range(limit) if es_primer[p]]
+
+PRIMERS_PETITS = garbell(LIMIT_GARBELL)
+# Invers de 2 mòdul cada primer senar: per passar de desplaçament a índex de candidat
+_INVERS_2 = [(p + 1) // 2 for p in PRIMERS_PETITS[1:]]
+
+# ---------- Tests de primalitat ----------
+
+def miller_rabin(n, base):
+    # Una ronda de Miller-Rabin: False si base demostra que n és compost
+    s, d = 0, n - 1
+    while d % 2 == 0:
+        s, d = s + 1, d // 2
+    x = pow(base, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+def jacobi(a, n):
+    # Símbol de Jacobi (a/n) per a n senar positiu
+    a %= n
+    resultat = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                resultat = -resultat
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            resultat = -resultat
+        a %= n
+    return resultat if n == 1 else 0
+
+def lucas_fort(n):
+    # Test de Lucas fort amb els paràmetres de Selfridge (P = 1, Q = (1 - D)/4)
+    if isqrt(n) ** 2 == n:
+        return False
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+    d, s = n + 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+
+    def meitat(x):
+        return ((x + n) if x & 1 else x) // 2 % n
+
+    # U_1, V_1, Q^1 i es recorren els bits de d d'esquerra a dreta
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = meitat(P * U + V), meitat(D * U + P * V)
+            Qk = Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+def es_primer(n, rondes=0):
+    # Baillie-PSW: divisió pels primers petits, Miller-Rabin de base 2 i Lucas
+    # fort. No se'n coneix cap contraexemple; rondes afegeix bases aleatòries.
+    if n < 2:
+        return False
+    for p in PRIMERS_PETITS[:64]:
+        if n % p == 0:
+            return n == p
+    if n < LIMIT_GARBELL:
+        return True
+    if not miller_rabin(n, 2) or not lucas_fort(n):
+        return False
+    return all(miller_rabin(n, secrets.randbelow(n - 3) + 2) for _ in range(rondes))
+
+# ---------- Cerca incremental ----------
+
+def candidats_garbellats(inici, finestra=FINESTRA):
+    # Genera els candidats inici, inici+2, inici+4, ... que no tenen cap factor
+    # primer petit. Els residus inici mod p es calculen una sola vegada: per
+    # a cada finestra, el primer índex divisible per p és -r·2^-1 mod p i
+    # després se'n marquen tots els múltiples amb una assignació de llesca.
+    # En passar a la finestra següent, r s'actualitza sumant 2·finestra.
+    inici |= 1
+    primers = PRIMERS_PETITS[1:]
+    residus = [inici % p for p in primers]
+    pas = 2 * finestra
+    buida = bytes(finestra)
+    while True:
+        lliure = bytearray([1]) * finestra
+        for i, p in enumerate(primers):
+            primer_index = -residus[i] * _INVERS_2[i] % p
+            if primer_index < finestra:
+                lliure[primer_index::p] = buida[:len(range(primer_index, finestra, p))]
+            residus[i] = (residus[i] + pas) % p
+        for j in range(finestra):
+            if lliure[j]:
+                yield inici + 2 * j
+        inici += pas
+
+def primer_aleatori(bits, e=65537, aturada=None):
+    # Primer de bits bits amb els dos bits alts a 1 (p·q té exactament 2·bits
+    # bits) i p - 1 coprimer amb e, cercat de manera incremental a partir
+    # d'un punt aleatori. Si aturada() es fa certa abans d'acabar, retorna None.
+    if bits < 18:
+        raise ValueError("calen almenys 18 bits")
+    while True:
+        inici = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+        primer = seguent_primer(inici, e, aturada, limit=1 << bits)
+        if primer is not None or (aturada and aturada()):
+            return primer
+
+def seguent_primer(inici, e=65537, aturada=None, limit=None):
+    # Primer primer p >= inici amb p - 1 coprimer amb e (None si se supera limit)
+    for candidat in candidats_garbellats(inici):
+        if (aturada and aturada()) or (limit is not None and candidat >= limit):
+            return None
+        if gcd(candidat - 1, e) == 1 and es_primer(candidat):
+            return candidat
+
+def _mides_primers(bits, n_primers):
+    mida = bits // n_primers
+    return [mida] * (n_primers - 1) + [bits - mida * (n_primers - 1)]
+
+def _clau_amb_primers(primers, bits, e):
+    if len(set(primers)) != len(primers):
+        return None
+    clau = ClauRSA.des_de_primers(primers, e)
+    return clau if clau.bits == bits else None
+
+# Senyal compartit pels processos de genera_clau per aturar les cerques pendents
+_atura = None
+
+def _inicialitza_treballador(atura):
+    global _atura
+    _atura = atura
+
+def _cerca_primer(bits, e, limit):
+    return primer_aleatori(bits, e, lambda: _atura.is_set() or (limit is not None and time.monotonic() > limit))
+
+def genera_clau(bits=2048, e=65537, n_primers=2, processos=None, temps_limit=None):
+    # Genera una clau RSA de bits bits. Amb processos > 1 es busquen primers
+    # en paral·lel i es fan servir els primers que acaben primer; la resta de
+    # cerques s'aturen. Si temps_limit (segons) s'esgota, llança TimeoutError.
+    mides = _mides_primers(bits, n_primers)
+    processos = processos or 1
+    if processos == 1 and temps_limit is None:
+        while True:
+            clau = _clau_amb_primers([primer_aleatori(m, e) for m in mides], bits, e)
+            if clau:
+                return clau
+
+    limit = time.monotonic() + temps_limit if temps_limit else None
+    atura = multiprocessing.Event()
+    with ProcessPoolExecutor(max_workers=processos, initializer=_inicialitza_treballador,
+                             initargs=(atura,)) as executor:
+        pendents = {}
+        trobats = {mida: [] for mida in mides}
+        try:
+            # Sempre hi ha tantes cerques en marxa com processos, repartides entre les mides
+            for i in range(max(processos, n_primers)):
+                mida = mides[i % n_primers]
+                pendents[executor.submit(_cerca_primer, mida, e, limit)] = mida
+            while True:
+                fets, _ = wait(pendents, return_when=FIRST_COMPLETED)
+                for futur in fets:
+                    mida = pendents.pop(futur)
+                    primer = futur.result()
+                    if primer is None:
+                        raise TimeoutError(f"no s'ha generat la clau de {bits} bits en {temps_limit} s")
+                    trobats[mida].append(primer)
+                    pendents[executor.submit(_cerca_primer, mida, e, limit)] = mida
+                # Un primer de cada mida (les mides poden repetir-se)
+                usats = []
+                for mida in mides:
+                    lliures = [p for p in trobats[mida] if p not in usats]
+                    if not lliures:
+                        break
+                    usats.append(lliures[0])
+                else:
+                    clau = _clau_amb_primers(usats, bits, e)
+                    if clau:
+                        return clau
+                    # El producte ha quedat curt: es descarta el primer més petit
+                    petit = min(usats)
+                    for llista in trobats.values():
+                        if petit in llista:
+                            llista.remove(petit)
+        finally:
+            atura.set()
+            for futur in pendents:
+                futur.cancel()
+
+def genera_claus(quantes, bits=2048, e=65537, n_primers=2, processos=None):
+    # Genera moltes claus repartint-les entre processos (una clau per tasca)
+    processos = processos or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futurs = [executor.submit(genera_clau, bits, e, n_primers) for _ in range(quantes)]
+        return [futur.result() for futur in futurs]
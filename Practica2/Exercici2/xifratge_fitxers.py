@@ -0,0 +1,187 @@
+# Xifratge RSA de fitxers i fluxos de bytes de qualsevol mida.
+# Les dades es parteixen en blocs que caben al mòdul, cada bloc es farceix
+# amb OAEP (RFC 8017, SHA-256 i MGF1) i es xifra amb la clau. Els blocs
+# s'agrupen en lots que es xifren en paral·lel; només hi ha max_pendents
+# lots en marxa, així que la memòria no depèn de la mida de l'entrada.
+#
+# Format de sortida:
+#   capçalera: b"RSAF" | versió (1 byte) | k = bytes del mòdul (2 bytes)
+#   trames:    longitud (4 bytes, big-endian) | bloc xifrat de k bytes
+#   final:     una trama de longitud 0
+# La trama final permet detectar fitxers truncats quan es llegeix en flux.
+
+import hashlib
+import os
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+MAGIC = b"RSAF"
+VERSIO = 1
+_CAPCALERA = struct.Struct(">4sBH")
+_LONGITUD = struct.Struct(">I")
+HASH = hashlib.sha256
+BLOCS_PER_LOT = 64
+
+# ---------- OAEP ----------
+
+def _mgf1(llavor, longitud):
+    sortida = bytearray()
+    comptador = 0
+    while len(sortida) < longitud:
+        sortida += HASH(llavor + comptador.to_bytes(4, "big")).digest()
+        comptador += 1
+    return bytes(sortida[:longitud])
+
+def _xor(a, b):
+    return (int.from_bytes(a, "big") ^ int.from_bytes(b, "big")).to_bytes(len(a), "big")
+
+def capacitat_bloc(k):
+    # Bytes de missatge que caben en un bloc OAEP d'un mòdul de k bytes
+    return k - 2 * HASH().digest_size - 2
+
+def oaep_codifica(missatge, k, etiqueta=b""):
+    h = HASH().digest_size
+    if len(missatge) > capacitat_bloc(k):
+        raise ValueError("el missatge no cap en un bloc OAEP")
+    bloc_dades = HASH(etiqueta).digest() + bytes(k - len(missatge) - 2 * h - 2) + b"\x01" + missatge
+    llavor = os.urandom(h)
+    bloc_dades = _xor(bloc_dades, _mgf1(llavor, k - h - 1))
+    llavor = _xor(llavor, _mgf1(bloc_dades, h))
+    return b"\x00" + llavor + bloc_dades
+
+def oaep_descodifica(codificat, k, etiqueta=b""):
+    h = HASH().digest_size
+    if len(codificat) != k or k < 2 * h + 2:
+        raise ValueError("error de desxifratge")
+    llavor = _xor(codificat[1:h + 1], _mgf1(codificat[h + 1:], h))
+    bloc_dades = _xor(codificat[h + 1:], _mgf1(llavor, k - h - 1))
+    separador = bloc_dades.find(b"\x01", h)
+    # Es comproven totes les condicions juntes per no donar pistes de quina falla
+    if (codificat[0] != 0) | (bloc_dades[:h] != HASH(etiqueta).digest()) | (separador < 0) \
+            | (bloc_dades[h:max(separador, h)].count(0) != max(separador, h) - h):
+        raise ValueError("error de desxifratge")
+    return bloc_dades[separador + 1:]
+
+# ---------- Treball de cada procés ----------
+
+_clau = None
+
+def _inicialitza(clau):
+    # La clau s'envia una sola vegada a cada procés, no amb cada lot
+    global _clau
+    _clau = clau
+
+def _mida_modul(clau):
+    return (clau.n.bit_length() + 7) // 8
+
+def _xifra_lot(dades):
+    # Bytes en clar -> trames xifrades (longitud + bloc) d'un lot
+    k = _mida_modul(_clau)
+    capacitat = capacitat_bloc(k)
+    sortida = bytearray()
+    for inici in range(0, len(dades), capacitat):
+        m = int.from_bytes(oaep_codifica(dades[inici:inici + capacitat], k), "big")
+        sortida += _LONGITUD.pack(k) + _clau.xifra(m).to_bytes(k, "big")
+    return bytes(sortida)
+
+def _desxifra_lot(blocs):
+    # Llista de blocs xifrats -> bytes en clar
+    k = _mida_modul(_clau)
+    return b"".join(oaep_descodifica(_clau.desxifra(int.from_bytes(bloc, "big")).to_bytes(k, "big"), k)
+                    for bloc in blocs)
+
+def _processa(funcio, lots, clau, processos, max_pendents):
+    # Aplica funcio a cada lot mantenint l'ordre; amb processos > 1 fa servir
+    # un ProcessPoolExecutor amb com a molt max_pendents lots enviats
+    if processos <= 1:
+        _inicialitza(clau)
+        for lot in lots:
+            yield funcio(lot)
+        return
+    with ProcessPoolExecutor(max_workers=processos, initializer=_inicialitza, initargs=(clau,)) as executor:
+        pendents = deque()
+        for lot in lots:
+            pendents.append(executor.submit(funcio, lot))
+            if len(pendents) >= max_pendents:
+                yield pendents.popleft().result()
+        while pendents:
+            yield pendents.popleft().result()
+
+# ---------- Fluxos ----------
+
+def _llegeix_exacte(origen, mida):
+    dades = origen.read(mida)
+    if len(dades) != mida:
+        raise ValueError("fitxer xifrat truncat")
+    return dades
+
+def _lots_en_clar(origen, mida_lot):
+    while True:
+        dades = origen.read(mida_lot)
+        if not dades:
+            return
+        yield dades
+
+def _lots_xifrats(origen, k):
+    lot = []
+    while True:
+        longitud, = _LONGITUD.unpack(_llegeix_exacte(origen, _LONGITUD.size))
+        if longitud == 0:
+            break
+        if longitud != k:
+            raise ValueError(f"trama de {longitud} bytes en un fitxer amb blocs de {k}")
+        lot.append(_llegeix_exacte(origen, k))
+        if len(lot) == BLOCS_PER_LOT:
+            yield lot
+            lot = []
+    if lot:
+        yield lot
+
+def xifra_flux(origen, desti, clau, processos=None, max_pendents=None):
+    # Llegeix bytes d'origen (fitxer binari obert) i escriu el format RSAF a desti.
+    # Retorna el nombre de bytes en clar xifrats.
+    processos = processos or os.cpu_count() or 1
+    max_pendents = max_pendents or 2 * processos
+    k = _mida_modul(clau)
+    capacitat = capacitat_bloc(k)
+    if capacitat <= 0:
+        raise ValueError("el mòdul és massa petit per a OAEP")
+    desti.write(_CAPCALERA.pack(MAGIC, VERSIO, k))
+    total = 0
+
+    def lots():
+        nonlocal total
+        for dades in _lots_en_clar(origen, capacitat * BLOCS_PER_LOT):
+            total += len(dades)
+            yield dades
+
+    # Només cal la part pública: la privada no s'envia als processos
+    for trames in _processa(_xifra_lot, lots(), clau.publica(), processos, max_pendents):
+        desti.write(trames)
+    desti.write(_LONGITUD.pack(0))
+    return total
+
+def desxifra_flux(origen, desti, clau, processos=None, max_pendents=None):
+    # Llegeix el format RSAF d'origen i escriu els bytes en clar a desti.
+    # Retorna el nombre de bytes en clar recuperats.
+    processos = processos or os.cpu_count() or 1
+    max_pendents = max_pendents or 2 * processos
+    magic, versio, k = _CAPCALERA.unpack(_llegeix_exacte(origen, _CAPCALERA.size))
+    if magic != MAGIC or versio != VERSIO:
+        raise ValueError("no és un fitxer RSAF")
+    if k != _mida_modul(clau):
+        raise ValueError("el fitxer s'ha xifrat amb una clau d'una altra mida")
+    total = 0
+    for dades in _processa(_desxifra_lot, _lots_xifrats(origen, k), clau, processos, max_pendents):
+        desti.write(dades)
+        total += len(dades)
+    return total
+
+def xifra_fitxer(ruta_origen, ruta_desti, clau, processos=None):
+    with open(ruta_origen, "rb") as origen, open(ruta_desti, "wb") as desti:
+        return xifra_flux(origen, desti, clau, processos)
+
+def desxifra_fitxer(ruta_origen, ruta_desti, clau, processos=None):
+    with open(ruta_origen, "rb") as origen, open(ruta_desti, "wb") as desti:
+        return desxifra_flux(origen, desti, clau, processos)
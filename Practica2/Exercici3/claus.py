@@ -0,0 +1,187 @@
+# Lector de claus RSA en PEM i DER: PKCS#1 (RSAPrivateKey, RSAPublicKey),
+# PKCS#8 (PrivateKeyInfo) i SubjectPublicKeyInfo (-----BEGIN PUBLIC KEY-----).
+# El DER es recorre amb memoryview, sense copiar cap tros del fitxer: cada
+# element és una finestra sobre les dades originals fins que es converteix
+# en enter. Les claus llegides es guarden en una memòria cau indexada pel
+# SHA-256 del contingut, amb els paràmetres del TXR i de Montgomery ja
+# calculats, de manera que tornar a carregar la mateixa clau no costa res.
+#
+# Ús: python claus.py fitxer.pem [...]
+
+import base64
+import binascii
+import hashlib
+import os
+import sys
+from collections import OrderedDict
+
+try:
+    from .clau_rsa import ClauRSA
+except ImportError:  # Executat des de la carpeta, fora del paquet criptografia
+    # Afegeix el path absolut de la carpeta 'Exercici2' al path de Python
+    ruta_base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ruta_exercici2 = os.path.join(ruta_base, 'Exercici2')
+    sys.path.append(ruta_exercici2)
+
+    from clau_rsa import ClauRSA
+
+# Etiquetes DER que fan servir les claus RSA
+ENTER, CADENA_BITS, CADENA_OCTETS, NUL, OID, SEQUENCIA = 0x02, 0x03, 0x04, 0x05, 0x06, 0x30
+OID_RSA = bytes.fromhex("2a864886f70d010101")  # 1.2.840.113549.1.1.1 rsaEncryption
+MIDA_CACHE = 256
+
+# ---------- DER ----------
+
+def llegeix_element(dades, pos=0):
+    # Llegeix l'element TLV que comença a pos. Retorna (etiqueta, contingut, pos següent),
+    # on contingut és un memoryview sobre les mateixes dades.
+    if pos + 2 > len(dades):
+        raise ValueError("DER invàlid: element truncat")
+    etiqueta, longitud = dades[pos], dades[pos + 1]
+    pos += 2
+    if longitud & 0x80:
+        octets = longitud & 0x7f
+        if octets == 0 or octets > 4 or pos + octets > len(dades):
+            raise ValueError("DER invàlid: longitud no suportada")
+        longitud = int.from_bytes(dades[pos:pos + octets], "big")
+        pos += octets
+    if pos + longitud > len(dades):
+        raise ValueError("DER invàlid: el contingut surt de les dades")
+    return etiqueta, dades[pos:pos + longitud], pos + longitud
+
+def elements(contingut):
+    # Tots els elements d'una SEQUENCE com a llista de (etiqueta, contingut)
+    resultat, pos = [], 0
+    while pos < len(contingut):
+        etiqueta, valor, pos = llegeix_element(contingut, pos)
+        resultat.append((etiqueta, valor))
+    return resultat
+
+def _sequencia(dades, etiqueta_esperada=SEQUENCIA):
+    etiqueta, contingut, fi = llegeix_element(dades)
+    if etiqueta != etiqueta_esperada or fi != len(dades):
+        raise ValueError("DER invàlid: s'esperava una SEQUENCE")
+    return elements(contingut)
+
+def _enters(elements_seq, quants):
+    if len(elements_seq) < quants or any(etiqueta != ENTER for etiqueta, _ in elements_seq[:quants]):
+        raise ValueError("DER invàlid: s'esperaven enters")
+    return [int.from_bytes(valor, "big", signed=True) for _, valor in elements_seq[:quants]]
+
+def _comprova_algorisme(element):
+    etiqueta, contingut = element
+    if etiqueta != SEQUENCIA:
+        raise ValueError("DER invàlid: falta l'AlgorithmIdentifier")
+    parts = elements(contingut)
+    if not parts or parts[0][0] != OID or parts[0][1] != OID_RSA:
+        raise ValueError("la clau no és RSA")
+
+# ---------- Estructures de clau ----------
+
+def clau_pkcs1_privada(der):
+    # RSAPrivateKey ::= SEQUENCE { version, n, e, d, p, q, dP, dQ, qInv, otherPrimeInfos OPTIONAL }
+    parts = _sequencia(der)
+    versio, n, e, d, p, q, dP, dQ, qInv = _enters(parts, 9)
+    altres = []
+    if versio == 1 and len(parts) > 9:
+        for etiqueta, info in elements(parts[9][1]):
+            altres.append(tuple(_enters(elements(info), 3)))
+    return ClauRSA(n, e, d, p, q, dP, dQ, qInv, altres)
+
+def clau_pkcs1_publica(der):
+    # RSAPublicKey ::= SEQUENCE { n, e }
+    n, e = _enters(_sequencia(der), 2)
+    return ClauRSA(n, e)
+
+def clau_pkcs8(der):
+    # PrivateKeyInfo ::= SEQUENCE { version, AlgorithmIdentifier, OCTET STRING (RSAPrivateKey) }
+    parts = _sequencia(der)
+    if len(parts) < 3 or parts[2][0] != CADENA_OCTETS:
+        raise ValueError("DER invàlid: PrivateKeyInfo mal format")
+    _comprova_algorisme(parts[1])
+    return clau_pkcs1_privada(parts[2][1])
+
+def clau_spki(der):
+    # SubjectPublicKeyInfo ::= SEQUENCE { AlgorithmIdentifier, BIT STRING (RSAPublicKey) }
+    parts = _sequencia(der)
+    if len(parts) != 2 or parts[1][0] != CADENA_BITS or parts[1][1][:1] != b"\x00":
+        raise ValueError("DER invàlid: SubjectPublicKeyInfo mal format")
+    _comprova_algorisme(parts[0])
+    return clau_pkcs1_publica(parts[1][1][1:])
+
+_PER_ETIQUETA = {
+    "RSA PRIVATE KEY": clau_pkcs1_privada,
+    "PRIVATE KEY": clau_pkcs8,
+    "RSA PUBLIC KEY": clau_pkcs1_publica,
+    "PUBLIC KEY": clau_spki,
+}
+
+def clau_der(der):
+    # DER sense etiqueta PEM: es proven els quatre formats
+    for lector in (clau_pkcs8, clau_spki, clau_pkcs1_privada, clau_pkcs1_publica):
+        try:
+            return lector(der)
+        except ValueError:
+            continue
+    raise ValueError("DER invàlid: no és cap format de clau RSA conegut")
+
+def _pem(dades):
+    # Retorna (etiqueta, der) del primer bloc PEM de les dades
+    text = bytes(dades).decode("ascii", "replace")
+    inici = text.find("-----BEGIN ")
+    if inici < 0:
+        return None, None
+    fi_etiqueta = text.find("-----", inici + 11)
+    etiqueta = text[inici + 11:fi_etiqueta]
+    final = text.find(f"-----END {etiqueta}-----", fi_etiqueta)
+    if fi_etiqueta < 0 or final < 0:
+        raise ValueError("PEM invàlid: falta la línia END")
+    try:
+        der = base64.b64decode("".join(text[fi_etiqueta + 5:final].split()), validate=True)
+    except binascii.Error:
+        raise ValueError("PEM invàlid: base64 incorrecte")
+    return etiqueta, memoryview(der)
+
+# ---------- Memòria cau ----------
+
+_cache = OrderedDict()
+
+def carrega_clau(dades):
+    # Clau RSA a partir del contingut d'un fitxer PEM o DER (bytes o str).
+    # La mateixa clau (mateix contingut) es retorna de la memòria cau.
+    if isinstance(dades, str):
+        dades = dades.encode("ascii")
+    resum = hashlib.sha256(dades).digest()
+    if resum in _cache:
+        _cache.move_to_end(resum)
+        return _cache[resum]
+    etiqueta, der = _pem(dades)
+    if etiqueta is None:
+        clau = clau_der(memoryview(dades))
+    elif etiqueta in _PER_ETIQUETA:
+        clau = _PER_ETIQUETA[etiqueta](der)
+    else:
+        raise ValueError(f"tipus de PEM no suportat: {etiqueta}")
+    clau.precalcula()
+    _cache[resum] = clau
+    if len(_cache) > MIDA_CACHE:
+        _cache.popitem(last=False)
+    return clau
+
+def carrega_fitxer(ruta):
+    with open(ruta, "rb") as f:
+        return carrega_clau(f.read())
+
+def buida_cache():
+    _cache.clear()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Ús: python claus.py fitxer.pem [...]")
+        sys.exit(1)
+    for ruta in sys.argv[1:]:
+        clau = carrega_fitxer(ruta)
+        print(f"{ruta}: {clau}")
+        print(f"  n = {clau.n}")
+        print(f"  e = {clau.e}")
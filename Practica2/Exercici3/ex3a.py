@@ -1,8 +1,45 @@
+import os
+import sys
+
+try:
+    from .claus import carrega_fitxer
+except ImportError:  # Executat des de la carpeta, fora del paquet criptografia
+    from claus import carrega_fitxer
+
+directori = os.path.dirname(os.path.abspath(__file__))
+
 def parseHexToDec(hex):
-    hex = hex.replace("\n", "").replace(" ", "").replace(":", "")
-    decimal = int(hex, 16)
-    print("El numero decimal")
-    print(decimal)
+    # Per a valors solts copiats de `openssl rsa -text`; les claus senceres
+    # es llegeixen directament del PEM amb carrega_fitxer
+    hex = "".join(hex.split()).replace(":", "")
+    return int(hex, 16)
+
+def desxifra_pkcs1_v15(clau, xifrat):
+    # Desxifra un bloc fet amb `openssl pkeyutl -encrypt` (farciment PKCS#1 v1.5:
+    # 00 02 | bytes aleatoris no nuls | 00 | missatge)
+    k = (clau.n.bit_length() + 7) // 8
+    bloc = clau.desxifra(int.from_bytes(xifrat, "big")).to_bytes(k, "big")
+    separador = bloc.find(b"\x00", 2)
+    if bloc[:2] != b"\x00\x02" or separador < 10:
+        raise ValueError("error de desxifratge")
+    return bloc[separador + 1:]
+
+if __name__ == "__main__":
+    # python ex3a.py hex 00:c3:9a:...   converteix valors solts en lloc de llegir claus
+    if sys.argv[1:2] == ["hex"]:
+        for valor in sys.argv[2:]:
+            print("El numero decimal")
+            print(parseHexToDec(valor))
+        sys.exit()
+
+    fitxers = sys.argv[1:] or ["private.pem", "public.pem", "publicSergio.pem"]
+    for nom in fitxers:
+        clau = carrega_fitxer(os.path.join(directori, nom))
+        print(f"{nom}: {clau}")
+        print(f"  n = {clau.n}")
+        print(f"  e = {clau.e}")
 
-hex = input("Entra el numero hexadecimal:\n")
-parseHexToDec(hex)
\ No newline at end of file
+    if not sys.argv[1:]:
+        with open(os.path.join(directori, "missatgeMika.enc"), "rb") as f:
+            missatge = desxifra_pkcs1_v15(carrega_fitxer(os.path.join(directori, "private.pem")), f.read())
+        print(f"\nmissatgeMika.enc: {missatge.decode('utf-8-sig')}")
@@ -0,0 +1,64 @@
+# Rendiment (factoritzacions per segon) sobre un conjunt de semiprimers:
+#   factorize      -> ShorAlgorithm.factorize un N rere l'altre (referència)
+#   seqüencial     -> factorize_sequential (mateix servei, sense processos)
+#   P processos    -> factorize_batch amb P processos treballadors
+# i el temps total de cada etapa del mòdul quàntic sumat sobre tots els N.
+#
+# Ús: python benchmark_factoritzacio.py [màx. qubits] [processos ...]
+
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from shorAlgorithm import STAGES, ShorAlgorithm
+from shor_batch import factorize_batch, factorize_sequential
+
+def primers_senars(limit):
+    return [p for p in range(3, limit, 2) if all(p % d for d in range(3, int(p ** 0.5) + 1, 2))]
+
+def semiprimers(max_qubits):
+    # Semiprimers p·q (p < q senars) amb com a molt max_qubits qubits
+    primers = primers_senars(2 ** (max_qubits // 2))
+    return [p * q for i, p in enumerate(primers) for q in primers[i + 1:]
+            if ShorAlgorithm(p * q, verbose=False).n_qubits <= max_qubits]
+
+def executa(nom, resultats, quants):
+    inici = time.perf_counter()
+    resultats = list(resultats)
+    segons = time.perf_counter() - inici
+    correctes = sum(r["factors"] is not None and r["factors"][0] * r["factors"][1] == r["N"] for r in resultats)
+    etapes = {etapa: sum(r["timings"][etapa] for r in resultats) for etapa in STAGES}
+    intents = sum(r["attempts"] for r in resultats)
+    cancel_lats = sum(r["cancelled"] for r in resultats)
+    print(f"{nom:>14} {quants / segons:9.1f} {correctes:>6}/{quants} {intents:>7} {cancel_lats:>9} "
+          + " ".join(f"{etapes[etapa]:8.2f}" for etapa in STAGES))
+
+if __name__ == "__main__":
+    max_qubits = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    llista_processos = [int(p) for p in sys.argv[2:]] or sorted({2, os.cpu_count() or 1})
+    nombres = semiprimers(max_qubits)
+    random.seed(1)
+    random.shuffle(nombres)
+    print(f"{len(nombres)} semiprimers fins a {max_qubits} qubits, {os.cpu_count()} nuclis")
+    print(f"{'':>14} {'fact/s':>9} {'correctes':>10} {'intents':>7} {'cancel·lats':>9} "
+          + " ".join(f"{etapa[:8]:>8}" for etapa in STAGES) + "  (segons per etapa)")
+
+    random.seed(0)
+    np.random.seed(0)
+    inici = time.perf_counter()
+    correctes = 0
+    for N in nombres:
+        p, q = ShorAlgorithm(N, verbose=False).factorize()
+        correctes += p is not None
+    segons = time.perf_counter() - inici
+    print(f"{'factorize':>14} {len(nombres) / segons:9.1f} {correctes:>6}/{len(nombres)}")
+
+    random.seed(0)
+    np.random.seed(0)
+    executa("seqüencial", factorize_sequential(nombres), len(nombres))
+    for processos in llista_processos:
+        random.seed(0)
+        executa(f"{processos} processos", factorize_batch(nombres, processos), len(nombres))
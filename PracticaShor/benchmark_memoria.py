@@ -0,0 +1,48 @@
+# Memòria màxima (tracemalloc, inclou els arrays de NumPy) d'un pas complet
+# del mòdul quàntic (registre, oracle, col·lapse, QFT i mesura) segons el
+# nombre de qubits, amb el buffer de la QFT en complex128 i en complex64.
+# Es fan dos intents amb el mateix objecte: el segon reutilitza el buffer.
+#
+# Ús: python benchmark_memoria.py [qubits màxims]
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from shorAlgorithm import ShorAlgorithm
+
+# Semiprimers N amb ceil(2·log2 N) = qubits
+CASOS = [(221, 16), (667, 19), (1007, 20), (1517, 22), (3599, 24), (6557, 26)]
+
+def pas_quantic(shor, a):
+    register = shor.create_uniform_quantum_register()
+    entangled = shor.quantum_modular_exponentiation(register, a)
+    collapsed = shor.measure_second_register(entangled)
+    qft = shor.quantum_fourier_transform(collapsed)
+    return shor.measure_qft_register(qft)
+
+if __name__ == "__main__":
+    max_qubits = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    np.random.seed(0)
+    print(f"{'qubits':>6} {'estats':>10} {'dtype':>11} {'buffer MB':>10} {'pic MB':>9} {'B/estat':>8} "
+          f"{'pic 2n intent MB':>17} {'segons':>7}")
+    for N, qubits in CASOS:
+        if qubits > max_qubits:
+            break
+        for dtype in (np.complex128, np.complex64):
+            shor = ShorAlgorithm(N, verbose=False, dtype=dtype)
+            mida = 2 ** shor.n_qubits
+            tracemalloc.start()
+            inici = time.perf_counter()
+            pas_quantic(shor, 2)
+            segons = time.perf_counter() - inici
+            pic = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            actual = tracemalloc.get_traced_memory()[0]
+            pas_quantic(shor, 2)
+            pic2 = tracemalloc.get_traced_memory()[1] - actual  # Per sobre del buffer ja reservat
+            tracemalloc.stop()
+            print(f"{qubits:>6} {mida:>10} {np.dtype(dtype).name:>11} {shor._buffer.nbytes / 2**20:10.1f} "
+                  f"{pic / 2**20:9.1f} {pic / mida:8.1f} {pic2 / 2**20:17.1f} {segons:7.2f}")
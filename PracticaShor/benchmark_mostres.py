@@ -0,0 +1,52 @@
+# Mesures per intent: una sola mesura de la QFT (amb la cerca de múltiples
+# del denominador) contra k mesures de la mateixa distribució combinades amb
+# el mcm. Per a cada k es mostren:
+#   ordre exacte -> fracció d'execucions del mòdul quàntic que retornen el
+#                   període exacte de a^x mod N
+#   execucions   -> execucions del mòdul quàntic (oracle + QFT) per factorització
+#   temps        -> temps mitjà per factorització
+#
+# Ús: python benchmark_mostres.py [repeticions] [fft|analytic]
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from shorAlgorithm import ShorAlgorithm
+
+SEMIPRIMERS = [15, 21, 33, 35, 39, 51, 55, 57, 65, 77, 85, 91, 119, 143, 187, 221, 323, 437, 667, 899]
+MOSTRES = [1, 2, 4, 8]
+
+def ordre(a, N):
+    r, valor = 1, a % N
+    while valor != 1:
+        valor = valor * a % N
+        r += 1
+    return r
+
+if __name__ == "__main__":
+    repeticions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    mode = sys.argv[2] if len(sys.argv) > 2 else "fft"
+    print(f"mode de QFT: {mode}, {len(SEMIPRIMERS)} semiprimers, {repeticions} repeticions")
+    print(f"{'mesures':>8} {'ordre exacte':>13} {'execucions':>11} {'factoritzats':>13} {'temps (ms)':>11}")
+    for k in MOSTRES:
+        random.seed(0)
+        np.random.seed(0)
+        exactes = proves = execucions = factoritzats = 0
+        inici = time.perf_counter()
+        for N in SEMIPRIMERS:
+            for _ in range(repeticions):
+                shor = ShorAlgorithm(N, verbose=False, qft_mode=mode, samples=k)
+                a = shor.choose_random_a()
+                exactes += shor.quantum_period_finding(a) == ordre(a, N)
+                proves += 1
+                shor.quantum_runs = 0
+                p, q = shor.factorize(max_attempts=50)
+                factoritzats += p is not None
+                execucions += shor.quantum_runs
+        temps = time.perf_counter() - inici
+        total = len(SEMIPRIMERS) * repeticions
+        print(f"{k:>8} {exactes / proves:13.0%} {execucions / total:11.2f} {factoritzats / total:13.0%} "
+              f"{temps / total * 1000:11.1f}")
@@ -0,0 +1,38 @@
+# Temps de l'oracle |x⟩ → |x, a^x mod N⟩ segons el nombre de qubits:
+# la versió original (una exponenciació i un append per cada x) contra la
+# taula per duplicació agrupada amb bincount. La versió original només es
+# mesura fins a MAX_QUBITS_BUCLE qubits; a partir d'aquí s'extrapola
+# linealment en 2^n des de l'última mida mesurada.
+#
+# Ús: python benchmark_oracle.py
+
+import time
+
+from shorAlgorithm import ShorAlgorithm
+
+# Semiprimers N amb ceil(2·log2 N) = qubits
+CASOS = [(35, 11), (77, 13), (221, 16), (667, 19), (1007, 20), (1517, 22), (3599, 24)]
+MAX_QUBITS_BUCLE = 19
+
+def temps(funcio, *args):
+    inici = time.perf_counter()
+    funcio(*args)
+    return time.perf_counter() - inici
+
+if __name__ == "__main__":
+    print(f"{'N':>6} {'qubits':>6} {'estats':>10} {'bucle (s)':>12} {'vectoritzat (s)':>16} {'acceleració':>12}")
+    bucle_per_estat = None
+    for N, qubits in CASOS:
+        shor = ShorAlgorithm(N, verbose=False)
+        assert shor.n_qubits == qubits
+        register = shor.create_uniform_quantum_register()
+        a = 2
+        vectoritzat = min(temps(shor.quantum_modular_exponentiation, register, a) for _ in range(3))
+        if qubits <= MAX_QUBITS_BUCLE:
+            bucle = temps(shor.quantum_modular_exponentiation_loop, register, a)
+            bucle_per_estat = bucle / len(register)
+            text_bucle = f"{bucle:12.3f}"
+        else:
+            bucle = bucle_per_estat * len(register)
+            text_bucle = f"~{bucle:11.1f}"
+        print(f"{N:>6} {qubits:>6} {len(register):>10} {text_bucle} {vectoritzat:16.4f} {bucle / vectoritzat:11.0f}x")
@@ -0,0 +1,92 @@
+# Comprovació estadística del mode "analytic" de la QFT contra el mode "fft".
+# Per a diversos (N, a) i valors mesurats f(x):
+#   1) la probabilitat en forma tancada coincideix amb |FFT|² per a tot y;
+#   2) les mostres de cada mode superen una prova khi quadrat de bondat
+#      d'ajust contra |FFT|² (també amb una finestra petita, perquè la cua
+#      fora de la finestra es mostregi sovint);
+#   3) les mostres dels dos modes superen una prova khi quadrat de
+#      dues mostres entre elles.
+# Si algun valor p és menor que ALFA, o la forma tancada no coincideix, el
+# programa acaba amb codi 1. Al final es compara el temps per mesura.
+#
+# Ús: python comprova_qft.py [mostres]
+
+import sys
+import time
+from math import erfc, sqrt
+
+import numpy as np
+
+from shorAlgorithm import ShorAlgorithm, sample_indices
+
+CASOS = [(15, 7), (21, 2), (35, 3), (91, 5), (143, 2), (667, 5)]
+ALFA = 1e-4
+
+def valor_p(khi2, graus):
+    # P(X > khi2) per a una khi quadrat amb 'graus' graus de llibertat (Wilson-Hilferty)
+    if graus <= 0:
+        return 1.0
+    z = ((khi2 / graus) ** (1 / 3) - (1 - 2 / (9 * graus))) / sqrt(2 / (9 * graus))
+    return 0.5 * erfc(z / sqrt(2))
+
+def classes(probabilitats, minim):
+    # Agrupa els y en classes amb probabilitat esperada >= minim (la resta en una sola classe)
+    grans = np.flatnonzero(probabilitats >= minim)
+    classe = np.full(len(probabilitats), len(grans))
+    classe[grans] = np.arange(len(grans))
+    return classe, len(grans) + 1
+
+def bondat_ajust(mostres, probabilitats):
+    classe, n_classes = classes(probabilitats, 5 / len(mostres))
+    observats = np.bincount(classe[mostres], minlength=n_classes)
+    esperats = np.bincount(classe, weights=probabilitats, minlength=n_classes) * len(mostres)
+    valids = esperats > 0
+    khi2 = np.sum((observats[valids] - esperats[valids]) ** 2 / esperats[valids])
+    return valor_p(khi2, valids.sum() - 1)
+
+def dues_mostres(a, b, probabilitats):
+    classe, n_classes = classes(probabilitats, 10 / len(a))
+    oa = np.bincount(classe[a], minlength=n_classes)
+    ob = np.bincount(classe[b], minlength=n_classes)
+    valids = oa + ob > 0
+    khi2 = np.sum((oa[valids] - ob[valids]) ** 2 / (oa[valids] + ob[valids]))
+    return valor_p(khi2, valids.sum() - 1)
+
+if __name__ == "__main__":
+    n_mostres = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    np.random.seed(0)
+    errors = 0
+    print(f"{'N':>5} {'a':>3} {'f(x)':>5} {'r':>4} {'qubits':>6} {'|dif| màx':>10} "
+          f"{'p analític':>11} {'p finestra 1':>13} {'p fft':>8} {'p 2 mostres':>12}")
+    for N, a in CASOS:
+        shor = ShorAlgorithm(N, verbose=False, qft_mode="fft")
+        entangled = shor.quantum_modular_exponentiation(shor.create_uniform_quantum_register(), a)
+        for fx in entangled.keys()[:2]:
+            collapsed = entangled.collapse(fx)
+            qft = shor.quantum_fourier_transform(collapsed)
+            probabilitats = np.abs(qft) ** 2
+            diferencia = np.abs(collapsed.qft_probabilities(np.arange(len(qft))) - probabilitats).max()
+            analitic = collapsed.sample_qft(n_mostres)
+            finestra = collapsed.sample_qft(n_mostres, window=1)
+            fft = sample_indices(qft, n_mostres)
+            ps = [bondat_ajust(analitic, probabilitats), bondat_ajust(finestra, probabilitats),
+                  bondat_ajust(fft, probabilitats), dues_mostres(analitic, fft, probabilitats)]
+            correcte = diferencia < 1e-9 and min(ps) >= ALFA
+            errors += not correcte
+            print(f"{N:>5} {a:>3} {fx:>5} {collapsed.period:>4} {shor.n_qubits:>6} {diferencia:10.1e} "
+                  f"{ps[0]:11.3f} {ps[1]:13.3f} {ps[2]:8.3f} {ps[3]:12.3f}" + ("" if correcte else "  ERROR"))
+
+    print("\nTemps per mesura (registre, oracle, col·lapse, QFT i mesura):")
+    for N in (1007, 1517, 3599):
+        temps = {}
+        for mode in ("fft", "analytic"):
+            shor = ShorAlgorithm(N, verbose=False, qft_mode=mode)
+            inici = time.perf_counter()
+            for _ in range(3):
+                shor.quantum_period_finding(2)
+            temps[mode] = (time.perf_counter() - inici) / 3
+        print(f"  N = {N} ({shor.n_qubits} qubits): fft {temps['fft']:.3f} s, "
+              f"analític {temps['analytic']:.3f} s ({temps['fft'] / temps['analytic']:.1f}x)")
+
+    print("\nTot correcte" if not errors else f"\n{errors} casos no coincideixen")
+    sys.exit(1 if errors else 0)
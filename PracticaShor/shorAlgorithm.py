@@ -1,8 +1,275 @@
+import os
+import sys
+import time
 import numpy as np
 import random
-from math import gcd, log2, ceil
+from math import gcd, isqrt, lcm, log2, ceil
 from fractions import Fraction
 
+# Motor d'exponenciació modular de la Pràctica 2
+try:
+    from .ex1b import invers_modular
+    from .ex1c import potencia_modular
+    from .modular import LIMIT_VECTORIAL, context
+except ImportError:  # Executat des de la carpeta, fora del paquet criptografia
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Practica2', 'Exercici1'))
+
+    from ex1b import invers_modular
+    from ex1c import potencia_modular
+    from modular import LIMIT_VECTORIAL, context
+
+
+BLOCK_SIZE = 1 << 16  # Estats per bloc quan es recorre un registre sense materialitzar-lo
+QFT_MODES = ("analytic", "fft")
+STAGES = ("oracle", "collapse", "qft", "continued_fractions")
+
+
+def exponentiation_table(a, size, N):
+    """
+    Taula f(x) = a^x mod N per a x = 0..size-1, en int64.
+    Es construeix per duplicació: si f[0..k) ja hi és,
+    f[k..2k) = f[0..k) · a^k mod N, així que calen log2(size) operacions
+    vectorials en lloc d'una exponenciació per cada x.
+    """
+    if N >= LIMIT_VECTORIAL:
+        raise ValueError("la simulació necessita N < 2^31")
+    table = np.empty(size, dtype=np.int64)
+    table[0] = 1 % N
+    k, power = 1, a % N  # power = a^k mod N
+    while k < size:
+        m = min(k, size - k)
+        np.multiply(table[:m], power, out=table[k:k + m])
+        np.remainder(table[k:k + m], N, out=table[k:k + m])
+        power = power * power % N
+        k *= 2
+    return table
+
+
+def sample_indices(register, count=1, block_size=BLOCK_SIZE):
+    """
+    Mostreja count índexs amb probabilitat |amplitud|² sense construir el
+    vector de probabilitats sencer: primer es tria el bloc (amb la suma de
+    cada bloc) i després l'índex dins del bloc.
+    """
+    sums = np.array([np.sum(np.abs(register[i:i + block_size]) ** 2, dtype=np.float64)
+                     for i in range(0, len(register), block_size)])
+    limits = np.cumsum(sums)
+    u = np.random.random(count) * limits[-1]
+    blocks = np.minimum(np.searchsorted(limits, u, side="right"), len(sums) - 1)
+    result = np.empty(count, dtype=np.int64)
+    for b in np.unique(blocks):
+        selected = blocks == b
+        start = b * block_size
+        cumulative = np.cumsum(np.abs(register[start:start + block_size]).astype(np.float64) ** 2)
+        local = u[selected] - (limits[b - 1] if b else 0.0)
+        result[selected] = start + np.minimum(np.searchsorted(cumulative, local, side="right"), len(cumulative) - 1)
+    return result
+
+
+class UniformRegister:
+    """
+    Superposició uniforme de size estats. Totes les amplituds valen
+    1/sqrt(size), així que no es guarda cap array.
+    """
+    
+    def __init__(self, size):
+        self.size = size
+        self.amplitude = 1.0 / np.sqrt(size)
+    
+    def __len__(self):
+        return self.size
+    
+    def __getitem__(self, x):
+        if not 0 <= x < self.size:
+            raise IndexError(x)
+        return self.amplitude
+
+
+class EntangledRegister:
+    """
+    Estat entrellaçat Σ amp(x)·|x, f(x)⟩ amb f(x) = a^x mod N.
+    La taula f(x) no es guarda sencera: es recorre per blocs
+    (f(x0 + j) = f(j) · a^x0 mod N) i només es guarda el pes de cada valor
+    de f(x), agrupat amb bincount (f(x) < N). Les amplituds negligibles d'un
+    registre dens s'ignoren. També es pot fer servir com el diccionari antic
+    f(x) → [(x, amplitud), ...].
+    """
+    
+    def __init__(self, register, a, N, block_size=BLOCK_SIZE):
+        self.register, self.a, self.N = register, a, N
+        self.size = len(register)
+        self.block_size = min(block_size, self.size)
+        self.uniform = isinstance(register, UniformRegister)
+        if self.uniform:
+            self.counts = np.zeros(N, dtype=np.int64)
+            for _, fx, _ in self.blocks():
+                self.counts += np.bincount(fx, minlength=N)
+            self.weights = self.counts * register.amplitude ** 2
+        else:
+            self.weights = np.zeros(N)
+            for _, fx, amps in self.blocks():
+                probs = np.abs(amps) ** 2
+                self.weights += np.bincount(fx, weights=np.where(probs > 1e-20, probs, 0), minlength=N)
+        self.values = np.flatnonzero(self.weights)
+    
+    def blocks(self):
+        """(inici, f(x), amplituds) de cada bloc; amplituds és None si el registre és uniforme."""
+        base = exponentiation_table(self.a, self.block_size, self.N)
+        step = pow(self.a, self.block_size, self.N)
+        factor = 1 % self.N  # a^inici mod N
+        for start in range(0, self.size, self.block_size):
+            n = min(self.block_size, self.size - start)
+            fx = base[:n] * factor % self.N
+            factor = factor * step % self.N
+            yield start, fx, None if self.uniform else np.asarray(self.register[start:start + n])
+    
+    def probabilities(self):
+        """Probabilitat de mesurar cada valor de self.values al segon registre."""
+        return self.weights[self.values]
+    
+    def states(self, fx):
+        """Índexs x i amplituds dels estats amb f(x) = fx."""
+        xs, amplitudes = [], []
+        for start, values, amps in self.blocks():
+            selected = values == fx
+            if amps is not None:
+                selected &= np.abs(amps) > 1e-10
+            found = np.flatnonzero(selected)
+            xs.append(found + start)
+            amplitudes.append(np.full(len(found), self.register.amplitude) if amps is None else amps[found])
+        return np.concatenate(xs), np.concatenate(amplitudes)
+    
+    def collapse(self, fx):
+        """
+        Registre col·lapsat a f(x) = fx, normalitzat.
+        Des d'un registre uniforme, f és periòdica amb període r i no es
+        repeteix dins d'un període, així que els estats que queden són
+        x0, x0 + r, x0 + 2r, ...: n'hi ha prou amb les dues primeres
+        aparicions i el recompte.
+        """
+        if not self.uniform:
+            xs, amps = self.states(fx)
+            return CollapsedRegister(self.size, indices=xs, amplitudes=amps / np.sqrt(np.sum(np.abs(amps) ** 2)))
+        count = int(self.counts[fx])
+        found = []
+        for start, values, _ in self.blocks():
+            found.extend((np.flatnonzero(values == fx)[:2] + start).tolist())
+            if len(found) >= min(count, 2):
+                break
+        period = found[1] - found[0] if count > 1 else self.size
+        return CollapsedRegister(self.size, offset=found[0], period=period, count=count)
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def __contains__(self, fx):
+        return 0 <= fx < self.N and self.weights[fx] > 0
+    
+    def __getitem__(self, fx):
+        xs, amps = self.states(fx)
+        if len(xs) == 0:
+            raise KeyError(fx)
+        return list(zip(xs.tolist(), amps.tolist()))
+    
+    def keys(self):
+        return self.values.tolist()
+    
+    def items(self):
+        return ((fx, self[fx]) for fx in self.keys())
+
+
+class CollapsedRegister:
+    """
+    Primer registre després de mesurar el segon.
+    Si venia d'un registre uniforme, els estats que queden formen la
+    progressió x = offset + k·period (k < count), tots amb amplitud
+    1/sqrt(count): només es guarden aquests tres enters. Si no, es guarden
+    els índexs i les amplituds. to_dense l'expandeix només quan cal (QFT).
+    """
+    
+    def __init__(self, size, offset=0, period=1, count=0, indices=None, amplitudes=None):
+        self.size = size
+        self.offset, self.period = offset, period
+        self.indices, self.amplitudes = indices, amplitudes
+        self.count = count if indices is None else len(indices)
+    
+    @property
+    def nbytes(self):
+        """Memòria de la representació (0 per a una progressió aritmètica)."""
+        return 0 if self.indices is None else self.indices.nbytes + self.amplitudes.nbytes
+    
+    def to_dense(self, out):
+        """Escriu l'estat a out (array de mida size) i el retorna."""
+        out.fill(0)
+        if self.indices is None:
+            out[self.offset::self.period][:self.count] = 1.0 / np.sqrt(self.count)
+        else:
+            out[self.indices] = self.amplitudes
+        return out
+    
+    def _fejer(self, t):
+        """
+        Probabilitat de cada y amb r·y ≡ t (mod M) després de la QFT:
+        |Σ_k e^(2πi·k·t/M)|² / (M·m) = sin²(π·m·t/M) / (M·m·sin²(π·t/M)),
+        amb límit m/M quan t ≡ 0.
+        """
+        M, m = self.size, self.count
+        t = np.asarray(t, dtype=np.int64) % M
+        numerator = np.sin(np.pi * (m * t % M) / M) ** 2
+        centered = np.where(t > M // 2, t - M, t)  # sin(π·t/M) amb t petit és més precís
+        denominator = np.sin(np.pi * centered / M) ** 2
+        zero = t == 0
+        return np.where(zero, m / M, numerator / (M * m * np.where(zero, 1.0, denominator)))
+    
+    def qft_probabilities(self, y):
+        """
+        Probabilitat de mesurar y després de la QFT, en forma tancada
+        (només per a una progressió aritmètica).
+        """
+        if self.indices is not None:
+            raise ValueError("la forma tancada només val per a una progressió aritmètica")
+        return self._fejer(self.period * np.asarray(y, dtype=np.int64) % self.size)
+    
+    def sample_qft(self, samples=1, window=256):
+        """
+        Mostreja la mesura després de la QFT directament de la distribució
+        en forma tancada, sense expandir el registre ni fer la FFT.
+        P(y) només depèn de t = r·y mod M, que recorre els múltiples de
+        g = mcd(r, M) (cadascun per a g valors de y), i es concentra en
+        t ≈ 0, és a dir en y ≈ j·M/r: un pic per a cada j. Es mostreja t
+        dins de ±window·r (O(r) càlculs, proporcional al nombre de pics) i
+        després y entre els g valors amb aquest t. La probabilitat de fora de
+        la finestra (~1/(5·window)) es mostreja exactament amb la resta de t.
+        """
+        if self.indices is not None:
+            raise ValueError("la forma tancada només val per a una progressió aritmètica")
+        M, r = self.size, self.period
+        if self.count <= 1:
+            return np.random.randint(0, M, samples)  # Un sol estat: la QFT és uniforme
+        g = gcd(r, M)
+        L = M // g  # t = g·s amb s mòdul L
+        half = min(window * r // g + 1, L // 2 - 1) if L > 2 else 0
+        s_inside = np.arange(-half, half + 1) % L
+        cumulative = np.cumsum(g * self._fejer(g * s_inside))
+        u = np.random.random(samples)
+        s = np.empty(samples, dtype=np.int64)
+        inside = u < cumulative[-1]
+        s[inside] = s_inside[np.minimum(np.searchsorted(cumulative, u[inside], side="right"), len(s_inside) - 1)]
+        if not inside.all():
+            s_outside = np.arange(half + 1, L - half)
+            tail = np.cumsum(g * self._fejer(g * s_outside))
+            u_tail = (u[~inside] - cumulative[-1]) / (1.0 - cumulative[-1]) * tail[-1]
+            s[~inside] = s_outside[np.minimum(np.searchsorted(tail, u_tail, side="right"), len(s_outside) - 1)]
+        # r·y ≡ g·s (mod M)  ⟺  y ≡ s·(r/g)^-1 (mod L), i n'hi ha g mòdul M
+        y = s * invers_modular(r // g, L) % L
+        return y + L * np.random.randint(0, g, samples)
+    
+    def __len__(self):
+        return self.size
+    
+    def __array__(self, dtype=None, copy=None):
+        return self.to_dense(np.empty(self.size, dtype=dtype or complex))
+
 
 class ShorAlgorithm:
     """
@@ -10,31 +277,48 @@ class ShorAlgorithm:
     dels components quàntics.
     """
     
-    def __init__(self, N):
+    def __init__(self, N, verbose=True, dtype=np.complex128, qft_mode="analytic", samples=1):
         """
         Inicialitza l'algorisme per factoritzar N.
         
         Args:
             N (int): Número a factoritzar
+            verbose (bool): Si és False no s'escriu la traça de cada pas
+            dtype: Tipus del buffer de la QFT. Amb NumPy 2 la FFT in situ en
+                complex128 no fa cap còpia, mentre que en complex64 en fa una
+                de temporal quatre vegades més gran que el buffer.
+            qft_mode (str): "analytic" mostreja la mesura de la QFT de la
+                seva forma tancada; "fft" fa la FFT del registre sencer
+                (referència, i per a registres que no són una progressió).
+            samples (int): Mesures de la QFT per intent. Amb més d'una, es
+                treuen totes de la mateixa distribució i els denominadors
+                es combinen amb el mcm (period_from_samples).
         """
+        if qft_mode not in QFT_MODES:
+            raise ValueError(f"mode de QFT desconegut: {qft_mode}")
         self.N = N
         self.n_qubits = ceil(2 * log2(N))  # Nombre de qubits necessaris
+        self.verbose = verbose
+        self.dtype = np.dtype(dtype)
+        self._buffer = None  # Buffer de la QFT, reutilitzat entre intents
+        self.qft_mode = qft_mode
+        self.samples = samples
+        self.quantum_runs = 0  # Execucions del mòdul quàntic (oracle + QFT)
+        self.timings = dict.fromkeys(STAGES, 0.0)  # Segons acumulats per etapa
+    
+    def _log(self, *args, **kwargs):
+        if self.verbose:
+            print(*args, **kwargs)
     
     # ========== FUNCIONS AUXILIARS CLÀSSIQUES ==========
     
     def mod_pow(self, base, exp, mod):
         """
         Calcula (base^exp) mod mod de forma eficient.
-        Exponenciació modular ràpida.
+        Fa servir el mode de base fixa: la base és sempre el mateix 'a',
+        així que les seves potències es precalculen una sola vegada.
         """
-        result = 1
-        base = base % mod
-        while exp > 0:
-            if exp % 2 == 1:
-                result = (result * base) % mod
-            exp = exp >> 1
-            base = (base * base) % mod
-        return result
+        return potencia_modular(base, exp, mod, metode="base_fixa")
     
     def choose_random_a(self):
         """
@@ -45,6 +329,22 @@ class ShorAlgorithm:
             if gcd(a, self.N) == 1:
                 return a
     
+    def modular_exponentiation_table(self, a, size):
+        """
+        Taula f(x) = a^x mod N per a x = 0..size-1 (vegeu exponentiation_table).
+        """
+        return exponentiation_table(a, size, self.N)
+    
+    def register_buffer(self, size):
+        """
+        Buffer de mida size per expandir el registre abans de la QFT.
+        Es reutilitza entre intents mentre la mida i el tipus no canviïn.
+        """
+        if self._buffer is None or len(self._buffer) != size:
+            self._buffer = None  # Alliberar l'anterior abans de reservar-ne un altre
+            self._buffer = np.empty(size, dtype=self.dtype)
+        return self._buffer
+    
     # ========== SIMULACIÓ DEL MÒDUL QUÀNTIC ==========
     
     def create_uniform_quantum_register(self):
@@ -53,16 +353,15 @@ class ShorAlgorithm:
         Crea un registre de n qubits en superposició uniforme.
         
         Returns:
-            np.array: Vector d'estats amb amplituds uniformes
+            UniformRegister: Registre amb amplituds uniformes (implícites)
         """
         size = 2 ** self.n_qubits
-        amplitude = 1.0 / np.sqrt(size)
         
-        # Cada estat |x⟩ té la mateixa amplitud
-        register = np.full(size, amplitude, dtype=complex)
+        # Cada estat |x⟩ té la mateixa amplitud: no cal guardar-les
+        register = UniformRegister(size)
         
-        print(f"\n[QUÀNTIC] Registre creat amb {self.n_qubits} qubits ({size} estats)")
-        print(f"[QUÀNTIC] Amplitud per estat: {amplitude:.6f}")
+        self._log(f"\n[QUÀNTIC] Registre creat amb {self.n_qubits} qubits ({size} estats)")
+        self._log(f"[QUÀNTIC] Amplitud per estat: {register.amplitude:.6f}")
         
         return register
     
@@ -76,7 +375,22 @@ class ShorAlgorithm:
             a: Base de l'exponenciació
             
         Returns:
-            dict: Diccionari que mapeja x → (a^x mod N, amplitud)
+            EntangledRegister: Estats agrupats per f(x) = a^x mod N
+        """
+        entangled = EntangledRegister(register, a, self.N)
+        
+        self._log(f"[QUÀNTIC] Exponenciació modular aplicada: |x⟩ → |x, {a}^x mod {self.N}⟩")
+        self._log(f"[QUÀNTIC] Estats entrellaçats: {len(entangled)} valors diferents de f(x)")
+        
+        return entangled
+    
+    def quantum_modular_exponentiation_loop(self, register, a):
+        """
+        Versió original de l'oracle, estat per estat (referència per a proves
+        i benchmarks): una exponenciació modular per cada x.
+        
+        Returns:
+            dict: Diccionari que mapeja f(x) → [(x, amplitud), ...]
         """
         entangled = {}
         
@@ -88,9 +402,6 @@ class ShorAlgorithm:
                     entangled[fx] = []
                 entangled[fx].append((x, register[x]))
         
-        print(f"[QUÀNTIC] Exponenciació modular aplicada: |x⟩ → |x, {a}^x mod {self.N}⟩")
-        print(f"[QUÀNTIC] Estats entrellaçats: {len(entangled)} valors diferents de f(x)")
-        
         return entangled
     
     def measure_second_register(self, entangled):
@@ -102,36 +413,20 @@ class ShorAlgorithm:
             entangled: Estats entrellaçats
             
         Returns:
-            np.array: Registre col·lapsat després de la mesura
+            CollapsedRegister: Registre col·lapsat després de la mesura
         """
-        # Calcular probabilitats per cada valor de f(x)
-        probabilities = {}
-        for fx, states in entangled.items():
-            prob = sum(abs(amp) ** 2 for _, amp in states)
-            probabilities[fx] = prob
-        
-        # Mesurar (col·lapsar) a un valor aleatori segons les probabilitats
-        values = list(probabilities.keys())
-        probs = list(probabilities.values())
+        # Mesurar (col·lapsar) a un valor aleatori segons la probabilitat de cada f(x)
+        values = entangled.values.tolist()
+        probs = entangled.probabilities().tolist()
         measured_fx = random.choices(values, weights=probs)[0]
         
-        print(f"[QUÀNTIC] Mesura del segon registre: f(x) = {measured_fx}")
+        self._log(f"[QUÀNTIC] Mesura del segon registre: f(x) = {measured_fx}")
         
         # Col·lapsar el primer registre: mantenir només estats amb f(x) = measured_fx
-        collapsed_states = entangled[measured_fx]
-        
-        # Crear nou registre col·lapsat i renormalitzar
-        size = 2 ** self.n_qubits
-        collapsed_register = np.zeros(size, dtype=complex)
+        # (renormalitzat, sense expandir-lo a un vector dens)
+        collapsed_register = entangled.collapse(measured_fx)
         
-        for x, amp in collapsed_states:
-            collapsed_register[x] = amp
-        
-        # Renormalitzar
-        norm = np.sqrt(np.sum(np.abs(collapsed_register) ** 2))
-        collapsed_register /= norm
-        
-        print(f"[QUÀNTIC] Registre col·lapsat a {len(collapsed_states)} estats")
+        self._log(f"[QUÀNTIC] Registre col·lapsat a {collapsed_register.count} estats")
         
         return collapsed_register
     
@@ -141,16 +436,25 @@ class ShorAlgorithm:
         Utilitza FFT per simular la QFT.
         
         Args:
-            register: Registre quàntic
+            register: Registre quàntic (CollapsedRegister o array)
             
         Returns:
-            np.array: Registre després d'aplicar QFT
+            np.array: Registre després d'aplicar QFT. És el buffer
+                reutilitzat: el següent intent el sobreescriu.
         """
-        print(f"[QUÀNTIC] Aplicant Transformada de Fourier Quàntica...")
+        self._log(f"[QUÀNTIC] Aplicant Transformada de Fourier Quàntica...")
+        
+        # Expandir el registre al buffer reutilitzat
+        buffer = self.register_buffer(len(register))
+        if isinstance(register, CollapsedRegister):
+            register.to_dense(buffer)
+        else:
+            buffer[:] = register
         
         # La QFT és essencialment una DFT (Discrete Fourier Transform)
-        # Podem usar numpy.fft per simular-ho
-        qft_register = np.fft.fft(register) / np.sqrt(len(register))
+        # Podem usar numpy.fft per simular-ho, in situ sobre el buffer
+        qft_register = np.fft.fft(buffer, out=buffer)
+        qft_register *= 1 / np.sqrt(len(buffer))
         
         return qft_register
     
@@ -165,10 +469,27 @@ class ShorAlgorithm:
         Returns:
             int: Estat mesurat
         """
-        probabilities = np.abs(qft_register) ** 2
-        measured_state = np.random.choice(len(qft_register), p=probabilities)
+        # Mostrejar per blocs, sense el vector de probabilitats sencer
+        measured_state = int(sample_indices(qft_register)[0])
         
-        print(f"[QUÀNTIC] Estat mesurat després de QFT: {measured_state}")
+        self._log(f"[QUÀNTIC] Estat mesurat després de QFT: {measured_state}")
+        
+        return measured_state
+    
+    def measure_qft_analytic(self, collapsed_register):
+        """
+        QFT i mesura en un sol pas: mostreja l'estat mesurat de la
+        distribució en forma tancada del registre col·lapsat, sense FFT.
+        
+        Args:
+            collapsed_register: CollapsedRegister en progressió aritmètica
+            
+        Returns:
+            int: Estat mesurat
+        """
+        measured_state = int(collapsed_register.sample_qft()[0])
+        
+        self._log(f"[QUÀNTIC] QFT analítica (sense FFT), estat mesurat: {measured_state}")
         
         return measured_state
     
@@ -190,7 +511,7 @@ class ShorAlgorithm:
         
         fraction = Fraction(measured_state, M).limit_denominator(self.N)
         
-        print(f"[QUÀNTIC] Fracció contínua: {measured_state}/{M} ≈ {fraction}")
+        self._log(f"[QUÀNTIC] Fracció contínua: {measured_state}/{M} ≈ {fraction}")
         
         r = fraction.denominator
         
@@ -198,56 +519,158 @@ class ShorAlgorithm:
         if r % 2 == 0 and r > 0:
             # Verificar que a^r ≡ 1 (mod N)
             if self.mod_pow(self.current_a, r, self.N) == 1:
-                print(f"[QUÀNTIC] Període trobat: r = {r}")
+                self._log(f"[QUÀNTIC] Període trobat: r = {r}")
                 return r
         
-        # Si no és vàlid, provar múltiples del denominador
-        for multiplier in range(2, self.N):
-            r_candidate = fraction.denominator * multiplier
-            if r_candidate >= self.N:
-                break
-            if r_candidate % 2 == 0:
-                if self.mod_pow(self.current_a, r_candidate, self.N) == 1:
-                    print(f"[QUÀNTIC] Període trobat (múltiple): r = {r_candidate}")
-                    return r_candidate
+        # Si no és vàlid, provar els múltiples parells del denominador, tots alhora
+        multiples = r * np.arange(2, max(self.N // r, 1) + 1)
+        multiples = multiples[(multiples < self.N) & (multiples % 2 == 0)]
+        valid = self.verify_periods(self.current_a, multiples)
+        if len(valid):
+            self._log(f"[QUÀNTIC] Període trobat (múltiple): r = {valid[0]}")
+            return int(valid[0])
         
-        print(f"[QUÀNTIC] Període candidat (pot no ser òptim): r = {fraction.denominator}")
+        self._log(f"[QUÀNTIC] Període candidat (pot no ser òptim): r = {fraction.denominator}")
         return fraction.denominator
     
-    def quantum_period_finding(self, a):
+    def verify_periods(self, a, candidates):
+        """
+        Comprova a^r ≡ 1 (mod N) per a tots els candidats alhora amb
+        ModContext.pow_vec, en lloc d'una exponenciació per candidat.
+        
+        Returns:
+            np.array: Candidats vàlids, ordenats i sense repeticions
+        """
+        candidates = np.unique(np.asarray(candidates, dtype=np.int64))
+        candidates = candidates[candidates > 0]
+        if len(candidates) == 0:
+            return candidates
+        return candidates[context(self.N).pow_vec(a, candidates) == 1]
+    
+    def sample_measurements(self, collapsed_register, samples):
+        """
+        Mesura la QFT del registre col·lapsat 'samples' vegades a partir de
+        la mateixa distribució (forma tancada o una sola FFT).
+        
+        Returns:
+            np.array: Estats mesurats
+        """
+        if self.qft_mode == "analytic" and collapsed_register.indices is None:
+            measured_states = collapsed_register.sample_qft(samples)
+        else:
+            qft_register = self.quantum_fourier_transform(collapsed_register)
+            measured_states = sample_indices(qft_register, samples)
+        
+        self._log(f"[QUÀNTIC] {samples} estats mesurats després de QFT: {measured_states.tolist()}")
+        
+        return measured_states
+    
+    def period_from_samples(self, a, measured_states):
+        """
+        5. Període a partir de moltes mesures.
+        Cada mesura y ≈ j·M/r dona, per fraccions contínues, un denominador
+        r/mcd(j, r); el mcm dels denominadors arriba a r amb poques mesures.
+        Els mcm parcials i els múltiples de l'últim fins a N es verifiquen tots
+        alhora, i el primer vàlid es redueix al període mínim provant els
+        seus divisors.
+        
+        Returns:
+            int: Període r (o el millor candidat si cap no és vàlid)
+        """
+        M = 2 ** self.n_qubits
+        combined, candidates = 1, []
+        for y in measured_states.tolist():
+            if y == 0:
+                continue
+            d = Fraction(y, M).limit_denominator(self.N).denominator
+            if lcm(combined, d) < self.N:  # r < N: un mcm més gran ve d'una mesura sorollosa
+                combined = lcm(combined, d)
+                candidates.append(combined)
+        
+        self._log(f"[QUÀNTIC] mcm dels denominadors: {combined}")
+        
+        if combined == 1:
+            return 1  # Cap mesura no aporta informació
+        candidates.extend((combined * np.arange(1, self.N // combined + 1)).tolist())
+        valid = self.verify_periods(a, candidates)
+        if len(valid) == 0:
+            self._log(f"[QUÀNTIC] Període candidat (pot no ser òptim): r = {combined}")
+            return combined
+        
+        # El període mínim divideix el candidat vàlid
+        r = int(valid[0])
+        divisors = [k for k in range(1, isqrt(r) + 1) if r % k == 0]
+        r = int(self.verify_periods(a, divisors + [r // k for k in divisors])[0])
+        
+        self._log(f"[QUÀNTIC] Període trobat: r = {r}")
+        
+        return r
+    
+    def _stage(self, stage, start):
+        """Suma a l'etapa el temps des de start i retorna l'instant actual."""
+        now = time.perf_counter()
+        self.timings[stage] += now - start
+        return now
+    
+    def quantum_period_finding(self, a, stop=None):
         """
         Mòdul quàntic complet: troba el període r de f(x) = a^x mod N.
+        El temps de cada etapa s'acumula a self.timings.
         
         Args:
             a: Base de l'exponenciació
+            stop: Funció opcional que es consulta entre etapes; si retorna
+                True, s'abandona l'execució
             
         Returns:
-            int: Període r
+            int: Període r (None si s'ha aturat)
         """
         self.current_a = a
-        print("\n" + "="*60)
-        print("INICI DEL MÒDUL QUÀNTIC")
-        print("="*60)
+        self.quantum_runs += 1
+        self._log("\n" + "="*60)
+        self._log("INICI DEL MÒDUL QUÀNTIC")
+        self._log("="*60)
+        start = time.perf_counter()
         
         # Pas 1: Crear registre quàntic uniforme
         register = self.create_uniform_quantum_register()
         
         # Pas 2: Aplicar exponenciació modular (entrellaçament)
         entangled = self.quantum_modular_exponentiation(register, a)
+        start = self._stage("oracle", start)
+        if stop and stop():
+            return None
         
         # Pas 3: Mesurar segon registre
         collapsed_register = self.measure_second_register(entangled)
-        
-        # Pas 4: Aplicar QFT
-        qft_register = self.quantum_fourier_transform(collapsed_register)
-        
-        # Pas 5: Mesurar i trobar període amb fraccions continues
-        measured_state = self.measure_qft_register(qft_register)
+        start = self._stage("collapse", start)
+        if stop and stop():
+            return None
+        
+        # Pas 4 i 5 amb moltes mesures de la mateixa distribució
+        if self.samples > 1:
+            measured_states = self.sample_measurements(collapsed_register, self.samples)
+            start = self._stage("qft", start)
+            r = self.period_from_samples(a, measured_states)
+            self._stage("continued_fractions", start)
+            self._log("="*60 + "\n")
+            return r
+        
+        # Pas 4: Aplicar QFT i mesurar (analíticament si el registre és una progressió)
+        if self.qft_mode == "analytic" and collapsed_register.indices is None:
+            measured_state = self.measure_qft_analytic(collapsed_register)
+        else:
+            qft_register = self.quantum_fourier_transform(collapsed_register)
+            measured_state = self.measure_qft_register(qft_register)
+        start = self._stage("qft", start)
+        
+        # Pas 5: Trobar període amb fraccions continues
         r = self.continued_fraction_expansion(measured_state)
+        self._stage("continued_fractions", start)
         
-        print("="*60)
-        print("FI DEL MÒDUL QUÀNTIC")
-        print("="*60 + "\n")
+        self._log("="*60)
+        self._log("FI DEL MÒDUL QUÀNTIC")
+        self._log("="*60 + "\n")
         
         return r
     
@@ -263,13 +686,39 @@ class ShorAlgorithm:
         Returns:
             tuple: (p, q) factors de N, o (None, None) si no es troben
         """
-        print(f"\n{'='*60}")
-        print(f"ALGORISME DE SHOR - Factoritzant N = {self.N}")
-        print(f"{'='*60}\n")
+        self._log(f"\n{'='*60}")
+        self._log(f"ALGORISME DE SHOR - Factoritzant N = {self.N}")
+        self._log(f"{'='*60}\n")
+        
+        factors = self.classical_factors()
+        if factors:
+            return factors
+        
+        # Algorisme de Shor principal
+        for attempt in range(max_attempts):
+            self._log(f"\n--- INTENT {attempt + 1} ---")
+            
+            # Escollir 'a' aleatori amb gcd(a, N) = 1
+            a = self.choose_random_a()
+            self._log(f"a = {a} escollit aleatòriament")
+            
+            factors = self.attempt(a)
+            if factors:
+                return factors
         
+        self._log(f"\nNo s'han trobat factors després de {max_attempts} intents.")
+        return (None, None)
+    
+    def classical_factors(self):
+        """
+        Casos trivials que no necessiten el mòdul quàntic.
+        
+        Returns:
+            tuple: (p, q) si N és parell o una potència, None si no
+        """
         # Cas trivial: N parell
         if self.N % 2 == 0:
-            print(f"N = {self.N} és parell!")
+            self._log(f"N = {self.N} és parell!")
             return (2, self.N // 2)
         
         # Cas trivial: N és una potència
@@ -277,60 +726,65 @@ class ShorAlgorithm:
             exp = 2
             while b ** exp <= self.N:
                 if b ** exp == self.N:
-                    print(f"N = {self.N} és una potència: {b}^{exp}")
+                    self._log(f"N = {self.N} és una potència: {b}^{exp}")
                     return (b, b ** (exp - 1))
                 exp += 1
+        return None
+    
+    def attempt(self, a, stop=None):
+        """
+        Un intent de l'algorisme amb la base a: període amb el mòdul
+        quàntic i factors amb gcd(a^(r/2) ± 1, N).
         
-        # Algorisme de Shor principal
-        for attempt in range(max_attempts):
-            print(f"\n--- INTENT {attempt + 1} ---")
-            
-            # Escollir 'a' aleatori amb gcd(a, N) = 1
-            a = self.choose_random_a()
-            print(f"a = {a} escollit aleatòriament")
-            
-            g = gcd(a, self.N)
-            if g != 1:
-                print(f"Sort! gcd({a}, {self.N}) = {g} != 1")
-                return (g, self.N // g)
-            
-            print(f"gcd({a}, {self.N}) = 1 ✓")
-            
-            # Trobar període r usant el mòdul quàntic
-            r = self.quantum_period_finding(a)
-            
-            # Verificar que r sigui parell
-            if r % 2 != 0:
-                print(f"r = {r} és senar. Tornant a intentar...")
-                continue
-            
-            print(f"r = {r} és parell ✓")
-            
-            # Verificar que a^(r/2) ≢ -1 (mod N)
-            half_power = self.mod_pow(a, r // 2, self.N)
-            if half_power == self.N - 1:
-                print(f"{a}^{r//2} ≡ -1 (mod {self.N}). Tornant a intentar...")
-                continue
-            
-            print(f"{a}^{r//2} ≡ {half_power} (mod {self.N}) ✓")
-            
-            # Calcular factors
-            p = gcd(self.mod_pow(a, r // 2, self.N) - 1, self.N)
-            q = gcd(self.mod_pow(a, r // 2, self.N) + 1, self.N)
-            
-            print(f"\nCalculant factors:")
-            print(f"p = gcd({a}^{r//2} - 1, {self.N}) = {p}")
-            print(f"q = gcd({a}^{r//2} + 1, {self.N}) = {q}")
+        Args:
+            a: Base de l'exponenciació
+            stop: Funció opcional per abandonar l'intent (vegeu quantum_period_finding)
             
-            # Verificar que siguin factors vàlids
-            if p > 1 and q > 1 and p * q == self.N:
-                print(f"\n{'='*60}")
-                print(f"✓ FACTORS TROBATS: {p} × {q} = {self.N}")
-                print(f"{'='*60}\n")
-                return (p, q)
-        
-        print(f"\nNo s'han trobat factors després de {max_attempts} intents.")
-        return (None, None)
+        Returns:
+            tuple: (p, q) si l'intent troba els factors, None si no
+        """
+        g = gcd(a, self.N)
+        if g != 1:
+            self._log(f"Sort! gcd({a}, {self.N}) = {g} != 1")
+            return (g, self.N // g)
+        
+        self._log(f"gcd({a}, {self.N}) = 1 ✓")
+        
+        # Trobar període r usant el mòdul quàntic
+        r = self.quantum_period_finding(a, stop)
+        if r is None:
+            return None
+        
+        # Verificar que r sigui parell
+        if r % 2 != 0:
+            self._log(f"r = {r} és senar. Tornant a intentar...")
+            return None
+        
+        self._log(f"r = {r} és parell ✓")
+        
+        # Verificar que a^(r/2) ≢ -1 (mod N)
+        half_power = self.mod_pow(a, r // 2, self.N)
+        if half_power == self.N - 1:
+            self._log(f"{a}^{r//2} ≡ -1 (mod {self.N}). Tornant a intentar...")
+            return None
+        
+        self._log(f"{a}^{r//2} ≡ {half_power} (mod {self.N}) ✓")
+        
+        # Calcular factors
+        p = gcd(self.mod_pow(a, r // 2, self.N) - 1, self.N)
+        q = gcd(self.mod_pow(a, r // 2, self.N) + 1, self.N)
+        
+        self._log(f"\nCalculant factors:")
+        self._log(f"p = gcd({a}^{r//2} - 1, {self.N}) = {p}")
+        self._log(f"q = gcd({a}^{r//2} + 1, {self.N}) = {q}")
+        
+        # Verificar que siguin factors vàlids
+        if p > 1 and q > 1 and p * q == self.N:
+            self._log(f"\n{'='*60}")
+            self._log(f"✓ FACTORS TROBATS: {p} × {q} = {self.N}")
+            self._log(f"{'='*60}\n")
+            return (p, q)
+        return None
 
 
 # ========== PROGRAMA PRINCIPAL ==========
@@ -340,8 +794,9 @@ if __name__ == "__main__":
     print(" "*15 + "ALGORISME DE SHOR")
     print("-"*60)
     
-    # Demanar N a l'usuari
-    while True:
+    # N com a argument (python shorAlgorithm.py 15) o demanat a l'usuari
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    while N is None or N < 4:
         try:
             N = int(input("\nIntrodueix el número a factoritzar (N >= 4): "))
             if N < 4:
@@ -350,7 +805,6 @@ if __name__ == "__main__":
             if N == 1 or N == 2 or N == 3:
                 print(f"N = {N} és trivial (nombre primer o massa petit)")
                 continue
-            break
         except ValueError:
             print("Error: Introdueix un número enter vàlid")
     
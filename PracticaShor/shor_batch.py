@@ -0,0 +1,268 @@
+"""
+Servei de factorització per lots amb l'algorisme de Shor.
+
+Rep una llista o un flux d'enters i reparteix els intents (N, a)
+independents entre processos. Quan un intent troba els factors d'un N, els
+intents germans del mateix N es cancel·len: els que encara són a la cua no
+arriben a començar, i els que s'estan executant s'aturen a la següent etapa
+del mòdul quàntic. Cada resultat és un diccionari amb els factors, els
+intents fets i el temps de cada etapa, en lloc de text per pantalla.
+
+Ús: python shor_batch.py [--processos P] [--mostres K] [--mode analytic|fft] [fitxer|-]
+    (un enter per línia; la sortida és una línia JSON per N, en l'ordre en què acaben)
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+
+try:
+    from .shorAlgorithm import LIMIT_VECTORIAL, STAGES, ShorAlgorithm
+except ImportError:  # Executat des de la carpeta, fora del paquet criptografia
+    from shorAlgorithm import LIMIT_VECTORIAL, STAGES, ShorAlgorithm
+
+# Per a cada posició, l'identificador del N que ja s'ha resolt (compartit amb els processos)
+_solved = None
+
+
+def _init_worker(solved):
+    global _solved
+    _solved = solved
+
+
+@lru_cache(maxsize=8)
+def _shor(N, qft_mode, samples):
+    # Un objecte per N i procés: el buffer de la QFT es reutilitza entre intents
+    return ShorAlgorithm(N, verbose=False, qft_mode=qft_mode, samples=samples)
+
+
+def _run_attempt(N, a, slot, job_id, qft_mode, samples):
+    """
+    Un intent (N, a) dins d'un procés treballador.
+
+    Returns:
+        dict: base, factors (o None) i temps per etapa
+    """
+    stop = lambda: _solved[slot] == job_id
+    if stop():
+        return {"a": a, "factors": None, "timings": dict.fromkeys(STAGES, 0.0)}
+    shor = _shor(N, qft_mode, samples)
+    shor.timings = dict.fromkeys(STAGES, 0.0)
+    return {"a": a, "factors": shor.attempt(a, stop), "timings": shor.timings}
+
+
+class _Job:
+    """Estat d'un N mentre té intents en marxa."""
+
+    def __init__(self, index, N, slot):
+        self.index, self.N, self.slot = index, N, slot
+        self.start = time.perf_counter()
+        self.tried = set()  # Bases ja provades
+        self.pending = set()  # Futurs en marxa
+        self.attempts = self.cancelled = 0
+        self.timings = dict.fromkeys(STAGES, 0.0)
+        self.factors = self.a = self.error = None
+        self.exhausted = False  # Ja s'han provat totes les bases
+
+    def next_base(self):
+        # Base a l'atzar encara no provada (si gcd(a, N) > 1, l'intent ja dona un factor)
+        if len(self.tried) >= self.N - 2:
+            self.exhausted = True
+            return None
+        while True:
+            a = random.randint(2, self.N - 1)
+            if a not in self.tried:
+                self.tried.add(a)
+                return a
+
+    def add(self, outcome):
+        self.attempts += 1
+        for stage, seconds in outcome["timings"].items():
+            self.timings[stage] += seconds
+        if outcome["factors"] and not self.factors:
+            self.factors, self.a = outcome["factors"], outcome["a"]
+
+    def result(self):
+        result = {"index": self.index, "N": self.N,
+                  "factors": list(self.factors) if self.factors else None,
+                  "a": self.a, "attempts": self.attempts, "cancelled": self.cancelled,
+                  "timings": self.timings, "seconds": time.perf_counter() - self.start}
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+def _trivial(index, N):
+    # Resultat sense mòdul quàntic (N parell, potència o massa petit), o None
+    job = _Job(index, N, None)
+    if N < 4:
+        job.error = "N ha de ser >= 4"
+    elif N >= LIMIT_VECTORIAL:
+        job.error = "la simulació necessita N < 2^31"
+    else:
+        job.factors = ShorAlgorithm(N, verbose=False).classical_factors()
+    return job.result() if job.factors or job.error else None
+
+
+def factorize_sequential(numbers, max_attempts=10, qft_mode="analytic", samples=1):
+    """
+    Mateixos resultats que factorize_batch, però en aquest procés i un
+    intent rere l'altre (referència per mesurar el paral·lelisme).
+    """
+    for index, N in enumerate(numbers):
+        result = _trivial(index, N)
+        if result:
+            yield result
+            continue
+        job = _Job(index, N, None)
+        shor = ShorAlgorithm(N, verbose=False, qft_mode=qft_mode, samples=samples)
+        while job.attempts < max_attempts and not job.factors:
+            a = job.next_base()
+            if a is None:
+                break
+            shor.timings = dict.fromkeys(STAGES, 0.0)
+            try:
+                factors = shor.attempt(a)
+            except Exception as error:
+                job.error = f"{type(error).__name__}: {error}"
+                break
+            job.add({"a": a, "factors": factors, "timings": shor.timings})
+        yield job.result()
+
+
+def factorize_batch(numbers, processes=None, max_attempts=10, attempts_per_number=None,
+                    max_active=None, qft_mode="analytic", samples=1):
+    """
+    Factoritza molts N repartint els intents (N, a) entre processos.
+
+    Args:
+        numbers: Llista o iterable d'enters (es llegeix a mesura que cal)
+        processes: Processos treballadors (per defecte, els nuclis)
+        max_attempts: Intents màxims per N
+        attempts_per_number: Intents simultanis d'un mateix N (per defecte, processes)
+        max_active: N en marxa alhora (per defecte, 2·processes)
+        qft_mode, samples: Opcions de ShorAlgorithm
+
+    Yields:
+        dict: Un resultat per N, en l'ordre en què acaben (vegeu "index"):
+            factors, a, attempts, cancelled, timings (segons per etapa) i seconds
+    """
+    processes = processes or multiprocessing.cpu_count()
+    if processes <= 1:
+        yield from factorize_sequential(numbers, max_attempts, qft_mode, samples)
+        return
+    attempts_per_number = attempts_per_number or processes
+    max_active = max_active or 2 * processes
+    solved = multiprocessing.Array("q", [-1] * max_active, lock=False)
+    free_slots = deque(range(max_active))
+    pending = {}  # futur -> _Job
+    active = deque()  # N en marxa, per repartir els intents per torns
+    source = enumerate(numbers)
+    exhausted = False
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(solved,)) as executor:
+
+        def submit(job):
+            a = job.next_base()
+            if a is None:
+                return False
+            future = executor.submit(_run_attempt, job.N, a, job.slot, job.index, qft_mode, samples)
+            job.pending.add(future)
+            pending[future] = job
+            return True
+
+        def finish(job):
+            # Els germans de la cua no arriben a començar; els que s'executen
+            # veuen solved[slot] (si s'ha resolt) i s'aturen a la següent etapa
+            job.cancelled = len(job.pending)
+            for future in job.pending:
+                future.cancel()
+                pending.pop(future, None)
+            job.pending.clear()
+            active.remove(job)
+            free_slots.append(job.slot)
+            return job.result()
+
+        try:
+            while True:
+                # Omplir: nous N mentre hi hagi posicions lliures
+                while not exhausted and free_slots:
+                    try:
+                        index, N = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    result = _trivial(index, N)
+                    if result:
+                        yield result
+                        continue
+                    # La posició conserva l'índex del N anterior: els seus intents
+                    # que encara s'executin continuen veient-lo resolt
+                    active.append(_Job(index, N, free_slots.popleft()))
+                # Omplir: intents per torns fins a tenir tots els processos ocupats (i una mica de cua)
+                progress = True
+                while len(pending) < 2 * processes and progress:
+                    progress = False
+                    for job in list(active):
+                        if (len(job.pending) < attempts_per_number
+                                and job.attempts + len(job.pending) < max_attempts and submit(job)):
+                            progress = True
+                            if len(pending) >= 2 * processes:
+                                break
+                # N acabats sense factors: sense intents en marxa i sense més per fer
+                for job in list(active):
+                    if not job.pending and (job.attempts >= max_attempts or job.exhausted):
+                        yield finish(job)
+                if not pending:
+                    if exhausted and not active:
+                        return
+                    continue
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = pending.pop(future, None)
+                    if job is None:
+                        continue  # D'un N ja acabat
+                    job.pending.discard(future)
+                    try:
+                        job.add(future.result())
+                    except Exception as error:
+                        job.error = f"{type(error).__name__}: {error}"
+                    if job.factors or job.error:
+                        solved[job.slot] = job.index  # Atura els germans que s'estan executant
+                        yield finish(job)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def read_numbers(source):
+    """Enters d'un fitxer o de stdin ('-'), un per línia."""
+    file = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for line in file:
+            if line.strip():
+                yield int(line)
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Factorització per lots amb l'algorisme de Shor.")
+    parser.add_argument("fitxer", nargs="?", default="-", help="un enter per línia ('-' per stdin)")
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--intents", type=int, default=10, help="intents màxims per N")
+    parser.add_argument("--mostres", type=int, default=1, help="mesures de la QFT per intent")
+    parser.add_argument("--mode", choices=("analytic", "fft"), default="analytic")
+    args = parser.parse_args()
+
+    for result in factorize_batch(read_numbers(args.fitxer), args.processos, args.intents,
+                                  qft_mode=args.mode, samples=args.mostres):
+        print(json.dumps(result), flush=True)
@@ -0,0 +1,67 @@
+# Accés a les pràctiques com a biblioteca, sense input() ni efectes en importar.
+# Les carpetes dels exercicis formen part del __path__ del paquet, de manera
+# que els seus mòduls es carreguen com a criptografia.<mòdul> (per exemple
+# criptografia.clau_rsa) i s'importen entre ells amb imports relatius; el
+# sys.path global no es toca i un paquet instal·lat amb el mateix nom que un
+# fitxer de les pràctiques no queda tapat. Cada funció o classe es carrega la
+# primera vegada que es fa servir (criptografia.ClauRSA importa clau_rsa.py en
+# aquell moment). Així importar el paquet és instantani i NumPy només es
+# carrega si es fa servir Shor o les operacions vectoritzades.
+#
+# Ús:  import criptografia
+#      clau = criptografia.genera_clau(2048)
+#      python -m criptografia --help
+
+import importlib
+import os
+
+ARREL = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTES = [
+    os.path.join(ARREL, "Practica2", "Exercici1"),
+    os.path.join(ARREL, "Practica2", "Exercici2"),
+    os.path.join(ARREL, "Practica2", "Exercici3"),
+    os.path.join(ARREL, "PracticaShor"),
+]
+__path__ += [ruta for ruta in RUTES if ruta not in __path__]
+
+# Nom públic -> mòdul on és definit
+_API = {
+    "maxim_comu_divisor": "ex1a",
+    "euclides_extes": "ex1b",
+    "euclides_extes_lehmer": "ex1b",
+    "invers_modular": "ex1b",
+    "invers_modular_lot": "ex1b",
+    "potencia_modular": "ex1c",
+    "BaseFixa": "ex1c",
+    "ModContext": "modular",
+    "context": "modular",
+    "mcd_per_lots": "batch_gcd",
+    "moduls_vulnerables": "batch_gcd",
+    "ClauRSA": "clau_rsa",
+    "es_primer": "primers",
+    "primer_aleatori": "primers",
+    "genera_clau": "primers",
+    "genera_claus": "primers",
+    "xifra_flux": "xifratge_fitxers",
+    "desxifra_flux": "xifratge_fitxers",
+    "xifra_fitxer": "xifratge_fitxers",
+    "desxifra_fitxer": "xifratge_fitxers",
+    "carrega_clau": "claus",
+    "carrega_fitxer": "claus",
+    "parseHexToDec": "ex3a",
+    "desxifra_pkcs1_v15": "ex3a",
+    "ShorAlgorithm": "shorAlgorithm",
+    "factorize_batch": "shor_batch",
+}
+
+__all__ = sorted(_API)
+
+def __getattr__(nom):
+    if nom not in _API:
+        raise AttributeError(f"module 'criptografia' has no attribute '{nom}'")
+    valor = getattr(importlib.import_module(f".{_API[nom]}", __name__), nom)
+    globals()[nom] = valor  # Les crides següents ja no passen per aquí
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(_API))
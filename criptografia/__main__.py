@@ -0,0 +1,5 @@
+import sys
+
+from criptografia.cli import main
+
+sys.exit(main())
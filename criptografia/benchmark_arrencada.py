@@ -0,0 +1,65 @@
+# Temps d'arrencada del paquet i de la línia d'ordres, i cost de fer moltes
+# operacions amb un procés per operació o totes dins d'un sol 'lot'.
+#
+# Ús: python criptografia/benchmark_arrencada.py [repeticions]
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ARREL = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def executa(ordre, entrada=None):
+    inici = time.perf_counter()
+    subprocess.run([sys.executable, *ordre], cwd=ARREL, input=entrada, check=True,
+                   stdout=subprocess.DEVNULL, text=True)
+    return time.perf_counter() - inici
+
+def millor(ordre, repeticions):
+    return min(executa(ordre) for _ in range(repeticions))
+
+def moduls_carregats(codi):
+    # Mòduls de sys.modules després d'executar el codi en un procés nou
+    sortida = subprocess.run([sys.executable, "-c", codi + "\nimport sys; print(' '.join(sys.modules))"],
+                             cwd=ARREL, check=True, capture_output=True, text=True).stdout
+    return set(sortida.split())
+
+
+if __name__ == "__main__":
+    repeticions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    python_buit = millor(["-c", "pass"], repeticions)
+    importacio = millor(["-c", "import criptografia"], repeticions)
+    ordre = millor(["-m", "criptografia", "mcd", "a=12", "b=18"], repeticions)
+    print(f"python buit:                    {python_buit * 1000:7.1f} ms")
+    print(f"import criptografia:            {importacio * 1000:7.1f} ms  (+{(importacio - python_buit) * 1000:.1f} ms)")
+    print(f"python -m criptografia mcd ...: {ordre * 1000:7.1f} ms  (+{(ordre - python_buit) * 1000:.1f} ms)")
+
+    # Quins mòduls pesats es carreguen segons l'ús
+    casos = {
+        "import criptografia": "import criptografia",
+        "mcd + invers + ClauRSA": "import criptografia as c; c.maxim_comu_divisor(12, 18); "
+                                  "c.invers_modular(17, 3120); c.ClauRSA.des_de_primers([61, 53])",
+        "ShorAlgorithm": "import criptografia as c; c.ShorAlgorithm",
+    }
+    for nom, codi in casos.items():
+        moduls = moduls_carregats(codi)
+        print(f"{nom:28s} numpy carregat: {'numpy' in moduls}  ({len(moduls)} mòduls)")
+
+    # N operacions: un procés per operació contra un sol 'lot' JSONL
+    n = 200
+    feines = "".join(json.dumps({"op": "invers", "d": 65537, "n": (1 << 127) - 2 + 2 * i}) + "\n" for i in range(n))
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+        f.write(feines)
+    try:
+        lot = min(executa(["-m", "criptografia", "lot", f.name]) for _ in range(3))
+    finally:
+        os.remove(f.name)
+    mostra = 10
+    per_operacio = sum(executa(["-m", "criptografia", "invers", "d=65537", f"n={(1 << 127) - 2 + 2 * i}"])
+                       for i in range(mostra)) / mostra
+    print(f"\n{n} operacions, un procés per operació: {per_operacio * n:7.2f} s  (estimat de {mostra})")
+    print(f"{n} operacions en un sol lot:          {lot:7.2f} s  ({per_operacio * n / lot:.0f}x)")
@@ -0,0 +1,142 @@
+# Línia d'ordres única per a totes les operacions del paquet.
+#
+#   python -m criptografia mcd a=12 b=18
+#   python -m criptografia genera_clau bits=1024
+#   python -m criptografia lot feines.jsonl [--processos N]    (o '-' per stdin)
+#
+# Cada línia del JSONL és {"id": ..., "op": "mcd", "a": 12, "b": 18}; la
+# sortida és una línia JSON per feina, en el mateix ordre, amb "resultat" o
+# "error". Totes les feines es fan dins del mateix procés (o d'un grup fix de
+# processos), sense arrencar Python per a cada operació.
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+
+import criptografia as c
+
+def _clau(fitxer=None, pem=None):
+    return c.carrega_fitxer(fitxer) if fitxer else c.carrega_clau(pem)
+
+def _clau_a_dict(clau):
+    dades = {"bits": clau.bits, "n": clau.n, "e": clau.e, "privada": clau.es_privada}
+    if clau.d is not None:
+        dades.update(d=clau.d, p=clau.p, q=clau.q, dP=clau.dP, dQ=clau.dQ, qInv=clau.qInv)
+    if clau.altres:
+        dades["altres"] = [list(t) for t in clau.altres]
+    return dades
+
+def _factoritza(n):
+    p, q = c.ShorAlgorithm(n, verbose=False).factorize()
+    return [p, q]
+
+def _vulnerables(moduls):
+    return [{"index": i, "n": n, "p": p, "q": q} for i, n, p, q in c.moduls_vulnerables(moduls)]
+
+# Nom de l'operació -> funció que rep els paràmetres de la feina
+OPERACIONS = {
+    "mcd": lambda a, b: c.maxim_comu_divisor(a, b),
+    "euclides": lambda a, b: list(c.euclides_extes(a, b)),
+    "invers": lambda d, n: c.invers_modular(d, n),
+    "invers_lot": lambda valors, n: c.invers_modular_lot(valors, n),
+    "potencia": lambda m, e, n, metode="pow": c.potencia_modular(m, e, n, metode),
+    "es_primer": lambda n: c.es_primer(n),
+    "genera_clau": lambda bits=2048, e=65537, primers=2: _clau_a_dict(c.genera_clau(bits, e, primers)),
+    "clau": lambda fitxer=None, pem=None: _clau_a_dict(_clau(fitxer, pem)),
+    "xifra": lambda m, fitxer=None, pem=None: _clau(fitxer, pem).xifra(m),
+    "desxifra": lambda xifrat, fitxer=None, pem=None, metode=None: _clau(fitxer, pem).desxifra(xifrat, metode),
+    "signa": lambda m, fitxer=None, pem=None, metode=None: _clau(fitxer, pem).signa(m, metode),
+    "verifica": lambda signatura, m, fitxer=None, pem=None: _clau(fitxer, pem).verifica(signatura, m),
+    "mcd_lots": _vulnerables,
+    "hex": lambda valor: c.parseHexToDec(valor),
+    "factoritza": _factoritza,
+    "factoritza_lot": lambda nombres, processos=1, mostres=1: sorted(
+        c.factorize_batch(nombres, processos, samples=mostres), key=lambda r: r["index"]),
+}
+
+def executa(feina):
+    # Executa una feina (diccionari amb "op" i els paràmetres) i retorna el resultat en JSON
+    feina = dict(feina)
+    identificador = feina.pop("id", None)
+    op = feina.pop("op", None)
+    sortida = {"id": identificador, "op": op}
+    inici = time.perf_counter()
+    try:
+        if op not in OPERACIONS:
+            raise ValueError(f"operació desconeguda: {op}")
+        sortida["resultat"] = OPERACIONS[op](**feina)
+    except Exception as error:
+        sortida["error"] = f"{type(error).__name__}: {error}"
+    sortida["segons"] = time.perf_counter() - inici
+    return sortida
+
+def llegeix_feines(font):
+    # Feines d'un fitxer JSONL o de stdin ('-'); l'id per defecte és el número de línia
+    fitxer = sys.stdin if font == "-" else open(font, encoding="utf-8")
+    try:
+        for numero, linia in enumerate(fitxer, 1):
+            if linia.strip():
+                feina = json.loads(linia)
+                feina.setdefault("id", numero)
+                yield feina
+    finally:
+        if fitxer is not sys.stdin:
+            fitxer.close()
+
+def executa_lot(feines, processos=1, max_pendents=None):
+    # Genera els resultats en el mateix ordre que les feines; amb processos > 1
+    # es reparteixen en un ProcessPoolExecutor amb com a molt max_pendents enviades
+    if processos <= 1:
+        for feina in feines:
+            yield executa(feina)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    max_pendents = max_pendents or 4 * processos
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        pendents = deque()
+        for feina in feines:
+            pendents.append(executor.submit(executa, feina))
+            if len(pendents) >= max_pendents:
+                yield pendents.popleft().result()
+        while pendents:
+            yield pendents.popleft().result()
+
+def _valor(text):
+    # Paràmetre de la línia d'ordres: JSON si es pot (números, llistes), text si no
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m criptografia",
+        description="Operacions de criptografia sense interacció. "
+                    f"Operacions: {', '.join(OPERACIONS)}, lot.")
+    parser.add_argument("op", help="operació, o 'lot' per executar un fitxer JSONL")
+    parser.add_argument("parametres", nargs="*", help="nom=valor (o el fitxer JSONL per a 'lot')")
+    parser.add_argument("--processos", type=int, default=1, help="processos per a 'lot'")
+    args = parser.parse_args(arguments)
+
+    if args.op == "lot":
+        font = args.parametres[0] if args.parametres else "-"
+        errors = 0
+        for resultat in executa_lot(llegeix_feines(font), args.processos):
+            errors += "error" in resultat
+            print(json.dumps(resultat, ensure_ascii=False), flush=True)
+        return 1 if errors else 0
+
+    feina = {"op": args.op}
+    for parametre in args.parametres:
+        nom, separador, valor = parametre.partition("=")
+        if not separador:
+            parser.error(f"els paràmetres han de ser nom=valor: {parametre}")
+        feina[nom] = _valor(valor)
+    resultat = executa(feina)
+    if "error" in resultat:
+        print(resultat["error"], file=sys.stderr)
+        return 1
+    print(json.dumps(resultat["resultat"], ensure_ascii=False))
+    return 0